@@ -0,0 +1,16 @@
+"""
+Micro benchmarks for prestans hot paths, run each module with
+
+    python -m benchmarks.<module>
+
+from the repository root.
+"""
+import timeit
+
+
+def best_of(statement, number, repeat=5):
+    """
+    :return: the best time per call in microseconds
+    :rtype: float
+    """
+    return min(timeit.repeat(statement, number=number, repeat=repeat)) / number * 1e6
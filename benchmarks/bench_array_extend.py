@@ -0,0 +1,54 @@
+"""
+Cost of building scalar and temporal arrays element by element and in bulk.
+
+append validates one element at a time, extend validates the whole sequence
+against the element template in one pass and checks the length once.
+"""
+from __future__ import print_function
+
+from datetime import datetime
+from datetime import timedelta
+
+from prestans import types
+
+from benchmarks import best_of
+
+
+def _cases(count):
+    start = datetime(2018, 1, 4)
+
+    return [
+        ("Integer", types.Integer(minimum=0), list(range(count))),
+        ("String", types.String(max_length=20), ["id-%i" % index for index in range(count)]),
+        ("DateTime", types.DateTime(), [start + timedelta(seconds=index) for index in range(count)])
+    ]
+
+
+def _append(element_template, values):
+    array = types.Array(element_template=element_template)
+    for value in values:
+        array.append(value)
+    return array
+
+
+def _extend(element_template, values):
+    array = types.Array(element_template=element_template)
+    array.extend(values)
+    return array
+
+
+def run(count=100000, number=3):
+
+    print("%10s %10s %12s %12s" % ("type", "elements", "append (ms)", "extend (ms)"))
+
+    for name, element_template, values in _cases(count):
+        print("%10s %10i %12.2f %12.2f" % (
+            name,
+            count,
+            best_of(lambda: _append(element_template, values), number) / 1000,
+            best_of(lambda: _extend(element_template, values), number) / 1000
+        ))
+
+
+if __name__ == "__main__":
+    run()
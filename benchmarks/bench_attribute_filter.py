@@ -0,0 +1,51 @@
+"""
+Toggling and querying a nested attribute filter, the way handlers adjust
+response filters per request.
+
+A filter over a model with 40 attributes and 10 nested models of 40
+attributes each has one nested key toggled, then visibility is queried
+and the filter converted for serialization.
+"""
+from __future__ import print_function
+
+from prestans.parser import AttributeFilter
+from prestans import types
+
+from benchmarks import best_of
+
+
+def _model(name, fields, nested=0):
+    attributes = dict(("field_%02i" % index, types.String()) for index in range(fields))
+    for index in range(nested):
+        attributes["nested_%02i" % index] = _model("%sNested%i" % (name, index), fields)()
+
+    return type(name, (types.Model,), attributes)
+
+
+def run(number=200):
+
+    model = _model("Wide", 40, nested=10)()
+    attribute_filter = AttributeFilter.from_model(model, default_value=True)
+
+    def toggle():
+        attribute_filter.nested_05.field_07 = not attribute_filter.nested_05.field_07
+
+    def query():
+        toggle()
+        attribute_filter.are_any_attributes_visible()
+        attribute_filter.are_all_attributes_visible()
+        attribute_filter.is_attribute_visible("nested_05")
+
+    def convert():
+        toggle()
+        attribute_filter.as_immutable()
+
+    print("%20s %10s" % ("", "µs / call"))
+    print("%20s %10.2f" % ("from_model", best_of(lambda: AttributeFilter.from_model(model, True), number)))
+    print("%20s %10.2f" % ("toggle and query", best_of(query, number)))
+    print("%20s %10.2f" % ("toggle and convert", best_of(convert, number)))
+    print("%20s %10.2f" % ("keys", best_of(attribute_filter.keys, number)))
+
+
+if __name__ == "__main__":
+    run()
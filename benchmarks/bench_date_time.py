@@ -0,0 +1,49 @@
+"""
+Parse and format cost of the date and time types.
+
+ISO-8601 style formats take the precompiled parser and formatter, the last row
+of each type uses a format only strptime / strftime understand.
+"""
+from __future__ import print_function
+
+from datetime import date
+from datetime import datetime
+from datetime import time
+
+from prestans import types
+
+from benchmarks import best_of
+
+
+def _cases():
+    value = datetime(2018, 1, 4, 12, 34, 56, 789)
+
+    return [
+        ("DateTime", types.DateTime(), value.replace(microsecond=0)),
+        ("DateTime", types.DateTime(format="%Y-%m-%dT%H:%M:%S.%fZ"), value),
+        ("DateTime", types.DateTime(format="%d %b %Y %I:%M %p"), value.replace(second=0, microsecond=0)),
+        ("Date", types.Date(), date(2018, 1, 4)),
+        ("Date", types.Date(format="%d %b %Y"), date(2018, 1, 4)),
+        ("Time", types.Time(), time(12, 34, 56)),
+        ("Time", types.Time(format="%I:%M %p"), time(12, 34))
+    ]
+
+
+def run(number=50000):
+
+    print("%10s %24s %12s %12s" % ("type", "format", "parse (us)", "format (us)"))
+
+    for name, template, value in _cases():
+        serialized = template.as_serializable(value)
+        assert template.validate(serialized) == value
+
+        print("%10s %24s %12.3f %12.3f" % (
+            name,
+            template.format,
+            best_of(lambda: template.validate(serialized), number),
+            best_of(lambda: template.as_serializable(value), number)
+        ))
+
+
+if __name__ == "__main__":
+    run()
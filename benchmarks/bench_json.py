@@ -0,0 +1,60 @@
+"""
+Encoding and decoding a list response with each installed JSON backend.
+
+The serializable form of 10,000 people is written with dumps and read back
+with loads; backends whose library isn't installed are skipped.
+"""
+from __future__ import print_function
+
+import json
+
+from prestans import json_backend
+
+from benchmarks import best_of
+
+
+def _serializable(count):
+    return [
+        {
+            "first_name": "First %i" % index,
+            "last_name": "Läst",
+            "age": index,
+            "score": index / 3.0,
+            "active": index % 2 == 0,
+            "address": {"street_name": "Street %i" % index, "post_code": None},
+            "tags": ["one", "two"]
+        }
+        for index in range(count)
+    ]
+
+
+def run(count=10000, number=5):
+
+    serializable = _serializable(count)
+
+    print("%12s %12s %12s" % ("backend", "dumps (ms)", "loads (ms)"))
+
+    # what serializer.JSON did before backends: spaced separators, str, then encoded
+    legacy = json.dumps(serializable, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    print("%12s %12.2f %12.2f" % (
+        "legacy",
+        best_of(lambda: json.dumps(serializable, ensure_ascii=False, sort_keys=True).encode("utf-8"), number) / 1000,
+        best_of(lambda: json.loads(legacy.decode()), number) / 1000
+    ))
+
+    for backend_class in json_backend.BACKENDS:
+        try:
+            backend = json_backend.get_backend(backend_class.name)
+        except ImportError:
+            continue
+
+        document = backend.dumps(serializable)
+        print("%12s %12.2f %12.2f" % (
+            backend.name,
+            best_of(lambda: backend.dumps(serializable), number) / 1000,
+            best_of(lambda: backend.loads(document), number) / 1000
+        ))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,90 @@
+"""
+Cost of adapting persistent objects to REST models with a ModelAdapter.
+
+Each run adapts a list of plain persistent objects, each with a nested address
+and a list of tags, with and without an attribute filter. The collection runs
+compare adapting and serializing a collection with projecting it straight to its
+serializable form, validated and trusted.
+"""
+from __future__ import print_function
+
+from prestans import types
+from prestans.ext.data import adapters
+from prestans.parser import AttributeFilter
+
+from benchmarks import best_of
+
+
+class AddressPersistent(object):
+
+    def __init__(self, index):
+        self.street_name = "Street %i" % index
+        self.post_code = "3000"
+
+
+class PersonPersistent(object):
+
+    def __init__(self, index):
+        self.first_name = "First %i" % index
+        self.last_name = "Last"
+        self.age = index % 100
+        self.address = AddressPersistent(index)
+        self.tags = ["one", "two"]
+
+    def full_name(self):
+        return self.first_name + " " + self.last_name
+
+
+class AddressREST(types.Model):
+    street_name = types.String()
+    post_code = types.String(max_length=4)
+
+
+class PersonREST(types.Model):
+    first_name = types.String()
+    last_name = types.String()
+    full_name = types.String(required=False)
+    age = types.Integer(minimum=0)
+    address = AddressREST(required=False)
+    tags = types.Array(element_template=types.String())
+
+
+def run(count=20000, number=3):
+
+    adapters.registry.register_persistent_rest_pair(AddressPersistent, AddressREST)
+    adapters.registry.register_persistent_rest_pair(PersonPersistent, PersonREST)
+
+    attribute_filter = AttributeFilter.from_model(PersonREST(), default_value=True)
+    attribute_filter.last_name = False
+    attribute_filter.address.post_code = False
+
+    people = [PersonPersistent(index) for index in range(count)]
+    adapter = adapters.registry.get_adapter_for_rest_model(PersonREST)
+
+    print("%10s %12s %12s" % ("objects", "mode", "adapt (ms)"))
+
+    for mode, attribute_filter in [("plain", None), ("filtered", attribute_filter)]:
+        print("%10i %12s %12.2f" % (
+            count,
+            mode,
+            best_of(lambda: [adapter.adapt_persistent_to_rest(person, attribute_filter) for person in people],
+                    number) / 1000
+        ))
+
+    print()
+    print("%10s %12s %12s" % ("objects", "collection", "serialize (ms)"))
+
+    for mode, options in [("adapted", {}), ("projected", {"project": True}),
+                          ("trusted", {"project": True, "trusted": True})]:
+        print("%10i %12s %12.2f" % (
+            count,
+            mode,
+            best_of(lambda: adapters.adapt_persistent_collection(people, PersonREST, **options).as_serializable(),
+                    number) / 1000
+        ))
+
+    adapters.registry.clear_registered_adapters()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,58 @@
+"""
+Attribute read and write throughput of Model instances.
+
+Times reading and assigning a scalar field, reading a nested model that
+already exists, and first access to a nested model that has to be created.
+Cloning a nested template is compared with copy.deepcopy.
+"""
+from __future__ import print_function
+
+import copy
+
+from prestans import types
+
+from benchmarks import best_of
+
+
+class Address(types.Model):
+    street_name = types.String(required=False)
+
+
+class Person(types.Model):
+    first_name = types.String()
+    age = types.Integer(required=False)
+    address = Address(required=False)
+
+    def full_name(self):
+        return self.first_name
+
+
+def _new_person():
+    person = Person(first_name="Jane")
+    person.address = None
+    return person
+
+
+def run(number=100000):
+
+    person = Person(first_name="Jane", age=42)
+    person.address.street_name = "Main"
+
+    def write_scalar():
+        person.age = 42
+
+    def first_collection_access():
+        _new_person().address
+
+    print("%24s %12s" % ("operation", "time (us)"))
+    print("%24s %12.3f" % ("read scalar", best_of(lambda: person.first_name, number)))
+    print("%24s %12.3f" % ("read method", best_of(lambda: person.full_name, number)))
+    print("%24s %12.3f" % ("read nested model", best_of(lambda: person.address, number)))
+    print("%24s %12.3f" % ("write scalar", best_of(write_scalar, number)))
+    print("%24s %12.3f" % ("create and read nested", best_of(first_collection_access, number // 10)))
+    print("%24s %12.3f" % ("deepcopy template", best_of(lambda: copy.deepcopy(Person.address), number // 10)))
+    print("%24s %12.3f" % ("clone template", best_of(lambda: Person.address.clone(), number // 10)))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,59 @@
+"""
+Memory held by a list of adapted models.
+
+Builds the same people with dict backed and __compact__ models and reports
+the memory allocated per model.
+"""
+from __future__ import print_function
+
+import gc
+import tracemalloc
+
+from prestans import types
+
+
+class Person(types.Model):
+    first_name = types.String()
+    last_name = types.String()
+    age = types.Integer(required=False)
+    email = types.String(required=False)
+    active = types.Boolean(required=False)
+
+
+class CompactPerson(types.Model):
+    __compact__ = True
+
+    first_name = types.String()
+    last_name = types.String()
+    age = types.Integer(required=False)
+    email = types.String(required=False)
+    active = types.Boolean(required=False)
+
+
+def _allocated(person_class, count):
+    # values are shared so only the models themselves are measured
+    first_name = "First"
+    email = "first@example.com"
+
+    gc.collect()
+    tracemalloc.start()
+    people = [person_class(first_name=first_name, last_name=first_name, age=1, email=email) for _ in range(count)]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del people
+    return allocated
+
+
+def run(count=100000):
+
+    print("%10s %14s %14s" % ("models", "dict (bytes)", "compact (bytes)"))
+    print("%10i %14.1f %14.1f" % (
+        count,
+        _allocated(Person, count) / float(count),
+        _allocated(CompactPerson, count) / float(count)
+    ))
+
+
+if __name__ == "__main__":
+    run()
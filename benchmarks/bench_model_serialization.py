@@ -0,0 +1,74 @@
+"""
+Serialization cost of a list response of nested models.
+
+Each run serializes an Array of people, each with an address and two tags,
+with the generic Model walk and with models that opt in to __compiled__.
+"""
+from __future__ import print_function
+
+from prestans import types
+from prestans.parser import AttributeFilter
+
+from benchmarks import best_of
+
+
+class Address(types.Model):
+    street_name = types.String()
+    post_code = types.String(required=False)
+
+
+class Person(types.Model):
+    first_name = types.String()
+    last_name = types.String()
+    age = types.Integer(required=False)
+    address = Address(required=False)
+    tags = types.Array(element_template=types.String())
+
+
+class CompiledAddress(Address):
+    __compiled__ = True
+
+
+class CompiledPerson(Person):
+    __compiled__ = True
+
+    address = CompiledAddress(required=False)
+
+
+def _people(person_class, address_class, count):
+    people = types.Array(element_template=person_class())
+
+    for index in range(count):
+        person = person_class(first_name="First %i" % index, last_name="Last", age=index)
+        person.address = address_class(street_name="Street %i" % index, post_code="3000")
+        person.tags.append(["one", "two"])
+        people.append(person)
+
+    return people
+
+
+def run(count=10000, number=3):
+
+    attribute_filter = AttributeFilter.from_model(Person(), default_value=True)
+    attribute_filter.last_name = False
+
+    print("%10s %12s %12s %12s" % ("models", "mode", "generic (ms)", "compiled (ms)"))
+
+    generic = _people(Person, Address, count)
+    compiled = _people(CompiledPerson, CompiledAddress, count)
+
+    for mode, kwargs in [
+        ("plain", {}),
+        ("minified", {"minified": True}),
+        ("filtered", {"attribute_filter": attribute_filter})
+    ]:
+        print("%10i %12s %12.2f %12.2f" % (
+            count,
+            mode,
+            best_of(lambda: generic.as_serializable(**kwargs), number) / 1000,
+            best_of(lambda: compiled.as_serializable(**kwargs), number) / 1000
+        ))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,51 @@
+"""
+Validation cost of a bulk request body of nested models.
+
+Each run validates a list of people, each with an address and two tags,
+with the generic Model walk and with models that opt in to __compiled__.
+"""
+from __future__ import print_function
+
+from prestans import types
+from prestans.parser import AttributeFilter
+
+from benchmarks import best_of
+from benchmarks.bench_model_serialization import CompiledPerson
+from benchmarks.bench_model_serialization import Person
+
+
+def _body(count):
+    return [
+        {
+            "first_name": "First %i" % index,
+            "last_name": "Last",
+            "age": index,
+            "address": {"street_name": "Street %i" % index, "post_code": "3000"},
+            "tags": ["one", "two"]
+        }
+        for index in range(count)
+    ]
+
+
+def run(count=5000, number=3):
+
+    attribute_filter = AttributeFilter.from_model(Person(), default_value=True)
+    attribute_filter.last_name = False
+
+    print("%10s %12s %12s %12s" % ("models", "mode", "generic (ms)", "compiled (ms)"))
+
+    body = _body(count)
+    generic = types.Array(element_template=Person())
+    compiled = types.Array(element_template=CompiledPerson())
+
+    for mode, attribute_filter in [("plain", None), ("filtered", attribute_filter)]:
+        print("%10i %12s %12.2f %12.2f" % (
+            count,
+            mode,
+            best_of(lambda: generic.validate(body, attribute_filter), number) / 1000,
+            best_of(lambda: compiled.validate(body, attribute_filter), number) / 1000
+        ))
+
+
+if __name__ == "__main__":
+    run()
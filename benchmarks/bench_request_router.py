@@ -0,0 +1,61 @@
+"""
+Per request routing cost for routers of growing size.
+
+Routes are registered as /resource<N>/([0-9]+); each router is timed
+dispatching to its first route, its last route and an unmatched URL.
+"""
+from __future__ import print_function
+
+import logging
+
+from prestans import rest
+
+from benchmarks import best_of
+
+
+class _NoContentHandler(rest.RequestHandler):
+
+    def get(self, resource_id):
+        pass
+
+
+def _start_response(status, headers, exc_info=None):
+    pass
+
+
+def _environ(path):
+    return {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "SCRIPT_NAME": "",
+        "wsgi.url_scheme": "http",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80"
+    }
+
+
+def run(route_counts=(10, 100, 400, 1000, 2000), number=2000):
+
+    logger = logging.getLogger("prestans.benchmark")
+    logger.disabled = True
+
+    print("%8s %12s %12s %12s" % ("routes", "first (us)", "last (us)", "404 (us)"))
+
+    for route_count in route_counts:
+        routes = [(r"/resource%i/([0-9]+)" % index, _NoContentHandler) for index in range(route_count)]
+        router = rest.RequestRouter(routes, application_name="benchmark", logger=logger)
+
+        first = _environ("/resource0/1")
+        last = _environ("/resource%i/1" % (route_count - 1))
+        missing = _environ("/missing/1")
+
+        print("%8i %12.2f %12.2f %12.2f" % (
+            route_count,
+            best_of(lambda: router(dict(first), _start_response), number),
+            best_of(lambda: router(dict(last), _start_response), number),
+            best_of(lambda: router(dict(missing), _start_response), number)
+        ))
+
+
+if __name__ == "__main__":
+    run()
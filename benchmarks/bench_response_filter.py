@@ -0,0 +1,60 @@
+"""
+Writing a single model response with an attribute filter.
+
+The filter derived state is cached per template class and filter; the
+conformance check against the body only runs in debug mode, and then only
+once per cache entry.
+"""
+from __future__ import print_function
+
+import logging
+
+from prestans.parser import AttributeFilter
+from prestans.rest import Response
+from prestans.serializer import JSON
+
+from benchmarks import best_of
+from benchmarks.bench_model_serialization import Address
+from benchmarks.bench_model_serialization import Person
+from benchmarks.bench_model_serialization import _people
+
+
+def _start_response(status, headers, exc_info=None):
+    pass
+
+
+def _call(body, debug):
+    response = Response(
+        charset="utf-8",
+        logger=logging.getLogger(),
+        serializers=[JSON()],
+        default_serializer=JSON(),
+        debug=debug
+    )
+    response.content_type = "application/json"
+    response.template = body
+    response.attribute_filter = AttributeFilter.from_model(body, default_value=True)
+    response.body = body
+    return response({}, _start_response)
+
+
+def _uncached(body):
+    # the work every response did before the filter state was cached
+    attribute_filter = AttributeFilter.from_model(body, default_value=True)
+    attribute_filter.are_any_attributes_visible()
+    AttributeFilter.from_model(body).conforms_to_template_filter(attribute_filter)
+    attribute_filter.as_immutable()
+
+
+def run(number=2000):
+
+    body = _people(Person, Address, 1)[0]
+
+    print("%24s %10s" % ("", "µs / call"))
+    print("%24s %10.2f" % ("filter bookkeeping", best_of(lambda: _uncached(body), number)))
+    print("%24s %10.2f" % ("response, debug", best_of(lambda: _call(body, True), number)))
+    print("%24s %10.2f" % ("response", best_of(lambda: _call(body, False), number)))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,73 @@
+"""
+Buffered versus streamed JSON responses for a large Array body.
+
+Reports the time until the first chunk is available, the total time to
+consume the response and the peak memory allocated while writing it.
+"""
+from __future__ import print_function
+
+import logging
+import timeit
+import tracemalloc
+
+from prestans.parser import AttributeFilter
+from prestans.rest import Response
+from prestans.serializer import JSON
+
+from benchmarks.bench_model_serialization import CompiledAddress
+from benchmarks.bench_model_serialization import CompiledPerson
+from benchmarks.bench_model_serialization import _people
+
+
+def _start_response(status, headers, exc_info=None):
+    pass
+
+
+def _response(body, stream):
+    response = Response(charset="utf-8", logger=logging.getLogger(), serializers=[JSON()], default_serializer=JSON())
+    response.content_type = "application/json"
+    response.template = body
+    response.attribute_filter = AttributeFilter.from_model(body.element_template, default_value=True)
+    response.body = body
+    response.stream = stream
+    return response
+
+
+def _consume(body, stream):
+    app_iter = iter(_response(body, stream)({}, _start_response))
+    next(app_iter)
+    first_chunk = timeit.default_timer()
+
+    for _ in app_iter:
+        pass
+
+    return first_chunk
+
+
+def _measure(body, stream):
+    started = timeit.default_timer()
+    first_chunk = _consume(body, stream)
+    total = timeit.default_timer() - started
+
+    # memory is traced in a separate run, tracing slows everything down
+    tracemalloc.start()
+    _consume(body, stream)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return (first_chunk - started) * 1000, total * 1000, peak / 1024.0 / 1024.0
+
+
+def run(count=20000):
+
+    logging.getLogger().disabled = True
+    body = _people(CompiledPerson, CompiledAddress, count)
+
+    print("%10s %10s %16s %12s %12s" % ("models", "mode", "first chunk (ms)", "total (ms)", "peak (MB)"))
+
+    for mode, stream in [("buffered", False), ("streamed", True)]:
+        print("%10i %10s %16.2f %12.2f %12.2f" % ((count, mode) + _measure(body, stream)))
+
+
+if __name__ == "__main__":
+    run()
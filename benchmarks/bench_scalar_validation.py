@@ -0,0 +1,42 @@
+"""
+Per call validation cost of the scalar types.
+
+Each type is validated with a typical set of constraints and with none, the
+closure is compiled on first use so the timings exclude compilation, which is
+reported separately.
+"""
+from __future__ import print_function
+
+from prestans import types
+
+from benchmarks import best_of
+
+
+def _cases():
+    return [
+        ("String", types.String(), "apple"),
+        ("String", types.String(max_length=20, format="^[a-z]+$", choices=["apple", "banana"]), "apple"),
+        ("Integer", types.Integer(), 3),
+        ("Integer", types.Integer(minimum=0, maximum=10, choices=[1, 2, 3]), 3),
+        ("Float", types.Float(), 3.5),
+        ("Float", types.Float(minimum=0, maximum=10), 3.5),
+        ("Boolean", types.Boolean(), True),
+        ("Boolean", types.Boolean(required=False, default=False), None)
+    ]
+
+
+def run(number=200000):
+
+    print("%10s %14s %14s" % ("type", "validate (us)", "compile (us)"))
+
+    for name, template, value in _cases():
+        template.validate(value)
+        print("%10s %14.3f %14.3f" % (
+            name,
+            best_of(lambda: template.validate(value), number),
+            best_of(template._compile_validator, number // 10)
+        ))
+
+
+if __name__ == "__main__":
+    run()
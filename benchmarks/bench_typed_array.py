@@ -0,0 +1,58 @@
+"""
+Memory, validation and serialization cost of list backed and typed Float arrays.
+
+Typed arrays hold their elements in an array.array, from_buffer wraps an existing
+buffer without copying it.
+"""
+from __future__ import print_function
+
+import array
+import sys
+
+from prestans import types
+
+from benchmarks import best_of
+
+
+def _memory(prestans_array):
+    elements = prestans_array._array_elements
+
+    if isinstance(elements, list):
+        return sys.getsizeof(elements) + sum(sys.getsizeof(element) for element in elements)
+
+    return sys.getsizeof(elements)
+
+
+def run(count=1000000, number=3):
+
+    values = [index * 0.5 for index in range(count)]
+    buffer = array.array("d", values)
+    element_template = types.Float(minimum=0)
+
+    generic = types.Array(element_template=element_template)
+    typed = types.Array(element_template=element_template, typed=True)
+
+    print("%10s %12s %12s %14s %14s" % ("storage", "elements", "memory (MB)", "validate (ms)", "serialize (ms)"))
+
+    for name, template in [("list", generic), ("typed", typed)]:
+        validated = template.validate(values)
+        print("%10s %12i %12.1f %14.2f %14.2f" % (
+            name,
+            count,
+            _memory(validated) / 1e6,
+            best_of(lambda: template.validate(values), number) / 1000,
+            best_of(lambda: validated.as_serializable(), number) / 1000
+        ))
+
+    wrapped = types.Array.from_buffer(element_template, buffer)
+    print("%10s %12i %12.1f %14.2f %14.2f" % (
+        "buffer",
+        count,
+        0,
+        best_of(lambda: types.Array.from_buffer(element_template, buffer), number) / 1000,
+        best_of(lambda: wrapped.as_serializable(), number) / 1000
+    ))
+
+
+if __name__ == "__main__":
+    run()
@@ -33,6 +33,7 @@
 __all__ = ['Base', 'JSON', 'XMLPlist']
 
 import prestans.exception
+from prestans import json_backend
 
 
 class Base(object):
@@ -40,25 +41,42 @@ class Base(object):
     def loads(self, input_string):
         raise NotImplementedError
 
+    def accepts_bytes(self):
+        """
+        :return: True if loads takes the raw request body, False if it expects it decoded to str
+        :rtype: bool
+        """
+        return True
+
     def content_type(self):
         raise NotImplementedError
 
 
 class JSON(Base):
 
-    def loads(self, input_string):
-        import json
+    def __init__(self, backend=None):
+        """
+        :param backend: name or instance of the JSON backend, the fastest installed one if None
+        :type backend: str | prestans.json_backend.Backend | None
+        """
+        if not isinstance(backend, json_backend.Backend):
+            backend = json_backend.get_backend(backend)
 
-        if isinstance(input_string, bytes):
-            input_string = input_string.decode()
+        self._backend = backend
+
+    @property
+    def backend(self):
+        return self._backend
+
+    def loads(self, input_string):
 
         try:
-            parsed_json = json.loads(input_string)
+            parsed_json = self._backend.loads(input_string)
         except Exception as exp:
             raise prestans.exception.DeSerializationFailedError("JSON: %s" % exp)
-            
+
         return parsed_json
-        
+
     def content_type(self):
         return 'application/json'
 
@@ -66,9 +66,11 @@ class Inspector(object):
              not issubclass(type_instance, prestans.types.Model):
                 continue
 
-            blueprint = type_instance().blueprint()
+            model_instance = type_instance()
+            blueprint = model_instance.blueprint()
+            rewrite_map = model_instance.attribute_rewrite_map()
             for field_name, field_blueprint in iter(blueprint['fields'].items()):
-                field_blueprint['map_name'] = type_instance().attribute_rewrite_map()[field_name]
+                field_blueprint['map_name'] = rewrite_map[field_name]
             blueprints.append(blueprint)
 
         return blueprints
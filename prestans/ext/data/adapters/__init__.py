@@ -30,10 +30,23 @@
 #  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 import inspect
+import itertools
+import logging
 
 from prestans import exception
 from prestans import parser
 from prestans import types
+from prestans.types.schema import ModelSchema
+
+
+#: plans an adapter keeps before its cache is cleared
+_MAX_PLANS = 256
+
+#: objects lazy or projected collections adapt at a time when no batch_size is given
+_DEFERRED_BATCH_SIZE = 100
+
+#: getattr default telling apart attributes the persistent object doesn't have
+_MISSING = object()
 
 
 class ModelAdapter(object):
@@ -50,6 +63,7 @@ class ModelAdapter(object):
             raise TypeError("rest_model_class must be sub class of prestans.types.Model")
 
         self._persistent_model_class = persistent_model_class
+        self._plans = dict()
 
     @property
     def persistent_model_class(self):
@@ -59,109 +73,903 @@ class ModelAdapter(object):
     def rest_model_class(self):
         return self._rest_model_class
 
+    def adaptation_plan(self, persistent_model_class, attribute_filter=None):
+        """
+        :param persistent_model_class: class of the objects to adapt
+        :param attribute_filter:
+        :type attribute_filter: prestans.parser.AttributeFilter | prestans.parser.AttributeFilterImmutable |
+            prestans.parser.CompiledAttributeFilter | None
+        :return: the plan adapting objects of persistent_model_class, compiled on first use
+        :rtype: AdaptationPlan
+        """
+
+        attribute_filter = parser.compile_attribute_filter(self._rest_model_class, attribute_filter)
+        key = (persistent_model_class, attribute_filter)
+
+        plan = self._plans.get(key)
+        if plan is None or not plan.is_current():
+
+            if len(self._plans) >= _MAX_PLANS:
+                self._plans.clear()
+
+            plan = self._plans[key] = AdaptationPlan(self, persistent_model_class, attribute_filter)
+
+        return plan
+
+    def projection_plan(self, persistent_model_class, attribute_filter=None, serialization_filter=None,
+                        minified=False, trusted=False):
+        """
+        :param persistent_model_class: class of the objects to project
+        :param attribute_filter: filter the objects are adapted with
+        :param serialization_filter: filter the adapted models are serialized with
+        :param minified: whether or not to use minified attribute names
+        :type minified: bool
+        :param trusted: whether or not to write scalar values without validating them
+        :type trusted: bool
+        :return: the plan projecting objects of persistent_model_class, compiled on first use
+        :rtype: ProjectionPlan
+        """
+
+        attribute_filter = parser.compile_attribute_filter(self._rest_model_class, attribute_filter)
+        serialization_filter = parser.compile_attribute_filter(self._rest_model_class, serialization_filter)
+        key = (ProjectionPlan, persistent_model_class, attribute_filter, serialization_filter, minified is True,
+               trusted is True)
+
+        plan = self._plans.get(key)
+        if plan is None or not plan.is_current():
+
+            if len(self._plans) >= _MAX_PLANS:
+                self._plans.clear()
+
+            plan = self._plans[key] = ProjectionPlan(
+                self,
+                persistent_model_class,
+                attribute_filter,
+                serialization_filter,
+                minified is True,
+                trusted is True
+            )
+
+        return plan
+
     def adapt_persistent_to_rest(self, persistent_object, attribute_filter=None):
         """
         adapts a persistent model to a rest model by inspecting
         """
-        # convert filter to immutable if it isn't already
-        if isinstance(attribute_filter, parser.AttributeFilter):
-            attribute_filter = attribute_filter.as_immutable()
+        return self.adaptation_plan(persistent_object.__class__, attribute_filter).adapt(persistent_object)
 
-        rest_model_instance = self.rest_model_class()
 
-        for attribute_key in rest_model_instance.get_attribute_keys():
+class BatchLoader(object):
+    """
+    Fetches what a nested attribute refers to for many persistent objects at once
 
-            # attribute is not visible don't bother processing
-            if isinstance(attribute_filter, (parser.AttributeFilter, parser.AttributeFilterImmutable)) and \
-               not attribute_filter.is_attribute_visible(attribute_key):
-                continue
+    Once registered for a REST model with AdapterRegistryManager.register_batch_loader,
+    attributes holding that model, or an Array of it, are no longer read off each persistent
+    object. Adapting a collection collects the keys of a batch of objects, calls load once
+    for them, and adapts what it returns.
+    """
 
-            rest_attr = getattr(self.rest_model_class, attribute_key)
+    def key(self, persistent_object, attribute_key):
+        """
+        :param persistent_object: object being adapted
+        :param attribute_key: name of the nested attribute
+        :return: hashable key of what the attribute refers to, None if it refers to nothing
+        """
+        raise NotImplementedError
 
-            # don't bother processing if the persistent model doesn't have this attribute
-            if not hasattr(persistent_object, attribute_key):
+    def load(self, keys):
+        """
+        :param keys: distinct keys collected from a batch of persistent objects
+        :type keys: list
+        :return: by key, the persistent object of a Model attribute or the persistent objects
+        of an Array attribute; keys left out refer to nothing
+        :rtype: dict
+        """
+        raise NotImplementedError
 
-                if isinstance(rest_attr, types.Model):
-                    #: If the attribute is a Model, then we set it to None otherwise we get a model
-                    #: with default values, which is invalid when constructing responses
-                    try:
-                        setattr(rest_model_instance, attribute_key, None)
-                    # catch any exception thrown from setattr to give a usable error message
-                    except TypeError as exp:
-                        raise TypeError('Attribute %s, %s' % (attribute_key, str(exp)))
 
-                continue
+class AdaptationPlan(object):
+    """
+    The work ModelAdapter.adapt_persistent_to_rest does for every object of one persistent
+    class with one attribute filter, decided once
+
+    The plan holds a step for each visible attribute the persistent class may carry: copy
+    and validate a value, adapt a nested model, or fill an array. It also holds the
+    nested adapters and sub filters. Nested attributes with a registered BatchLoader are
+    filled by adapt_many for all objects at once instead. Attributes that are filtered out
+    or are methods of the persistent class keep the default of the REST model. Plans are
+    rebuilt when adapters or batch loaders are registered or the REST model class changes.
+    """
+
+    def __init__(self, adapter, persistent_model_class, attribute_filter):
+        """
+        :param adapter: adapter the plan is compiled for
+        :type adapter: ModelAdapter
+        :param persistent_model_class: class of the objects to adapt
+        :param attribute_filter:
+        :type attribute_filter: prestans.parser.CompiledAttributeFilter | None
+        """
+
+        rest_model_class = adapter.rest_model_class
+        schema = ModelSchema.for_class(rest_model_class)
+
+        self._rest_model_class = rest_model_class
+        self._schema = schema
+        self._generation = registry.generation
+
+        self._defaults = dict()
+        self._dynamic_defaults = list()
+        self._steps = list()
+        self._batched = list()
+
+        for attribute_key in schema.fields:
+
+            template = schema.templates[attribute_key]
+            step = None
+
+            # attribute is not visible don't bother processing
+            if attribute_filter is not None and not attribute_filter.is_attribute_visible(attribute_key):
+                pass
             # ignore class methods
-            elif inspect.ismethod(getattr(persistent_object, attribute_key)):
-                import logging
-                logging.error("ignoring method: "+attribute_key)
-                continue
+            elif _is_method(persistent_model_class, attribute_key):
+                logging.getLogger("prestans").error("ignoring method: " + attribute_key)
+            else:
+                sub_attribute_filter = None
+                if attribute_filter is not None:
+                    sub_attribute_filter = attribute_filter.child(schema.member_index[attribute_key])
+
+                batch_loader = _batch_loader(template)
+
+                if batch_loader is None:
+                    step = _compile_step(attribute_key, template, sub_attribute_filter)
+                    self._steps.append(step)
+                else:
+                    step = _BatchedAttribute(attribute_key, template, batch_loader, sub_attribute_filter)
+                    self._batched.append(step)
+
+            # values of date and time types may depend on when they are created
+            if isinstance(template, types.DataStructure):
+                if step is None:
+                    self._dynamic_defaults.append((attribute_key, template))
+            else:
+                self._defaults[attribute_key] = _default_value(template)
+
+    def is_current(self):
+        """
+        :return: False if adapters were registered or the REST model changed since compiling
+        :rtype: bool
+        """
+        return self._generation == registry.generation and self._schema.is_current()
+
+    def adapt(self, persistent_object):
+        """
+        :return: the REST model holding the validated attributes of persistent_object
+        :rtype: prestans.types.Model
+        """
+
+        if self._batched:
+            return self.adapt_many([persistent_object])[0]
+
+        attributes = self._defaults.copy()
+
+        for attribute_key, template in self._dynamic_defaults:
+            attributes[attribute_key] = _default_value(template)
+
+        for step in self._steps:
+            step(persistent_object, attributes)
+
+        return self._rest_model_class._from_attributes(attributes)
+
+    def adapt_many(self, persistent_objects):
+        """
+        Adapts persistent_objects calling each batch loader once for all of them
+
+        :param persistent_objects: objects of the persistent class the plan is compiled for
+        :type persistent_objects: list
+        :return: the adapted REST models in the same order
+        :rtype: list
+        """
+
+        if not self._batched:
+            return [self.adapt(persistent_object) for persistent_object in persistent_objects]
+
+        loaded = [batched.load(persistent_objects) for batched in self._batched]
+        rest_models = list()
+
+        for index, persistent_object in enumerate(persistent_objects):
+
+            attributes = self._defaults.copy()
 
-            # handles prestans array population from SQLAlchemy relationships
-            elif isinstance(rest_attr, types.Array):
+            for attribute_key, template in self._dynamic_defaults:
+                attributes[attribute_key] = _default_value(template)
 
-                persistent_attr_value = getattr(persistent_object, attribute_key)
-                rest_model_array_handle = getattr(rest_model_instance, attribute_key)
+            for step in self._steps:
+                step(persistent_object, attributes)
 
-                # iterator uses the .append method exposed by prestans arrays to validate
-                # and populate the collection in the instance.
-                for collection_element in persistent_attr_value:
-                    if rest_attr.is_scalar:
-                        rest_model_array_handle.append(collection_element)
-                    else:
-                        element_adapter = registry.get_adapter_for_rest_model(rest_attr.element_template)
+            for batched, (values, adapt) in zip(self._batched, loaded):
+                batched.assign(values[index], attributes, adapt)
 
-                        # check if there is a sub model filter
-                        sub_attribute_filter = None
-                        if attribute_filter and attribute_key in attribute_filter:
-                            sub_attribute_filter = getattr(attribute_filter, attribute_key)
+            rest_models.append(self._rest_model_class._from_attributes(attributes))
 
-                        adapted_rest_model = element_adapter.adapt_persistent_to_rest(
-                            collection_element,
-                            sub_attribute_filter
-                        )
-                        rest_model_array_handle.append(adapted_rest_model)
+        return rest_models
 
-            elif isinstance(rest_attr, types.Model):
 
-                try:
-                    persistent_attr_value = getattr(persistent_object, attribute_key)
+class ProjectionPlan(object):
+    """
+    Writes the serializable form of the REST models an adapter builds for one persistent
+    class straight from its objects
+
+    The output is the same as adapting an object with the attribute filter and calling
+    as_serializable on the result with the serialization filter, without building the REST
+    model or any nested one. Values are validated as adapting validates them unless the plan
+    is trusted, then scalar values are written as the persistent objects hold them. Classes
+    with batch loaded attributes are adapted and serialized instead.
+    """
+
+    def __init__(self, adapter, persistent_model_class, attribute_filter, serialization_filter, minified, trusted):
+        """
+        :param adapter: adapter the plan is compiled for
+        :type adapter: ModelAdapter
+        :param persistent_model_class: class of the objects to project
+        :param attribute_filter: filter the objects are adapted with
+        :type attribute_filter: prestans.parser.CompiledAttributeFilter | None
+        :param serialization_filter: filter the adapted models are serialized with
+        :type serialization_filter: prestans.parser.CompiledAttributeFilter | None
+        :param minified: whether or not to use minified attribute names
+        :type minified: bool
+        :param trusted: whether or not to write scalar values without validating them
+        :type trusted: bool
+        """
 
-                    if persistent_attr_value is None:
-                        adapted_rest_model = None
-                    else:
-                        model_adapter = registry.get_adapter_for_rest_model(rest_attr)
+        schema = ModelSchema.for_class(adapter.rest_model_class)
 
-                        # check if there is a sub model filter
-                        sub_attribute_filter = None
-                        if isinstance(attribute_filter, (parser.AttributeFilter, parser.AttributeFilterImmutable)) and \
-                                attribute_key in attribute_filter:
-                            sub_attribute_filter = getattr(attribute_filter, attribute_key)
+        self._schema = schema
+        self._generation = registry.generation
+        self._items = list()
+        self._adaptation_plan = None
 
-                        adapted_rest_model = model_adapter.adapt_persistent_to_rest(
-                            persistent_attr_value,
-                            sub_attribute_filter
-                        )
+        adaptation_plan = adapter.adaptation_plan(persistent_model_class, attribute_filter)
+        if adaptation_plan._batched:
+            self._adaptation_plan = adaptation_plan
+            self._serialization_filter = serialization_filter
+            self._minified = minified
+            return
 
-                    setattr(rest_model_instance, attribute_key, adapted_rest_model)
+        rewrite_map = schema.rewrite_map if minified else None
 
-                except TypeError as exp:
-                    raise TypeError('Attribute %s, %s' % (attribute_key, str(exp)))
-                except exception.DataValidationException as exp:
-                    raise exception.InconsistentPersistentDataError(attribute_key, str(exp))
+        for index, (attribute_key, template) in enumerate(schema.members):
 
+            if serialization_filter is not None and not serialization_filter.is_visible(index):
+                continue
+
+            sub_serialization_filter = None
+            if serialization_filter is not None:
+                sub_serialization_filter = serialization_filter.child(index)
+
+            if schema.kinds[attribute_key] == ModelSchema.OTHER:
+                project = _project_none
+            # attributes adapting leaves alone keep the default of the REST model
+            elif attribute_filter is not None and not attribute_filter.is_visible(index) or \
+                    _is_method(persistent_model_class, attribute_key):
+                project = _project_default(template, sub_serialization_filter, minified)
             else:
+                sub_attribute_filter = None
+                if attribute_filter is not None:
+                    sub_attribute_filter = attribute_filter.child(index)
+
+                project = _compile_projection(
+                    attribute_key,
+                    template,
+                    sub_attribute_filter,
+                    sub_serialization_filter,
+                    minified,
+                    trusted
+                )
+
+            self._items.append((rewrite_map[attribute_key] if rewrite_map else attribute_key, project))
+
+    def is_current(self):
+        """
+        :return: False if adapters were registered or the REST model changed since compiling
+        :rtype: bool
+        """
+        return self._generation == registry.generation and self._schema.is_current()
+
+    def project(self, persistent_object):
+        """
+        :return: the serializable form of the REST model persistent_object adapts to
+        :rtype: dict
+        """
+
+        if self._adaptation_plan is not None:
+            return self.project_many([persistent_object])[0]
+
+        serializable = dict()
+        for key, project in self._items:
+            serializable[key] = project(persistent_object)
+
+        return serializable
+
+    def project_many(self, persistent_objects):
+        """
+        :param persistent_objects: objects of the persistent class the plan is compiled for
+        :type persistent_objects: list
+        :return: the serializable forms in the same order
+        :rtype: list
+        """
+
+        if self._adaptation_plan is not None:
+            return [
+                rest_model.as_serializable(self._serialization_filter, self._minified)
+                for rest_model in self._adaptation_plan.adapt_many(persistent_objects)
+            ]
+
+        project = self.project
+        return [project(persistent_object) for persistent_object in persistent_objects]
+
+
+class _BatchedAttribute(object):
+    """
+    Nested attribute of an AdaptationPlan filled through a BatchLoader
+    """
+
+    def __init__(self, attribute_key, template, batch_loader, attribute_filter):
+        self.attribute_key = attribute_key
+        self.assign = _compile_assign(attribute_key, template)
+        self._is_array = isinstance(template, types.Array)
+        self._batch_loader = batch_loader
+
+        if self._is_array:
+            template = template.element_template
+
+        self._adapt_many = _nested_adapt_many(template, attribute_filter)
+
+    def load(self, persistent_objects):
+        """
+        :return: the persistent value of the attribute for each of persistent_objects, and a
+        function handing out their adapted nested objects in the same order
+        :rtype: tuple
+        """
+
+        attribute_key = self.attribute_key
+        keys = [self._batch_loader.key(persistent_object, attribute_key) for persistent_object in persistent_objects]
+
+        distinct_keys = list()
+        seen = set()
+        for key in keys:
+            if key is not None and key not in seen:
+                seen.add(key)
+                distinct_keys.append(key)
+
+        loaded = self._batch_loader.load(distinct_keys) if distinct_keys else dict()
+
+        if self._is_array:
+            values = [list(loaded.get(key, ())) if key is not None else [] for key in keys]
+            nested_objects = [nested_object for value in values for nested_object in value]
+        else:
+            values = [loaded.get(key) if key is not None else None for key in keys]
+            nested_objects = [value for value in values if value is not None]
+
+        # nested objects are adapted together so batch loaders further down are called once too
+        rest_models = iter(self._adapt_many(nested_objects))
+
+        def adapt(persistent_object):
+            return next(rest_models)
+
+        return values, adapt
+
+
+def _is_method(persistent_model_class, attribute_key):
+    """
+    :return: True if attribute_key is a method of persistent_model_class, looked up
+    without invoking descriptors such as SQLAlchemy instrumented attributes
+    :rtype: bool
+    """
+
+    for klass in inspect.getmro(persistent_model_class):
+        if attribute_key in klass.__dict__:
+            attribute = klass.__dict__[attribute_key]
+            return inspect.isfunction(attribute) or isinstance(attribute, classmethod)
+
+    return False
+
+
+def _default_value(template):
+    """
+    :return: the value a new instance of the REST model holds for template
+    """
+
+    try:
+        return template.validate(None)
+    # we can safely ignore required warnings during initialization
+    except exception.RequiredAttributeError:
+        return None
+
+
+def _validate_attribute(attribute_key, template, value):
+    """
+    Validates value as assigning it to a REST model attribute does
+    """
+
+    try:
+        # if given an instance of data collection we can directly set it
+        if isinstance(template, types.DataCollection) and template.__class__ == value.__class__:
+            return value
+
+        return template.validate(value)
+
+    except exception.DataValidationException as exp:
+        raise _validation_error(attribute_key, template, value, exp)
+
+
+def _validation_error(attribute_key, template, value, exp):
+    """
+    :return: the ValidationError assigning value to a REST model attribute raises
+    :rtype: prestans.exception.ValidationError
+    """
+    return exception.ValidationError(
+        message=str(exp),
+        attribute_name=attribute_key,
+        value=value,
+        blueprint=template.blueprint()
+    )
+
+
+def _nested_adapt(rest_model, attribute_filter):
+    """
+    :return: function adapting a persistent object to rest_model with the registered adapter
+    :rtype: function
+    """
+
+    try:
+        adapter = registry.get_adapter_for_rest_model(rest_model)
+    except TypeError:
+        # raised again for every object there is no adapter for
+        def adapt(persistent_object):
+            return registry.get_adapter_for_rest_model(rest_model).adapt_persistent_to_rest(
+                persistent_object,
+                attribute_filter
+            )
+        return adapt
+
+    return _adapt_function(adapter, attribute_filter)
+
+
+def _adapt_function(adapter, attribute_filter):
+    """
+    :return: function adapting a persistent object with adapter, compiling a plan once
+    for each persistent class it sees
+    :rtype: function
+    """
+
+    # adapters customising adapt_persistent_to_rest are called as they are
+    if adapter.__class__.adapt_persistent_to_rest != ModelAdapter.adapt_persistent_to_rest:
+        def adapt(persistent_object):
+            return adapter.adapt_persistent_to_rest(persistent_object, attribute_filter)
+        return adapt
+
+    plans = dict()
+
+    def adapt(persistent_object):
+
+        plan = plans.get(persistent_object.__class__)
+        if plan is None or not plan.is_current():
+            plan = plans[persistent_object.__class__] = adapter.adaptation_plan(
+                persistent_object.__class__,
+                attribute_filter
+            )
+
+        return plan.adapt(persistent_object)
+
+    return adapt
+
+
+def _nested_adapt_many(rest_model, attribute_filter):
+    """
+    :return: function adapting a list of persistent objects to rest_model with the registered adapter
+    :rtype: function
+    """
+
+    try:
+        adapter = registry.get_adapter_for_rest_model(rest_model)
+    except TypeError:
+        adapt = _nested_adapt(rest_model, attribute_filter)
+
+        def adapt_many(persistent_objects):
+            return [adapt(persistent_object) for persistent_object in persistent_objects]
+        return adapt_many
+
+    return _adapt_many_function(adapter, attribute_filter)
+
+
+def _adapt_many_function(adapter, attribute_filter):
+    """
+    :return: function adapting a list of persistent objects with adapter, each persistent
+    class with its own plan so batch loaders are called once per class
+    :rtype: function
+    """
+
+    if adapter.__class__.adapt_persistent_to_rest != ModelAdapter.adapt_persistent_to_rest:
+        def adapt_many(persistent_objects):
+            return [
+                adapter.adapt_persistent_to_rest(persistent_object, attribute_filter)
+                for persistent_object in persistent_objects
+            ]
+        return adapt_many
+
+    plans = dict()
+
+    def plan_for_class(persistent_model_class):
 
-                # otherwise copy the value to the rest model
-                try:
-                    persistent_attr_value = getattr(persistent_object, attribute_key)
-                    setattr(rest_model_instance, attribute_key, persistent_attr_value)
-                except TypeError as exp:
-                    raise TypeError('Attribute %s, %s' % (attribute_key, str(exp)))
-                except exception.ValidationError as exp:
-                    raise exception.InconsistentPersistentDataError(attribute_key, str(exp))
+        plan = plans.get(persistent_model_class)
+        if plan is None or not plan.is_current():
+            plan = plans[persistent_model_class] = adapter.adaptation_plan(
+                persistent_model_class,
+                attribute_filter
+            )
 
-        return rest_model_instance
+        return plan.adapt_many
+
+    def adapt_many(persistent_objects):
+        return _apply_plans(persistent_objects, plan_for_class)
+
+    return adapt_many
+
+
+def _apply_plans(persistent_objects, plan_for_class):
+    """
+    Hands the objects of each persistent class to the plan function for that class
+
+    :param persistent_objects:
+    :type persistent_objects: list
+    :param plan_for_class: returns a function taking a list of objects of the class it's given
+    and returning a result for each in the same order
+    :type plan_for_class: function
+    :return: the results in the order of persistent_objects
+    :rtype: list
+    """
+
+    if not persistent_objects:
+        return []
+
+    # collections of a single class are the common case
+    first_class = persistent_objects[0].__class__
+    if all(persistent_object.__class__ is first_class for persistent_object in persistent_objects):
+        return plan_for_class(first_class)(persistent_objects)
+
+    indices_by_class = dict()
+    for index, persistent_object in enumerate(persistent_objects):
+        indices_by_class.setdefault(persistent_object.__class__, []).append(index)
+
+    results = [None] * len(persistent_objects)
+
+    for persistent_model_class, indices in indices_by_class.items():
+
+        plan_results = plan_for_class(persistent_model_class)([persistent_objects[index] for index in indices])
+        for index, result in zip(indices, plan_results):
+            results[index] = result
+
+    return results
+
+
+def _nested_project(rest_model, attribute_filter, serialization_filter, minified, trusted):
+    """
+    :return: function projecting a persistent object to the serializable form of rest_model
+    :rtype: function
+    """
+
+    try:
+        adapter = registry.get_adapter_for_rest_model(rest_model)
+    except TypeError:
+        # raised again for every object there is no adapter for
+        adapt = _nested_adapt(rest_model, attribute_filter)
+
+        def project(persistent_object):
+            return adapt(persistent_object).as_serializable(serialization_filter, minified)
+        return project
+
+    project_many = _project_many_function(adapter, attribute_filter, serialization_filter, minified, trusted)
+
+    def project(persistent_object):
+        return project_many([persistent_object])[0]
+
+    return project
+
+
+def _project_many_function(adapter, attribute_filter, serialization_filter, minified, trusted):
+    """
+    :return: function projecting a list of persistent objects with adapter, compiling a
+    plan once for each persistent class it sees
+    :rtype: function
+    """
+
+    # adapters customising adapt_persistent_to_rest are called as they are
+    if adapter.__class__.adapt_persistent_to_rest != ModelAdapter.adapt_persistent_to_rest:
+        def project_many(persistent_objects):
+            return [
+                adapter.adapt_persistent_to_rest(persistent_object, attribute_filter).as_serializable(
+                    serialization_filter,
+                    minified
+                )
+                for persistent_object in persistent_objects
+            ]
+        return project_many
+
+    plans = dict()
+
+    def plan_for_class(persistent_model_class):
+
+        plan = plans.get(persistent_model_class)
+        if plan is None or not plan.is_current():
+            plan = plans[persistent_model_class] = adapter.projection_plan(
+                persistent_model_class,
+                attribute_filter,
+                serialization_filter,
+                minified,
+                trusted
+            )
+
+        return plan.project_many
+
+    def project_many(persistent_objects):
+        return _apply_plans(persistent_objects, plan_for_class)
+
+    return project_many
+
+
+def _serialize_function(template, serialization_filter, minified):
+    """
+    :return: function turning a validated attribute value into what the serializer of its
+    model writes for it
+    :rtype: function
+    """
+
+    if isinstance(template, types.Array):
+        def serialize(value):
+            return [] if value is None else value.as_serializable(serialization_filter, minified)
+    elif isinstance(template, types.DataCollection):
+        def serialize(value):
+            return None if value is None else value.as_serializable(serialization_filter, minified)
+    elif isinstance(template, types.DataStructure):
+        def serialize(value):
+            return None if value is None else template.as_serializable(value)
+    else:
+        def serialize(value):
+            return value
+
+    return serialize
+
+
+def _project_none(persistent_object):
+    return None
+
+
+def _project_default(template, serialization_filter, minified):
+    """
+    :return: function writing the serializable form of the default value of template
+    :rtype: function
+    """
+
+    serialize = _serialize_function(template, serialization_filter, minified)
+
+    def project(persistent_object):
+        return serialize(_default_value(template))
+
+    return project
+
+
+def _compile_projection(attribute_key, template, attribute_filter, serialization_filter, minified, trusted):
+    """
+    :return: function writing the serializable form of attribute_key of a persistent object
+    :rtype: function
+    """
+
+    serialize = _serialize_function(template, serialization_filter, minified)
+
+    if isinstance(template, types.Array):
+
+        if template.is_scalar:
+            def project(persistent_object):
+
+                persistent_attr_value = getattr(persistent_object, attribute_key, _MISSING)
+                if persistent_attr_value is _MISSING:
+                    return serialize(_default_value(template))
+
+                if trusted:
+                    return list(persistent_attr_value)
+
+                rest_model_array = template.clone()
+                rest_model_array.extend(list(persistent_attr_value))
+                return rest_model_array.as_serializable()
+
+            return project
+
+        project_element = _nested_project(
+            template.element_template,
+            attribute_filter,
+            serialization_filter,
+            minified,
+            trusted
+        )
+
+        def project(persistent_object):
+
+            persistent_attr_value = getattr(persistent_object, attribute_key, _MISSING)
+            if persistent_attr_value is _MISSING:
+                return serialize(_default_value(template))
+
+            return [project_element(collection_element) for collection_element in persistent_attr_value]
+
+        return project
+
+    elif isinstance(template, types.Model):
+
+        project_model = _nested_project(template, attribute_filter, serialization_filter, minified, trusted)
+
+        def project(persistent_object):
+
+            persistent_attr_value = getattr(persistent_object, attribute_key, None)
+
+            if persistent_attr_value is None:
+                return serialize(_validate_attribute(attribute_key, template, None))
+
+            try:
+                return project_model(persistent_attr_value)
+            except TypeError as exp:
+                raise TypeError('Attribute %s, %s' % (attribute_key, str(exp)))
+            except exception.DataValidationException as exp:
+                raise exception.InconsistentPersistentDataError(attribute_key, str(exp))
+
+        return project
+
+    is_data_type = not isinstance(template, types.DataStructure)
+
+    def project(persistent_object):
+
+        persistent_attr_value = getattr(persistent_object, attribute_key, _MISSING)
+
+        if persistent_attr_value is _MISSING:
+            return serialize(_default_value(template))
+
+        if trusted:
+            return persistent_attr_value if is_data_type else serialize(persistent_attr_value)
+
+        try:
+            value = template.validate(persistent_attr_value)
+        except TypeError as exp:
+            raise TypeError('Attribute %s, %s' % (attribute_key, str(exp)))
+        except exception.DataValidationException as exp:
+            raise exception.InconsistentPersistentDataError(
+                attribute_key,
+                str(_validation_error(attribute_key, template, persistent_attr_value, exp))
+            )
+
+        return value if is_data_type else serialize(value)
+
+    return project
+
+
+def _batch_loader(template):
+    """
+    :return: the batch loader registered for a Model or Array of Model template, if any
+    :rtype: BatchLoader | None
+    """
+
+    if isinstance(template, types.Array):
+        template = template.element_template
+
+    if not isinstance(template, types.Model):
+        return None
+
+    return registry.get_batch_loader(template)
+
+
+def _compile_assign(attribute_key, template):
+    """
+    :return: function setting attribute_key in an attributes dict from the persistent value
+    of a Model or Array of Model attribute, adapting nested objects with the function given
+    :rtype: function
+    """
+
+    if isinstance(template, types.Array):
+
+        # uses the .append method exposed by prestans arrays to validate
+        # and populate the collection in the instance.
+        def assign(persistent_attr_value, attributes, adapt):
+
+            rest_model_array = template.clone()
+            attributes[attribute_key] = rest_model_array
+
+            for collection_element in persistent_attr_value:
+                rest_model_array.append(adapt(collection_element))
+
+        return assign
+
+    def assign(persistent_attr_value, attributes, adapt):
+
+        #: If the attribute is a Model, then we set it to None otherwise we get a model
+        #: with default values, which is invalid when constructing responses; a required
+        #: model raises the ValidationError setting it to None does
+        if persistent_attr_value is None:
+            attributes[attribute_key] = _validate_attribute(attribute_key, template, None)
+            return
+
+        try:
+            attributes[attribute_key] = _validate_attribute(attribute_key, template, adapt(persistent_attr_value))
+        except TypeError as exp:
+            raise TypeError('Attribute %s, %s' % (attribute_key, str(exp)))
+        except exception.DataValidationException as exp:
+            raise exception.InconsistentPersistentDataError(attribute_key, str(exp))
+
+    return assign
+
+
+def _compile_step(attribute_key, template, attribute_filter):
+    """
+    :return: function copying attribute_key from a persistent object into an attributes dict
+    :rtype: function
+    """
+
+    # handles prestans array population from SQLAlchemy relationships
+    if isinstance(template, types.Array):
+
+        # scalar collections are validated in one pass by the .extend method
+        # exposed by prestans arrays
+        if template.is_scalar:
+            def step(persistent_object, attributes):
+
+                persistent_attr_value = getattr(persistent_object, attribute_key, _MISSING)
+                if persistent_attr_value is _MISSING:
+                    return
+
+                rest_model_array = template.clone()
+                rest_model_array.extend(list(persistent_attr_value))
+                attributes[attribute_key] = rest_model_array
+
+            return step
+
+        adapt_element = _nested_adapt(template.element_template, attribute_filter)
+        assign = _compile_assign(attribute_key, template)
+
+        def step(persistent_object, attributes):
+
+            persistent_attr_value = getattr(persistent_object, attribute_key, _MISSING)
+            if persistent_attr_value is not _MISSING:
+                assign(persistent_attr_value, attributes, adapt_element)
+
+        return step
+
+    elif isinstance(template, types.Model):
+
+        adapt_model = _nested_adapt(template, attribute_filter)
+        assign = _compile_assign(attribute_key, template)
+
+        def step(persistent_object, attributes):
+            assign(getattr(persistent_object, attribute_key, None), attributes, adapt_model)
+
+        return step
+
+    # otherwise copy the value to the rest model
+    def step(persistent_object, attributes):
+
+        persistent_attr_value = getattr(persistent_object, attribute_key, _MISSING)
+
+        if persistent_attr_value is _MISSING:
+            if isinstance(template, types.DataStructure):
+                attributes[attribute_key] = _default_value(template)
+            return
+
+        try:
+            attributes[attribute_key] = template.validate(persistent_attr_value)
+        except TypeError as exp:
+            raise TypeError('Attribute %s, %s' % (attribute_key, str(exp)))
+        except exception.DataValidationException as exp:
+            raise exception.InconsistentPersistentDataError(
+                attribute_key,
+                str(_validation_error(attribute_key, template, persistent_attr_value, exp))
+            )
+
+    return step
 
 
 def adapt_persistent_instance(persistent_object, target_rest_class=None, attribute_filter=None):
@@ -193,52 +1001,120 @@ def adapt_persistent_instance(persistent_object, target_rest_class=None, attribu
     return adapter_instance.adapt_persistent_to_rest(persistent_object, attribute_filter)
 
 
-def adapt_persistent_collection(persistent_collection, target_rest_class=None, attribute_filter=None):
-    # ensure that collection is iterable and has at least one element
-    persistent_collection_length = 0
+def adapt_persistent_collection(persistent_collection, target_rest_class=None, attribute_filter=None,
+                                batch_size=None, lazy=False, project=False, trusted=False):
+    """
+    Adapts every object of persistent_collection in a single pass over it
+
+    The adapter is chosen by the first object, so queries are executed exactly once rather
+    than counted and indexed beforehand.
+
+    :param persistent_collection: list, tuple, SQLAlchemy or NDB query, or any other iterable
+    :param target_rest_class: REST model class or instance, required to adapt an empty collection
+    :param attribute_filter:
+    :param batch_size: number of rows a query fetches at a time, using yield_per for SQLAlchemy
+    and the batch_size option for NDB, and number of objects each BatchLoader is called for;
+    all objects are adapted together by default, lazy and projected collections take 100 at a time
+    :type batch_size: int
+    :param lazy: whether or not to adapt objects as the returned Array is iterated instead of
+    up front, see Array.from_iterable
+    :type lazy: bool
+    :param project: whether or not to write the serializable form of the objects straight from
+    them when the returned Array is serialized, see ProjectionPlan; REST models are only
+    adapted if the Array is used otherwise first
+    :type project: bool
+    :param trusted: whether or not projecting writes scalar values without validating them
+    :type trusted: bool
+    :rtype: prestans.types.Array
+    """
+
+    if inspect.isclass(target_rest_class):
+        target_rest_class = target_rest_class()
 
-    # attempt to detect the length of the persistent_collection
-    if persistent_collection and isinstance(persistent_collection, (list, tuple)):
-        persistent_collection_length = len(persistent_collection)
-    # SQLAlchemy query
-    elif persistent_collection and persistent_collection.__module__ == "sqlalchemy.orm.query":
-        persistent_collection_length = persistent_collection.count()
-    # Google App Engine NDB
-    elif persistent_collection and persistent_collection.__module__ == "google.appengine.ext.ndb":
-        persistent_collection_length = persistent_collection.count()
+    if persistent_collection is None:
+        persistent_collection = ()
+
+    if batch_size is not None:
+        # SQLAlchemy query
+        if hasattr(persistent_collection, "yield_per"):
+            persistent_collection = persistent_collection.yield_per(batch_size)
+        # Google App Engine NDB
+        elif getattr(persistent_collection, "__module__", "").startswith("google.appengine.ext.ndb"):
+            persistent_collection = persistent_collection.iter(batch_size=batch_size)
+
+    persistent_objects = iter(persistent_collection)
+    first_object = next(persistent_objects, _MISSING)
 
     # if the persistent_collection is empty then return a blank array
-    if persistent_collection_length == 0:
-        return types.Array(element_template=target_rest_class())
+    if first_object is _MISSING:
+        if target_rest_class is None:
+            raise TypeError("target_rest_class is required to adapt an empty collection")
 
-    # try and get the adapter and the REST class for the persistent object
-    if target_rest_class is None:
-        adapter_instance = registry.get_adapter_for_persistent_model(
-            persistent_collection[0]
-        )
-    else:
-        if inspect.isclass(target_rest_class):
-            target_rest_class = target_rest_class()
+        return types.Array(element_template=target_rest_class)
 
-        adapter_instance = registry.get_adapter_for_persistent_model(
-            persistent_collection[0],
-            target_rest_class
-        )
+    # try and get the adapter and the REST class for the persistent object
+    adapter_instance = registry.get_adapter_for_persistent_model(first_object, target_rest_class)
 
     # would raise an exception if the attribute_filter differs from the target_rest_class
     if attribute_filter is not None and isinstance(attribute_filter, parser.AttributeFilter):
-        parser.AttributeFilter.from_model(target_rest_class).conforms_to_template_filter(attribute_filter)
+        parser.AttributeFilter.from_model(
+            target_rest_class or adapter_instance.rest_model_class()
+        ).conforms_to_template_filter(attribute_filter)
 
     # convert filter to immutable if it isn't already
     if isinstance(attribute_filter, parser.AttributeFilter):
         attribute_filter = attribute_filter.as_immutable()
 
-    adapted_models = types.Array(element_template=adapter_instance.rest_model_class())
+    persistent_objects = itertools.chain((first_object,), persistent_objects)
+    adapt_many = _adapt_many_function(adapter_instance, attribute_filter)
+
+    if not lazy and not project:
+        if batch_size is None:
+            adapted_objects = adapt_many(list(persistent_objects))
+        else:
+            adapted_objects = list(_in_batches(adapt_many, persistent_objects, batch_size))
+
+        return types.Array(element_template=adapter_instance.rest_model_class(), elements=adapted_objects)
+
+    # projected arrays read objects that are fetched now when they are serialized
+    if not lazy:
+        persistent_objects = list(persistent_objects)
+
+    # batch loaders are called once per batch, deferred work is done one batch at a time
+    if batch_size is None:
+        batch_size = _DEFERRED_BATCH_SIZE
+
+    serializable = None
+    if project:
+        def serializable(serialization_filter, minified):
+            project_many = _project_many_function(
+                adapter_instance,
+                attribute_filter,
+                serialization_filter,
+                minified,
+                trusted
+            )
+            return _in_batches(project_many, iter(persistent_objects), batch_size)
+
+    return types.Array.from_iterable(
+        adapter_instance.rest_model_class(),
+        _in_batches(adapt_many, iter(persistent_objects), batch_size),
+        serializable=serializable
+    )
+
+
+def _in_batches(function, persistent_objects, batch_size):
+    """
+    Applies function to batch_size persistent objects at a time as the results are iterated
+    """
 
-    for persistent_object in persistent_collection:
-        adapted_models.append(adapter_instance.adapt_persistent_to_rest(persistent_object, attribute_filter))
+    while True:
+        batch = list(itertools.islice(persistent_objects, batch_size))
+        if not batch:
+            return
 
-    return adapted_models
+        for result in function(batch):
+            yield result
 
 
 class AdapterRegistryManager(object):
@@ -253,6 +1129,16 @@ class AdapterRegistryManager(object):
     def __init__(self):
         self._persistent_map = dict()
         self._rest_map = dict()
+        self._batch_loaders = dict()
+        self._generation = 0
+
+    @property
+    def generation(self):
+        """
+        :return: counter incremented whenever the registered adapters change
+        :rtype: int
+        """
+        return self._generation
 
     @classmethod
     def generate_signature(cls, class_or_instance):
@@ -280,6 +1166,7 @@ class AdapterRegistryManager(object):
         # the default is always the last registered model (to match behaviour before this was patched)
         self._persistent_map[persistent_class_signature][self.DEFAULT_REST_ADAPTER] = model_adapter
         self._persistent_map[persistent_class_signature][rest_class_signature] = model_adapter
+        self._generation += 1
 
     def register_persistent_rest_pair(self, persistent_model_class, rest_model_class):
         """
@@ -291,12 +1178,28 @@ class AdapterRegistryManager(object):
             persistent_model_class=persistent_model_class
         ))
 
+    def register_batch_loader(self, rest_model_class, batch_loader):
+        """
+        :param rest_model_class: REST model whose nested attributes batch_loader fills
+        :param batch_loader:
+        :type batch_loader: BatchLoader
+        """
+
+        if not isinstance(batch_loader, BatchLoader):
+            msg = "Registry received instance of type %s is not a BatchLoader" % batch_loader.__class__.__name__
+            raise TypeError(msg)
+
+        self._batch_loaders[self.generate_signature(rest_model_class)] = batch_loader
+        self._generation += 1
+
     def clear_registered_adapters(self):
         """
-        Clears all of the currently registered model adapters
+        Clears all of the currently registered model adapters and batch loaders
         """
         self._persistent_map.clear()
         self._rest_map.clear()
+        self._batch_loaders.clear()
+        self._generation += 1
 
     def get_adapter_for_persistent_model(self, persistent_model, rest_model=None):
         """
@@ -333,6 +1236,14 @@ class AdapterRegistryManager(object):
 
         return self._rest_map[class_signature]
 
+    def get_batch_loader(self, rest_model):
+        """
+        :param rest_model: REST model class or instance
+        :return: the batch loader registered for rest_model, None if there is none
+        :rtype: BatchLoader | None
+        """
+        return self._batch_loaders.get(self.generate_signature(rest_model))
+
 
 # singleton instantiated if adapter package is imported
 registry = AdapterRegistryManager()
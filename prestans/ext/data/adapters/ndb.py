@@ -41,11 +41,20 @@ def adapt_persistent_instance(persistent_object, target_rest_class=None, attribu
     return adapters.adapt_persistent_instance(persistent_object, target_rest_class, attribute_filter)
 
 
-def adapt_persistent_collection(persistent_collection, target_rest_class=None, attribute_filter=None):
+def adapt_persistent_collection(persistent_collection, target_rest_class=None, attribute_filter=None,
+                                batch_size=None, lazy=False, project=False, trusted=False):
     """
     Wrapper on adapters.adapt_persistent_collection for Google App Engine NDB
     """
-    return adapters.adapt_persistent_collection(persistent_collection, target_rest_class, attribute_filter)
+    return adapters.adapt_persistent_collection(
+        persistent_collection,
+        target_rest_class,
+        attribute_filter,
+        batch_size=batch_size,
+        lazy=lazy,
+        project=project,
+        trusted=trusted
+    )
 
 
 class ModelAdapter(adapters.ModelAdapter):
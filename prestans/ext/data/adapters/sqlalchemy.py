@@ -29,12 +29,20 @@
 #  (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 #  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
+from __future__ import absolute_import
+
 __all__ = [
     'adapt_persistent_instance',
-    'adapt_persistent_collection'
+    'adapt_persistent_collection',
+    'apply_attribute_filter'
 ]
 
+import inspect
+
+from prestans import parser
+from prestans import types
 from prestans.ext.data import adapters
+from prestans.types.schema import ModelSchema
 
 
 def adapt_persistent_instance(persistent_object, target_rest_class=None, attribute_filter=None):
@@ -44,12 +52,125 @@ def adapt_persistent_instance(persistent_object, target_rest_class=None, attribu
     return adapters.adapt_persistent_instance(persistent_object, target_rest_class, attribute_filter)
 
 
-def adapt_persistent_collection(persistent_collection, target_rest_class=None, attribute_filter=None):
+def adapt_persistent_collection(persistent_collection, target_rest_class=None, attribute_filter=None,
+                                batch_size=None, lazy=False, project=False, trusted=False):
     """
     Wrapper on adapters.adapt_persistent_collection for SQLAlchemy
     """
-    return adapters.adapt_persistent_collection(persistent_collection, target_rest_class, attribute_filter)
-    
+    return adapters.adapt_persistent_collection(
+        persistent_collection,
+        target_rest_class,
+        attribute_filter,
+        batch_size=batch_size,
+        lazy=lazy,
+        project=project,
+        trusted=trusted
+    )
+
+
+def apply_attribute_filter(query, target_rest_class, attribute_filter=None, relationship_loader=None):
+    """
+    Adds loader options to query so it loads what target_rest_class shows through attribute_filter
+
+    Only the columns of visible attributes are loaded, and relationships of visible attributes
+    are loaded for all rows in one go rather than lazily one object at a time. Sub filters
+    apply the same way to the related classes. All columns of a class are loaded if one of
+    its visible attributes is a plain Python property or other unmapped attribute, as it may
+    read any of them.
+
+    :param query: SQLAlchemy Query or select() of a single mapped class
+    :param target_rest_class: REST model class or instance the results are adapted to
+    :param attribute_filter:
+    :type attribute_filter: prestans.parser.AttributeFilter
+    :param relationship_loader: loader option for relationships, sqlalchemy.orm.selectinload by default
+    :return: query with the loader options applied
+    """
+    from sqlalchemy import orm
+
+    if relationship_loader is None:
+        relationship_loader = orm.selectinload
+
+    if not inspect.isclass(target_rest_class):
+        target_rest_class = target_rest_class.__class__
+
+    persistent_model_class = query.column_descriptions[0]["entity"]
+    attribute_filter = parser.compile_attribute_filter(target_rest_class, attribute_filter)
+
+    return query.options(*_loader_options(
+        persistent_model_class,
+        target_rest_class,
+        attribute_filter,
+        relationship_loader
+    ))
+
+
+def _loader_options(persistent_model_class, rest_model_class, attribute_filter, relationship_loader):
+    """
+    :return: loader options for persistent_model_class, relative to where it's loaded from
+    :rtype: list
+    """
+    from sqlalchemy import inspect as sqlalchemy_inspect
+    from sqlalchemy import orm
+
+    mapper = sqlalchemy_inspect(persistent_model_class)
+    schema = ModelSchema.for_class(rest_model_class)
+
+    column_keys = list()
+    options = list()
+    all_columns = False
+
+    for attribute_key in schema.fields:
+
+        if attribute_filter is not None and not attribute_filter.is_attribute_visible(attribute_key):
+            continue
+
+        if attribute_key in mapper.column_attrs:
+            column_keys.append(attribute_key)
+        elif attribute_key in mapper.relationships:
+            relationship = mapper.relationships[attribute_key]
+
+            # the relationship is loaded by the values of its local columns
+            column_keys.extend(mapper.get_property_by_column(column).key for column in relationship.local_columns)
+
+            template = schema.templates[attribute_key]
+            if isinstance(template, types.Array):
+                template = template.element_template
+
+            loader = relationship_loader(getattr(persistent_model_class, attribute_key))
+
+            if isinstance(template, types.Model):
+                sub_attribute_filter = None
+                if attribute_filter is not None:
+                    sub_attribute_filter = attribute_filter.child(schema.member_index[attribute_key])
+
+                nested_options = _loader_options(
+                    relationship.mapper.class_,
+                    template.__class__,
+                    sub_attribute_filter,
+                    relationship_loader
+                )
+                if nested_options:
+                    loader = loader.options(*nested_options)
+
+            options.append(loader)
+        # adapters ignore methods, anything else may read any column
+        elif hasattr(persistent_model_class, attribute_key) and \
+                not adapters._is_method(persistent_model_class, attribute_key):
+            all_columns = True
+
+    if not all_columns:
+        if not column_keys:
+            column_keys = [mapper.get_property_by_column(column).key for column in mapper.primary_key]
+
+        unique_keys = list()
+        for column_key in column_keys:
+            if column_key not in unique_keys:
+                unique_keys.append(column_key)
+
+        options.insert(0, orm.load_only(*[getattr(persistent_model_class, key) for key in unique_keys]))
+
+    return options
+
 
 class ModelAdapter(adapters.ModelAdapter):
 
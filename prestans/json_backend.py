@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+#
+#  prestans, A WSGI compliant REST micro-framework
+#  http://prestans.org
+#
+#  Copyright (c) 2017, Anomaly Software Pty Ltd.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#      * Redistributions of source code must retain the above copyright
+#        notice, this list of conditions and the following disclaimer.
+#      * Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#      * Neither the name of Anomaly Software nor the
+#        names of its contributors may be used to endorse or promote products
+#        derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+#  ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+#  WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL ANOMALY SOFTWARE BE LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#  (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+#  LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+#  ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#  (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""
+JSON encoders and decoders used by prestans.serializer.JSON and prestans.deserializer.JSON
+
+The fastest installed library is used unless one is asked for by name: orjson, ujson
+and rapidjson are tried in that order before falling back to the standard library.
+Every backend writes compact UTF-8 encoded bytes and reads either bytes or str.
+
+The faster libraries hand documents they can't write or read the way the standard
+library does (integers wider than 64 bits, NaN and Infinity) over to Stdlib, so every
+backend reads and writes the same values; only the spelling of floats written in
+exponent notation can differ (1e16 rather than 1e+16).
+"""
+
+import math
+
+__all__ = ['Backend', 'Stdlib', 'Orjson', 'Ujson', 'Rapidjson', 'get_backend']
+
+
+class Backend(object):
+
+    #: name the backend is selected with
+    name = None
+
+    def dumps(self, serializable_object, sort_keys=True):
+        """
+        :param serializable_object: object made of dict, list, str, int, float, bool and None
+        :param sort_keys: whether or not to write the keys of objects in sorted order
+        :type sort_keys: bool
+        :return: the UTF-8 encoded JSON document
+        :rtype: bytes
+        """
+        raise NotImplementedError
+
+    def loads(self, input_string):
+        """
+        :param input_string: the JSON document, bytes are expected to be UTF-8 encoded
+        :type input_string: bytes | str
+        """
+        raise NotImplementedError
+
+
+class Stdlib(Backend):
+
+    name = "json"
+
+    def __init__(self):
+        import json
+
+        self._json = json
+        self._encoders = {
+            sort_keys: json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys)
+            for sort_keys in [True, False]
+        }
+
+    def dumps(self, serializable_object, sort_keys=True):
+        return self._encoders[bool(sort_keys)].encode(serializable_object).encode("utf-8")
+
+    def loads(self, input_string):
+
+        if isinstance(input_string, bytes):
+            input_string = input_string.decode("utf-8")
+
+        return self._json.loads(input_string)
+
+
+def _has_non_finite_float(serializable_object):
+    """
+    Only looks into dict, list and tuple; orjson hands subclasses of them over to Stdlib.
+
+    :return: True if NaN, Infinity or -Infinity appears anywhere in serializable_object
+    :rtype: bool
+    """
+
+    object_type = type(serializable_object)
+
+    if object_type is dict:
+        values = serializable_object.values()
+    elif object_type is list or object_type is tuple:
+        values = serializable_object
+    else:
+        return object_type is float and not math.isfinite(serializable_object)
+
+    for value in values:
+        value_type = type(value)
+
+        if value_type is float:
+            if not math.isfinite(value):
+                return True
+        elif value_type is dict or value_type is list or value_type is tuple:
+            if _has_non_finite_float(value):
+                return True
+
+    return False
+
+
+#: any integer outside of the 64 bit range has at least 19 digits
+_LONG_NUMBER = b"0" * 19
+
+
+class Orjson(Backend):
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        self._fallback = Stdlib()
+
+        # turns every run of digits into a run of zeros
+        self._digits_to_zeros = bytes.maketrans(b"123456789", b"000000000")
+
+        # leave subclasses, dates and dataclasses to Stdlib
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_SUBCLASS | \
+            orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        self._options = {
+            True: options | orjson.OPT_SORT_KEYS,
+            False: options
+        }
+
+    def dumps(self, serializable_object, sort_keys=True):
+
+        try:
+            document = self._orjson.dumps(serializable_object, option=self._options[bool(sort_keys)])
+        except self._orjson.JSONEncodeError:
+            # integers wider than 64 bits and anything else orjson refuses
+            return self._fallback.dumps(serializable_object, sort_keys)
+
+        # orjson writes NaN and Infinity as null
+        if b"null" in document and _has_non_finite_float(serializable_object):
+            return self._fallback.dumps(serializable_object, sort_keys)
+
+        return document
+
+    def loads(self, input_string):
+
+        try:
+            input_bytes = input_string.encode("utf-8") if isinstance(input_string, str) else input_string
+        except UnicodeEncodeError:
+            return self._fallback.loads(input_string)
+
+        # orjson reads integers wider than 64 bits as floats
+        if _LONG_NUMBER in input_bytes.translate(self._digits_to_zeros):
+            return self._fallback.loads(input_string)
+
+        try:
+            return self._orjson.loads(input_bytes)
+        except self._orjson.JSONDecodeError:
+            # NaN, Infinity and out of range floats, Stdlib raises if the document is invalid
+            return self._fallback.loads(input_string)
+
+
+class Ujson(Backend):
+
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+        self._fallback = Stdlib()
+
+    def dumps(self, serializable_object, sort_keys=True):
+        try:
+            return self._ujson.dumps(
+                serializable_object, ensure_ascii=False, sort_keys=sort_keys, escape_forward_slashes=False
+            ).encode("utf-8")
+        except (OverflowError, TypeError, ValueError):
+            return self._fallback.dumps(serializable_object, sort_keys)
+
+    def loads(self, input_string):
+        try:
+            return self._ujson.loads(input_string)
+        except (OverflowError, ValueError):
+            return self._fallback.loads(input_string)
+
+
+class Rapidjson(Backend):
+
+    name = "rapidjson"
+
+    def __init__(self):
+        import rapidjson
+        self._rapidjson = rapidjson
+        self._fallback = Stdlib()
+
+    def dumps(self, serializable_object, sort_keys=True):
+        try:
+            return self._rapidjson.dumps(serializable_object, ensure_ascii=False, sort_keys=sort_keys).encode("utf-8")
+        except (OverflowError, TypeError, ValueError):
+            return self._fallback.dumps(serializable_object, sort_keys)
+
+    def loads(self, input_string):
+        try:
+            return self._rapidjson.loads(input_string)
+        except (OverflowError, ValueError):
+            return self._fallback.loads(input_string)
+
+
+#: in order of preference
+BACKENDS = (Orjson, Ujson, Rapidjson, Stdlib)
+
+_backends = dict()
+
+
+def get_backend(name=None):
+    """
+    :param name: name of the backend, the fastest installed one if None
+    :type name: str | None
+    :return: shared instance of the backend
+    :rtype: Backend
+    :raises ValueError: if name isn't a known backend
+    :raises ImportError: if the library for the named backend isn't installed
+    """
+
+    if name in _backends:
+        return _backends[name]
+
+    if name is None:
+        for backend_class in BACKENDS:
+            try:
+                backend = get_backend(backend_class.name)
+            except ImportError:
+                continue
+
+            _backends[None] = backend
+            return backend
+
+    for backend_class in BACKENDS:
+        if backend_class.name == name:
+            backend = backend_class()
+            _backends[name] = backend
+            return backend
+
+    raise ValueError("unknown JSON backend %s; available backends are %s" % (
+        name, ", ".join(backend_class.name for backend_class in BACKENDS)
+    ))
@@ -2,11 +2,17 @@ __all__ = [
     'Config',
     'VerbConfig',
     'AttributeFilter',
+    'AttributeFilterCache',
+    'CompiledAttributeFilter',
+    'compile_attribute_filter',
     'AttributeFilterImmutable',
     'ParameterSet'
 ]
 
 from prestans.parser.attribute_filter import AttributeFilter
+from prestans.parser.attribute_filter_cache import AttributeFilterCache
+from prestans.parser.attribute_filter_compiled import CompiledAttributeFilter
+from prestans.parser.attribute_filter_compiled import compile_attribute_filter
 from prestans.parser.attribute_filter_immutable import AttributeFilterImmutable
 from prestans.parser.config import Config
 from prestans.parser.parameter_set import ParameterSet
@@ -1,4 +1,4 @@
-import inspect
+import weakref
 
 from prestans import exception
 from prestans.types import Array
@@ -17,8 +17,15 @@ class AttributeFilter(object):
             sub_field_name1: false
         }
       }
+
+    The instance dictionary holds nothing but the filter's keys, so attribute access
+    stays a plain lookup. Bookkeeping lives in slots: summaries of the keys and their
+    visibility, the immutable copy, the signature and compiled filters are computed
+    on first use and dropped whenever this filter or one of its sub filters changes.
     """
 
+    __slots__ = ("_parents", "_summary", "_immutable", "_signature", "_compiled", "__dict__", "__weakref__")
+
     def __init__(self, from_dictionary=None, template_model=None, is_array_scalar=False, **kwargs):
         """
         Creates an attribute filter object, optionally populates from a
@@ -27,6 +34,14 @@ class AttributeFilter(object):
         # todo: is_array_scalar currently does nothing, fix or remove
         # todo: adding it as property breaks keys and other methods in current implementation
 
+        #: filters holding this one as a sub filter, told when it changes
+        object.__setattr__(self, "_parents", None)
+        object.__setattr__(self, "_summary", None)
+        object.__setattr__(self, "_immutable", None)
+        object.__setattr__(self, "_signature", None)
+        #: compiled filters by ModelSchema, see compile_attribute_filter
+        object.__setattr__(self, "_compiled", None)
+
         if from_dictionary:
             self._init_from_dictionary(from_dictionary, template_model)
 
@@ -101,7 +116,7 @@ class AttributeFilter(object):
         # 3. Evaluate the differences between the two, with template_filter as the standard
         for template_key in template_filter_keys:
 
-            if template_key in this_filter_keys:
+            if template_key in self:
 
                 value = getattr(self, template_key)
 
@@ -131,19 +146,7 @@ class AttributeFilter(object):
         :rtype: list
 
         """
-
-        keys = list()
-
-        for attribute_name, type_instance in inspect.getmembers(self):
-
-            # ignore parameters with __ and if they are methods
-            if attribute_name.startswith('__') or inspect.ismethod(type_instance):
-
-                continue
-
-            keys.append(attribute_name)
-
-        return keys
+        return list(self._summarize()[0])
 
     def __contains__(self, key):
         return key in self.__dict__
@@ -171,66 +174,90 @@ class AttributeFilter(object):
         :return: whether attribute is visible
         :rtype: bool
         """
-        if key in self:
-            attribute_status = getattr(self, key)
-            if isinstance(attribute_status, bool) and attribute_status is True:
-                return True
-            elif isinstance(attribute_status, self.__class__) and attribute_status.are_any_attributes_visible():
-                return True
-
-        return False
+        return key in self._summarize()[1]
 
     def are_any_attributes_visible(self):
         """
         checks to see if any attributes are set to true
         """
+        return self._summarize()[2]
 
-        for attribute_name, type_instance in inspect.getmembers(self):
+    def are_all_attributes_visible(self):
+        """
+        checks to see if all attributes are set to true
+        """
+        return self._summarize()[3]
 
-            if attribute_name.startswith('__') or inspect.ismethod(type_instance):
-                continue
+    def _summarize(self):
+        """
+        :return: sorted keys, visible keys, whether any and whether all attributes are visible
+        :rtype: tuple
+        """
 
-            if isinstance(type_instance, bool) and type_instance is True:
-                return True
-            elif isinstance(type_instance, self.__class__) and type_instance.are_all_attributes_visible() is True:
-                return True
+        summary = self._summary
+        if summary is not None:
+            return summary
 
-        return False
+        visible_keys = set()
+        any_visible = False
+        all_visible = True
 
-    def are_all_attributes_visible(self):
+        for key, value in iter(self.__dict__.items()):
+
+            if value is True:
+                visible_keys.add(key)
+                any_visible = True
+            elif value is False:
+                all_visible = False
+            else:
+                if value.are_any_attributes_visible():
+                    visible_keys.add(key)
+
+                # a sub filter only counts as visible to its parent if it's entirely visible
+                if value.are_all_attributes_visible():
+                    any_visible = True
+                else:
+                    all_visible = False
+
+        summary = (tuple(sorted(self.__dict__)), frozenset(visible_keys), any_visible, all_visible)
+        object.__setattr__(self, "_summary", summary)
+
+        return summary
+
+    def _changed(self):
         """
-        checks to see if all attributes are set to true
+        drops everything derived from this filter and its parents
         """
 
-        for attribute_name, type_instance in inspect.getmembers(self):
-
-            if attribute_name.startswith('__') or inspect.ismethod(type_instance):
-                # Ignore parameters with __ and if they are methods
-                continue
+        # parents only derive from this filter by deriving from it first, so
+        # nothing derived here means there is nothing to drop above either
+        if self._summary is None and self._immutable is None and self._signature is None and \
+                self._compiled is None:
+            return
 
-            if isinstance(type_instance, bool) and type_instance is False:
-                return False
-            elif isinstance(type_instance, self.__class__) and type_instance.are_all_attributes_visible() is False:
-                return False
+        object.__setattr__(self, "_summary", None)
+        object.__setattr__(self, "_immutable", None)
+        object.__setattr__(self, "_signature", None)
+        object.__setattr__(self, "_compiled", None)
 
-        return True
+        if self._parents is not None:
+            for parent in list(self._parents):
+                parent._changed()
 
     def set_all_attribute_values(self, value):
         """
         sets all the attribute values to the value and propagate to any children
         """
 
-        for attribute_name, type_instance in inspect.getmembers(self):
-
-            if attribute_name.startswith('__') or inspect.ismethod(type_instance):
-                # Ignore parameters with __ and if they are methods
-                continue
+        for attribute_name, type_instance in iter(self.__dict__.items()):
 
             if isinstance(type_instance, bool):
                 self.__dict__[attribute_name] = value
             elif isinstance(type_instance, self.__class__):
                 type_instance.set_all_attribute_values(value)
 
+        self._changed()
+
     def as_dict(self):
         """
         turns attribute filter object into python dictionary
@@ -238,10 +265,7 @@ class AttributeFilter(object):
 
         output_dictionary = dict()
 
-        for attribute_name, type_instance in inspect.getmembers(self):
-
-            if attribute_name.startswith('__') or inspect.ismethod(type_instance):
-                continue
+        for attribute_name, type_instance in iter(self.__dict__.items()):
 
             if isinstance(type_instance, bool):
                 output_dictionary[attribute_name] = type_instance
@@ -250,6 +274,30 @@ class AttributeFilter(object):
 
         return output_dictionary
 
+    def copy(self):
+        """
+        :return: independent copy of this filter; what has been derived from this filter is
+        shared until either of them changes
+        :rtype: AttributeFilter
+        """
+
+        copy = self.__class__()
+
+        for attribute_name, type_instance in iter(self.__dict__.items()):
+
+            if isinstance(type_instance, self.__class__):
+                type_instance = type_instance.copy()
+
+            setattr(copy, attribute_name, type_instance)
+
+        object.__setattr__(copy, "_summary", self._summary)
+        object.__setattr__(copy, "_immutable", self._immutable)
+        object.__setattr__(copy, "_signature", self._signature)
+        if self._compiled is not None:
+            object.__setattr__(copy, "_compiled", dict(self._compiled))
+
+        return copy
+
     def _init_from_dictionary(self, from_dictionary, template_model=None):
         """
         Private helper to init values from a dictionary, wraps children into
@@ -315,21 +363,76 @@ class AttributeFilter(object):
         Overrides setattr to allow only booleans or an AttributeFilter
         """
 
+        attributes = self.__dict__
+        current = attributes.get(key)
+
         # Values should either be boolean or type of self
-        if isinstance(value, bool) and key in self.__dict__ and isinstance(self.__dict__[key], self.__class__):
-            self.__dict__[key].set_all_attribute_values(value)
-            return
-        elif isinstance(value, (bool, self.__class__)):
-            self.__dict__[key] = value
+        if isinstance(value, bool) and isinstance(current, self.__class__):
+            current.set_all_attribute_values(value)
             return
+        elif not isinstance(value, (bool, self.__class__)):
+            raise TypeError("%s name in %s must be of type Boolean or AttributeFilter, given %s" %
+                            (key, self.__class__.__name__, value.__class__.__name__))
+
+        attributes[key] = value
 
-        raise TypeError("%s name in %s must be of type Boolean or AttributeFilter, given %s" %
-                        (key, self.__class__.__name__, value.__class__.__name__))
+        if isinstance(current, self.__class__) and current is not value:
+            self._release(current)
+
+        if isinstance(value, self.__class__):
+            if value._parents is None:
+                object.__setattr__(value, "_parents", weakref.WeakSet())
+            value._parents.add(self)
+
+        self._changed()
+
+    def __delattr__(self, key):
+
+        if key not in self.__dict__:
+            raise AttributeError(key)
+
+        current = self.__dict__.pop(key)
+
+        if isinstance(current, self.__class__):
+            self._release(current)
+
+        self._changed()
+
+    def _release(self, sub_filter):
+        # the same sub filter might still be held at another key
+        for value in self.__dict__.values():
+            if value is sub_filter:
+                return
+
+        if sub_filter._parents is not None:
+            sub_filter._parents.discard(self)
 
     def as_immutable(self):
         """
-        :return: immutable version of this attribute filter
+        :return: immutable version of this attribute filter, kept until the filter changes
         :rtype: AttributeFilterImmutable
         """
-        from prestans.parser.attribute_filter_immutable import AttributeFilterImmutable
-        return AttributeFilterImmutable(attribute_filter=self)
+
+        immutable = self._immutable
+        if immutable is None:
+            from prestans.parser.attribute_filter_immutable import AttributeFilterImmutable
+            immutable = AttributeFilterImmutable(attribute_filter=self)
+            object.__setattr__(self, "_immutable", immutable)
+
+        return immutable
+
+    def _get_signature(self):
+        """
+        :return: hashable description of the keys and their visibility, kept until the filter changes
+        :rtype: tuple
+        """
+
+        signature = self._signature
+        if signature is None:
+            signature = tuple(
+                (key, self.is_attribute_visible(key), value._get_signature() if isinstance(value, AttributeFilter) else None)
+                for key, value in ((key, self.__dict__[key]) for key in self._summarize()[0])
+            )
+            object.__setattr__(self, "_signature", signature)
+
+        return signature
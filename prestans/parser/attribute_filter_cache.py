@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#
+#  prestans, A WSGI compliant REST micro-framework
+#  http://prestans.org
+#
+#  Copyright (c) 2017, Anomaly Software Pty Ltd.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#      * Redistributions of source code must retain the above copyright
+#        notice, this list of conditions and the following disclaimer.
+#      * Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#      * Neither the name of Anomaly Software nor the
+#        names of its contributors may be used to endorse or promote products
+#        derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+#  ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+#  WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL ANOMALY SOFTWARE BE LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#  (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+#  LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+#  ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#  (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+import threading
+
+from collections import OrderedDict
+
+
+class AttributeFilterCache(object):
+    """
+    Bounded least recently used cache of evaluated attribute filters
+
+    Request uses it to parse each distinct Prestans-Response-Attribute-List header
+    once per response template instead of on every request. Filters handed out by
+    the cache are shared between requests and must be treated as read only.
+    """
+
+    def __init__(self, maxsize=256):
+        """
+        :param maxsize: number of filters kept before the least recently used is dropped
+        :type maxsize: int
+        """
+
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1, %i given" % maxsize)
+
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, factory):
+        """
+        :param key: hashable description of the filter
+        :param factory: called without arguments to create the filter on a miss
+        :return: the cached or newly created filter
+        :rtype: prestans.parser.AttributeFilter
+        """
+
+        with self._lock:
+            value = self._entries.pop(key, None)
+            if value is not None:
+                self._entries[key] = value
+                self._hits += 1
+                return value
+
+            self._misses += 1
+
+        # exceptions raised by factory propagate and nothing is cached
+        value = factory()
+
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def clear(self):
+        """
+        drops all filters and resets the counters
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+#
+#  prestans, A WSGI compliant REST micro-framework
+#  http://prestans.org
+#
+#  Copyright (c) 2017, Anomaly Software Pty Ltd.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#      * Redistributions of source code must retain the above copyright
+#        notice, this list of conditions and the following disclaimer.
+#      * Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#      * Neither the name of Anomaly Software nor the
+#        names of its contributors may be used to endorse or promote products
+#        derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+#  ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+#  WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL ANOMALY SOFTWARE BE LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#  (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+#  LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+#  ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#  (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+import weakref
+
+from prestans.parser.attribute_filter import AttributeFilter
+from prestans.parser.attribute_filter_immutable import AttributeFilterImmutable
+from prestans.types import Array
+from prestans.types import Model
+from prestans.types.schema import ModelSchema
+
+#: compiled filters by (schema, mask, children), held while anything else refers to them
+_interned = weakref.WeakValueDictionary()
+
+
+class CompiledAttributeFilter(object):
+    """
+    Attribute filter compiled against the member order of a Model class
+
+    Visibility is kept as a bitmask with one bit per member of the class's
+    ModelSchema, in member order. Sub filters of Model and Array of Model members
+    are compiled against their own class and kept in a tuple in the same order;
+    None means the member is unfiltered. Compiled filters are interned, hash and
+    compare by value and never change, so they double as cache keys.
+
+    Use compile_attribute_filter to create instances.
+    """
+
+    __slots__ = ("_schema", "_mask", "_children", "_hash", "__weakref__")
+
+    def __init__(self, schema, mask, children):
+        """
+        :param schema: schema of the Model class the filter is compiled against
+        :type schema: prestans.types.schema.ModelSchema
+        :param mask: bit n is set if member n is visible
+        :type mask: int
+        :param children: compiled sub filter or None for each member
+        :type children: tuple
+        """
+        self._schema = schema
+        self._mask = mask
+        self._children = children
+        self._hash = hash((schema.model_class, mask, children))
+
+    @property
+    def model_class(self):
+        return self._schema.model_class
+
+    def is_visible(self, index):
+        """
+        :param index: position of the member in the schema's members
+        :type index: int
+        :rtype: bool
+        """
+        return self._mask >> index & 1 == 1
+
+    def child(self, index):
+        """
+        :param index: position of the member in the schema's members
+        :type index: int
+        :return: compiled sub filter of the member, None if it's unfiltered
+        :rtype: CompiledAttributeFilter | None
+        """
+        return self._children[index]
+
+    def keys(self):
+        return [name for name, _ in self._schema.members]
+
+    def __contains__(self, key):
+        return key in self._schema.member_index
+
+    def is_filter_at_key(self, key):
+        """
+        return True if attribute is a sub filter
+        """
+        return self._children[self._schema.member_index[key]] is not None
+
+    def is_attribute_visible(self, key):
+        """
+        :param key: name of attribute to check
+        :type key: str
+        :return: whether attribute is visible
+        :rtype: bool
+        """
+        index = self._schema.member_index.get(key)
+        return index is not None and self._mask >> index & 1 == 1
+
+    def are_any_attributes_visible(self):
+        return self._mask != 0
+
+    def are_all_attributes_visible(self):
+        return self._mask == (1 << len(self._schema.members)) - 1
+
+    def as_dict(self):
+        """
+        turns the compiled filter into python dictionary
+        """
+        output_dictionary = dict()
+
+        for index, (name, _) in enumerate(self._schema.members):
+            child = self._children[index]
+            if child is None:
+                output_dictionary[name] = self.is_visible(index)
+            else:
+                output_dictionary[name] = child.as_dict()
+
+        return output_dictionary
+
+    def union(self, other):
+        """
+        :return: filter showing every attribute visible in either filter
+        :rtype: CompiledAttributeFilter
+        """
+        return self._combine(other, _union)
+
+    def intersection(self, other):
+        """
+        :return: filter showing the attributes visible in both filters
+        :rtype: CompiledAttributeFilter
+        """
+        return self._combine(other, _intersection)
+
+    __or__ = union
+    __and__ = intersection
+
+    def _combine(self, other, operation):
+
+        if not isinstance(other, CompiledAttributeFilter) or other._schema is not self._schema:
+            raise ValueError("only filters compiled against the same Model class can be combined")
+
+        mask = 0
+        children = list()
+
+        for index in range(len(self._children)):
+
+            visible, child = operation(
+                self.is_visible(index), self._children[index],
+                other.is_visible(index), other._children[index]
+            )
+
+            if visible:
+                mask |= 1 << index
+            children.append(child)
+
+        return _intern(self._schema, mask, tuple(children))
+
+    def __eq__(self, other):
+        return self is other or (
+            isinstance(other, CompiledAttributeFilter) and
+            self._schema is other._schema and
+            self._mask == other._mask and
+            self._children == other._children
+        )
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return self._hash
+
+    def __getattr__(self, key):
+
+        # slots that aren't set yet must not be looked up as attributes
+        if key.startswith("_"):
+            raise AttributeError(key)
+
+        index = self._schema.member_index.get(key)
+        if index is None:
+            raise AttributeError(key)
+
+        child = self._children[index]
+        if child is None:
+            return self.is_visible(index)
+
+        return child
+
+    def __repr__(self):
+        return "<%s %s %s>" % (self.__class__.__name__, self._schema.model_class.__name__, bin(self._mask))
+
+
+def _union(visible, child, other_visible, other_child):
+    # an invisible member adds nothing, a visible one without sub filter shows everything
+    if not visible:
+        return other_visible, other_child
+    elif not other_visible:
+        return visible, child
+    elif child is None or other_child is None:
+        return True, None
+
+    child = child.union(other_child)
+    return child.are_any_attributes_visible(), child
+
+
+def _intersection(visible, child, other_visible, other_child):
+    if not visible or not other_visible:
+        return False, None
+    elif child is None:
+        return True, other_child
+    elif other_child is None:
+        return True, child
+
+    child = child.intersection(other_child)
+    return child.are_any_attributes_visible(), child
+
+
+def _intern(schema, mask, children):
+    key = (schema, mask, children)
+
+    compiled_filter = _interned.get(key)
+    if compiled_filter is None:
+        compiled_filter = CompiledAttributeFilter(schema, mask, children)
+        _interned[key] = compiled_filter
+
+    return compiled_filter
+
+
+def compile_attribute_filter(model_class, attribute_filter, validation=False):
+    """
+    Compiles attribute_filter against the member order of model_class
+
+    The compiled filter is kept on mutable filters until they change and on
+    immutable filters for good, so converting the same filter again is a lookup.
+
+    Mutable filters are serialized and adapted by the visibility of their immutable
+    form, where a parent is visible if any attribute of its sub filter is. Request
+    bodies are validated by the mutable filter's own rules, where a parent with a
+    sub filter is only visible if one of its attributes is True or one of its own
+    sub filters is entirely visible.
+
+    :param model_class: subclass of prestans.types.Model
+    :type model_class: type
+    :param attribute_filter:
+    :type attribute_filter: prestans.parser.AttributeFilter | prestans.parser.AttributeFilterImmutable |
+        CompiledAttributeFilter | None
+    :param validation: whether the filter is compiled to validate input rather than to write output
+    :type validation: bool
+    :return: the compiled filter, None if attribute_filter isn't a filter
+    :rtype: CompiledAttributeFilter | None
+    """
+    if attribute_filter is None:
+        return None
+
+    schema = ModelSchema.for_class(model_class)
+
+    if attribute_filter.__class__ is CompiledAttributeFilter:
+        if attribute_filter._schema is schema:
+            return attribute_filter
+        return _compile(schema, attribute_filter)
+    elif not isinstance(attribute_filter, (AttributeFilter, AttributeFilterImmutable)):
+        return None
+
+    # immutable filters have a single set of rules
+    validation = validation is True and isinstance(attribute_filter, AttributeFilter)
+    key = (schema, True) if validation else schema
+
+    compiled_filters = attribute_filter._compiled
+    if compiled_filters is not None:
+        compiled_filter = compiled_filters.get(key)
+        if compiled_filter is not None:
+            return compiled_filter
+
+    if validation:
+        compiled_filter = _compile(schema, attribute_filter, True)
+    elif isinstance(attribute_filter, AttributeFilter):
+        compiled_filter = _compile(schema, attribute_filter.as_immutable())
+    else:
+        compiled_filter = _compile(schema, attribute_filter)
+
+    if attribute_filter._compiled is None:
+        object.__setattr__(attribute_filter, "_compiled", dict())
+    attribute_filter._compiled[key] = compiled_filter
+
+    return compiled_filter
+
+
+def _compile(schema, attribute_filter, validation=False):
+
+    mask = 0
+    children = list()
+
+    for index, (name, template) in enumerate(schema.members):
+
+        child = None
+
+        if name in attribute_filter:
+
+            if attribute_filter.is_attribute_visible(name):
+                mask |= 1 << index
+
+            if attribute_filter.is_filter_at_key(name):
+                if isinstance(template, Array):
+                    template = template.element_template
+
+                if isinstance(template, Model):
+                    child = compile_attribute_filter(template.__class__, getattr(attribute_filter, name), validation)
+
+        children.append(child)
+
+    return _intern(schema, mask, tuple(children))
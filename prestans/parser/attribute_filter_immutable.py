@@ -1,5 +1,8 @@
 
 
+from prestans.parser.attribute_filter import AttributeFilter
+
+
 class AttributeFilterImmutable(object):
 
     def __init__(self, attribute_filter):
@@ -8,13 +11,22 @@ class AttributeFilterImmutable(object):
         """
         self._key_map = dict()
         self._visible_keys = set()
+        #: compiled filters by ModelSchema, see compile_attribute_filter
+        self._compiled = None
 
         self._populate_from_filter(attribute_filter)
 
     def _populate_from_filter(self, attribute_filter):
         for key in attribute_filter.keys():
             if attribute_filter.is_filter_at_key(key):
-                self._key_map[key] = AttributeFilterImmutable(getattr(attribute_filter, key))
+                sub_filter = getattr(attribute_filter, key)
+
+                # mutable filters keep their immutable copy until they change
+                if isinstance(sub_filter, AttributeFilter):
+                    self._key_map[key] = sub_filter.as_immutable()
+                else:
+                    self._key_map[key] = AttributeFilterImmutable(sub_filter)
+
                 if self._key_map[key].are_any_attributes_visible():
                     self._visible_keys.add(key)
             else:
@@ -40,12 +40,21 @@ class DictionaryResponse(Response):
         # attempt serializing via registered serializer
         body_as_string = self._selected_serializer.dumps(self.body)
 
-        if not isinstance(body_as_string, str):
-            raise TypeError("%s dumps must return a python str not %s" % (
+        if self._selected_serializer.emits_bytes():
+            expected_type = bytes
+        else:
+            expected_type = str
+
+        if not isinstance(body_as_string, expected_type):
+            raise TypeError("%s dumps must return a python %s not %s" % (
                 self._selected_serializer.__class__.__name__,
+                expected_type.__name__,
                 body_as_string.__class__.__name__)
             )
 
+        if expected_type is str:
+            body_as_string = body_as_string.encode("utf-8")
+
         # set content_length
         self.content_length = len(body_as_string)
 
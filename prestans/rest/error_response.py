@@ -67,8 +67,11 @@ class ErrorResponse(webob.Response):
 
             body_as_string = self._serializer.dumps(error_dict)
 
+        if not self._serializer.emits_bytes():
+            body_as_string = body_as_string.encode("utf-8")
+
         self.content_length = len(body_as_string)
 
         start_response(self.status, self.headerlist)
 
-        return [body_as_string.encode("utf-8")]
+        return [body_as_string]
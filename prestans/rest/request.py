@@ -4,6 +4,8 @@ from prestans import deserializer
 from prestans import exception
 from prestans.http import VERB
 from prestans.parser import AttributeFilter
+from prestans.parser import AttributeFilterCache
+from prestans.types.compiler import filter_signature
 from prestans.types import DataCollection
 
 
@@ -17,6 +19,9 @@ class Request(webob.Request):
     available to the RequestHandler
     """
 
+    #: evaluated response attribute filters shared by all requests
+    response_attribute_filter_cache = AttributeFilterCache()
+
     def __init__(self, environ, charset, logger, deserializers, default_deserializer):
 
         super(Request, self).__init__(environ=environ, charset=charset)
@@ -144,8 +149,11 @@ class Request(webob.Request):
     def parse_body(self):
 
         if self._parsed_body is None and self._body_template is not None:
-            # parse the body using the deserializer
-            unserialized_body = self.selected_deserializer.loads(self.body)
+            # parse the body using the deserializer, decoding it only if it has to be
+            if self.selected_deserializer.accepts_bytes():
+                unserialized_body = self.selected_deserializer.loads(self.body)
+            else:
+                unserialized_body = self.selected_deserializer.loads(self.text)
 
             # validate the body using the template and attribute_filter
             self._parsed_body = self._body_template.validate(
@@ -179,7 +187,8 @@ class Request(webob.Request):
 
         :param template_filter:
         :param template_model: the expected model that this filter corresponds to
-        :return:
+        :return: evaluated filter; parsed once for all requests sending the same header, each
+        request gets its own copy to change
         :rtype: None | AttributeFilter
         """
 
@@ -192,6 +201,22 @@ class Request(webob.Request):
         # header not set results in a None
         attribute_list_str = self.headers['Prestans-Response-Attribute-List']
 
+        # template_model is only given for minified requests
+        key = (
+            attribute_list_str,
+            template_model.__class__ if template_model is not None else None,
+            filter_signature(template_filter)
+        )
+
+        # the cached filter is never handed out, handlers may change theirs
+        return self.response_attribute_filter_cache.get(
+            key,
+            lambda: self._parse_response_attribute_filter(attribute_list_str, template_filter, template_model)
+        ).copy()
+
+    @staticmethod
+    def _parse_response_attribute_filter(attribute_list_str, template_filter, template_model):
+
         # deserialize the header contents
         json_deserializer = deserializer.JSON()
         attribute_list_dictionary = json_deserializer.loads(attribute_list_str)
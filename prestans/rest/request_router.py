@@ -9,6 +9,7 @@ from prestans.rest import ErrorResponse
 from prestans.rest import DictionaryResponse
 from prestans.rest import Request
 from prestans.rest import Response
+from prestans.rest.route_index import RouteIndex
 from prestans import serializer
 
 
@@ -69,6 +70,38 @@ class RequestRouter(object):
         if default_deserializer is None:
             self._default_deserializer = deserializer.JSON()
 
+        # validate serializers and deserializers; are subclasses of prestans.serializer.Base
+        self._default_outgoing_mime_types = list()
+        for available_serializer in self._serializers:
+
+            if not isinstance(available_serializer, serializer.Base):
+                msg = "registered serializer %s.%s does not inherit from prestans.serializer.Serializer" % (
+                    available_serializer.__module__,
+                    available_serializer.__class__.__name__
+                )
+                raise TypeError(msg)
+
+            self._default_outgoing_mime_types.append(available_serializer.content_type())
+
+        self._default_incoming_mime_types = list()
+        for available_deserializer in self._deserializers:
+
+            if not isinstance(available_deserializer, deserializer.Base):
+                msg = "registered deserializer %s.%s does not inherit from prestans.serializer.DeSerializer" % (
+                    available_deserializer.__module__,
+                    available_deserializer.__class__.__name__
+                )
+                raise TypeError(msg)
+
+            self._default_incoming_mime_types.append(available_deserializer.content_type())
+
+        self._default_outgoing_mime_types_str = str(self._default_outgoing_mime_types).strip("[]'")
+        self._default_incoming_mime_types_str = str(self._default_incoming_mime_types).strip("[]'")
+
+        # compile the route map once, the routes are frozen from here on
+        self._route_map = self.generate_route_map(self._routes)
+        self._route_index = RouteIndex(self._route_map)
+
     @property
     def logger(self):
         return self._logger
@@ -89,44 +122,25 @@ class RequestRouter(object):
     def application_name(self):
         return self._application_name
 
+    @property
+    def route_map(self):
+        """
+        :return: the compiled route map as (regexp, handler_class) tuples
+        :rtype: tuple
+        """
+        return self._route_map
+
     def __call__(self, environ, start_response):
 
         # say hello
-        self.logger.info("%s exposes %i end-points; prestans %s; charset %s; debug %s" % (
-            self._application_name, len(self._routes), __version__,
-            self._charset, self._debug
-        ))
-
-        # validate serializers and deserializers; are subclasses of prestans.serializer.Base
-        _default_outgoing_mime_types = list()
-        for available_serializer in self._serializers:
-
-            if not isinstance(available_serializer, serializer.Base):
-                msg = "registered serializer %s.%s does not inherit from prestans.serializer.Serializer" % (
-                    available_serializer.__module__,
-                    available_serializer.__class__.__name__
-                )
-                raise TypeError(msg)
-
-            _default_outgoing_mime_types.append(available_serializer.content_type())
-
-        _default_incoming_mime_types = list()
-        for available_deserializer in self._deserializers:
-
-            if not isinstance(available_deserializer, deserializer.Base):
-                msg = "registered deserializer %s.%s does not inherit from prestans.serializer.DeSerializer" % (
-                    available_deserializer.__module__,
-                    available_deserializer.__class__.__name__
-                )
-                raise TypeError(msg)
-
-            _default_incoming_mime_types.append(available_deserializer.content_type())
+        self.logger.info("%s exposes %i end-points; prestans %s; charset %s; debug %s",
+                         self._application_name, len(self._route_map), __version__,
+                         self._charset, self._debug)
 
         # report on the acceptable mime types
-        self._logger.info("generally accepts %s; speaks %s" % (
-            str(_default_outgoing_mime_types).strip("[]'"),
-            str(_default_incoming_mime_types).strip("[]'")
-        ))
+        self.logger.info("generally accepts %s; speaks %s",
+                         self._default_outgoing_mime_types_str,
+                         self._default_incoming_mime_types_str)
 
         # attempt to parse the HTTP request
         request = Request(
@@ -137,66 +151,55 @@ class RequestRouter(object):
             default_deserializer=self._default_deserializer
         )
 
-        # initialise the route map
-        route_map = self.generate_route_map(self._routes)
-
         try:
 
             # check if the requested URL has a valid registered handler
-            for regexp, handler_class in route_map:
-
-                # if absent, can assume to be empty string
-                # https://www.python.org/dev/peps/pep-3333/#environ-variables
-                match = regexp.match(environ.get("PATH_INFO", ""))
-
-                # if we've found a match; ensure its a handler subclass and return it's callable
-                if match:
-
-                    # assemble the args and kwargs
-                    args = match.groups()
-                    kwargs = {}
-                    for key, value in iter(regexp.groupindex.items()):
-                        kwargs[key] = args[value - 1]
-
-                    if len(kwargs) > 0:
-                        args = ()
-
-                    if issubclass(handler_class, BlueprintHandler):
-
-                        response = DictionaryResponse(
-                            charset=self._charset, logger=self._logger,
-                            serializers=self._serializers,
-                            default_serializer=self._default_deserializer
-                        )
-
-                        request_handler = handler_class(
-                            args=args,
-                            kwargs=kwargs,
-                            request=request,
-                            response=response,
-                            logger=self._logger,
-                            debug=self._debug,
-                            route_map=self._routes
-                        )
-                    else:
-                        response = Response(
-                            charset=self._charset,
-                            logger=self._logger,
-                            serializers=self._serializers,
-                            default_serializer=self._default_deserializer
-                        )
-                        response.minify = request.is_minified
-
-                        request_handler = handler_class(
-                            args=args,
-                            kwargs=kwargs,
-                            request=request,
-                            response=response,
-                            logger=self._logger,
-                            debug=self._debug
-                        )
-
-                    return request_handler(environ, start_response)
+            # if absent, can assume to be empty string
+            # https://www.python.org/dev/peps/pep-3333/#environ-variables
+            matched_route = self._route_index.match(environ.get("PATH_INFO", ""))
+
+            # if we've found a match; ensure its a handler subclass and return it's callable
+            if matched_route is not None:
+
+                handler_class, args, kwargs = matched_route
+
+                if issubclass(handler_class, BlueprintHandler):
+
+                    response = DictionaryResponse(
+                        charset=self._charset, logger=self._logger,
+                        serializers=self._serializers,
+                        default_serializer=self._default_deserializer
+                    )
+
+                    request_handler = handler_class(
+                        args=args,
+                        kwargs=kwargs,
+                        request=request,
+                        response=response,
+                        logger=self._logger,
+                        debug=self._debug,
+                        route_map=self._routes
+                    )
+                else:
+                    response = Response(
+                        charset=self._charset,
+                        logger=self._logger,
+                        serializers=self._serializers,
+                        default_serializer=self._default_deserializer,
+                        debug=self._debug
+                    )
+                    response.minify = request.is_minified
+
+                    request_handler = handler_class(
+                        args=args,
+                        kwargs=kwargs,
+                        request=request,
+                        response=response,
+                        logger=self._logger,
+                        debug=self._debug
+                    )
+
+                return request_handler(environ, start_response)
 
             # request does not have a matched handler
             no_endpoint = exception.NoEndpointError()
@@ -210,6 +213,13 @@ class RequestRouter(object):
 
     @classmethod
     def generate_route_map(cls, routes):
+        """
+        Compiles the URL patterns of the given routes
+
+        :param routes: list of (url, handler_class) tuples
+        :return: tuple of (compiled regexp, handler_class) tuples in registration order
+        :rtype: tuple
+        """
 
         parsed_handler_map = []
 
@@ -233,4 +243,4 @@ class RequestRouter(object):
             else:
                 parsed_handler_map.append((compiled_regex, handler))
 
-        return parsed_handler_map
+        return tuple(parsed_handler_map)
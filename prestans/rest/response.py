@@ -8,6 +8,36 @@ from prestans.types import Array
 from prestans.types import BinaryResponse
 from prestans.types import DataCollection
 from prestans.types import Model
+from prestans.types.compiler import filter_signature
+
+
+class _ResponseFilter(object):
+    """
+    State derived from a response attribute filter, shared by every response
+    with the same template class and effective filter
+    """
+
+    __slots__ = ("immutable", "any_visible", "_differs")
+
+    def __init__(self, attribute_filter):
+        self.immutable = attribute_filter.as_immutable()
+        self.any_visible = attribute_filter.are_any_attributes_visible()
+        self._differs = None
+
+    def differs(self, attribute_filter, model):
+        """
+        :return: attribute names of model missing from attribute_filter, worked out once
+        :rtype: tuple
+        """
+
+        if self._differs is None:
+            try:
+                AttributeFilter.from_model(model).conforms_to_template_filter(attribute_filter)
+                self._differs = ()
+            except exception.AttributeFilterDiffers as exp:
+                self._differs = tuple(exp.stack_trace[0]["rejected_attribute_list"])
+
+        return self._differs
 
 
 class Response(webob.Response):
@@ -19,7 +49,11 @@ class Response(webob.Response):
     Overrides content_type property to use prestans' serializers with the set body
     """
 
-    def __init__(self, charset, logger, serializers, default_serializer):
+    #: _ResponseFilter by (template class, filter signature); cleared when full
+    _filters = dict()
+    _MAX_FILTERS = 256
+
+    def __init__(self, charset, logger, serializers, default_serializer, debug=False):
 
         super(Response, self).__init__()
 
@@ -30,9 +64,12 @@ class Response(webob.Response):
         self._template = None
         self._app_iter = []
         self._minify = False
+        self._stream = False
+        self._stream_batch_size = 100
         self._attribute_filter = None
         self._template = None
         self._charset = charset
+        self._debug = debug
 
         #:
         #: IETF hash dropped the X- prefix for custom headers
@@ -53,10 +90,44 @@ class Response(webob.Response):
     def minify(self, value):
         self._minify = value
 
+    @property
+    def stream(self):
+        """
+        If True Array bodies are written element by element as they are serialized,
+        without a Content-Length; the server falls back to chunked transfer.
+        """
+        return self._stream
+
+    @stream.setter
+    def stream(self, value):
+        self._stream = value
+
+    @property
+    def stream_batch_size(self):
+        """
+        number of Array elements written per chunk when streaming
+        """
+        return self._stream_batch_size
+
+    @stream_batch_size.setter
+    def stream_batch_size(self, value):
+
+        if value < 1:
+            raise ValueError("stream_batch_size must be at least 1, %i given" % value)
+
+        self._stream_batch_size = value
+
     @property
     def logger(self):
         return self._logger
 
+    @property
+    def debug(self):
+        """
+        If True responses check the attribute filter conforms to the body and warn if not
+        """
+        return self._debug
+
     @property
     def supported_mime_types(self):
         return [serializer.content_type() for serializer in self._serializers]
@@ -128,6 +199,34 @@ class Response(webob.Response):
 
         self._attribute_filter = value
 
+    def is_attribute_visible(self, *path):
+        """
+        Lets handlers skip work up front for attributes the client didn't ask for.
+
+        :param path: attribute names leading to the attribute, starting at the body or its elements
+        :type path: str
+        :return: whether the attribute is visible under the response attribute filter
+        :rtype: bool
+        """
+
+        # walk the immutable form the body is serialized with
+        attribute_filter = self.attribute_filter
+        if attribute_filter is not None:
+            attribute_filter = attribute_filter.as_immutable()
+
+        for attribute_name in path:
+
+            if attribute_filter is None:
+                return True
+
+            if not attribute_filter.is_attribute_visible(attribute_name):
+                return False
+
+            attribute_filter = getattr(attribute_filter, attribute_name) \
+                if attribute_filter.is_filter_at_key(attribute_name) else None
+
+        return True
+
     def _content_type__get(self):
         """
         Get/set the Content-Type header (or None), *without* the
@@ -277,50 +376,47 @@ class Response(webob.Response):
 
         if isinstance(self._app_iter, DataCollection):
 
-            #: See if attribute filter is completely invisible
-            if self.attribute_filter is not None:
-
-                #: Warning to say nothing is visible
-                if not self.attribute_filter.are_any_attributes_visible():
-                    self.logger.warn("attribute_filter has all the attributes turned \
-                        off, handler will return an empty response")
-
-                #: Warning to say none of the fields match
-                model_attribute_filter = None
-                if isinstance(self._app_iter, Array):
-                    model_attribute_filter = AttributeFilter. \
-                        from_model(self._app_iter.element_template)
-                elif isinstance(self._app_iter, Model):
-                    model_attribute_filter = AttributeFilter. \
-                        from_model(self._app_iter)
-
-                if model_attribute_filter is not None:
-                    try:
-                        model_attribute_filter.conforms_to_template_filter(self.attribute_filter)
-                    except exception.AttributeFilterDiffers as exp:
-                        exp.request = self.request
-                        self.logger.warn("%s" % exp)
+            response_filter = self._response_filter()
+
+            #: Warning to say nothing is visible
+            if not response_filter.any_visible:
+                self.logger.warn("attribute_filter has all the attributes turned \
+                    off, handler will return an empty response")
+
+            #: Warning to say none of the fields match, only worth the cost while debugging
+            if self.debug:
+                model = self._app_iter
+                if isinstance(model, Array):
+                    model = model.element_template
+
+                differs = response_filter.differs(self.attribute_filter, model) \
+                    if isinstance(model, Model) else ()
+
+                if differs:
+                    exp = exception.AttributeFilterDiffers(list(differs))
+                    exp.request = self.request
+                    self.logger.warn("%s" % exp)
+
+            if self.stream and isinstance(self._app_iter, Array):
+                return self._stream_array(start_response)
 
             # body should be of type DataCollection try; attempt calling
             # as_serializable with available attribute_filter
-            serializable_body = self._app_iter.as_serializable(self.attribute_filter.as_immutable(), self.minify)
+            serializable_body = self._app_iter.as_serializable(response_filter.immutable, self.minify)
 
             #: attempt serializing via registered serializer
             stringified_body = self._selected_serializer.dumps(serializable_body)
 
-            # if not isinstance(stringified_body, str):
-            #     msg = "%s dumps must return a python str not %s" % (
-            #         self._selected_serializer.__class__.__name__,
-            #         stringified_body.__class__.__name__
-            #     )
-            #     raise TypeError(msg)
+            #: serializers that write bytes save encoding a second copy of the body
+            if not self._selected_serializer.emits_bytes():
+                stringified_body = stringified_body.encode("utf-8")
 
             #: set content_length
             self.content_length = len(stringified_body)
 
             start_response(self.status, self.headerlist)
 
-            return [stringified_body.encode("utf-8")]
+            return [stringified_body]
 
         elif isinstance(self._app_iter, BinaryResponse):
 
@@ -363,6 +459,51 @@ class Response(webob.Response):
         else:
             raise AssertionError("prestans failed to write a binary or textual response")
 
+    def _response_filter(self):
+        """
+        :return: the shared state for the body's template class and the attribute filter
+        :rtype: _ResponseFilter
+        """
+
+        template_class = self._app_iter.__class__
+        if isinstance(self._app_iter, Array):
+            template_class = (template_class, self._app_iter.element_template.__class__)
+
+        key = (template_class, filter_signature(self.attribute_filter))
+
+        response_filter = self._filters.get(key)
+        if response_filter is None:
+            if len(self._filters) >= self._MAX_FILTERS:
+                self._filters.clear()
+
+            response_filter = _ResponseFilter(self.attribute_filter)
+            self._filters[key] = response_filter
+
+        return response_filter
+
+    def _stream_array(self, start_response):
+        """
+        Starts the response and returns a generator writing the Array body in chunks,
+        elements are only serialized as the server consumes the generator.
+        """
+
+        serializable_elements = self._app_iter.iter_serializable(self._response_filter().immutable, self.minify)
+        chunks = self._selected_serializer.dumps_iter(serializable_elements, self.stream_batch_size)
+
+        #: length is unknown until the last element is written
+        self.content_length = None
+
+        start_response(self.status, self.headerlist)
+
+        return self._encode_chunks(chunks)
+
+    @staticmethod
+    def _encode_chunks(chunks):
+        for chunk in chunks:
+            if not isinstance(chunk, bytes):
+                chunk = chunk.encode("utf-8")
+            yield chunk
+
     def __str__(self):
         #: Overridden so webob's __str__ skips serializing the body
         super(Response, self).__str__(skip_body=True)
\ No newline at end of file
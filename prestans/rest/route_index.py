@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+#
+#  prestans, A WSGI compliant REST micro-framework
+#  http://prestans.org
+#
+#  Copyright (c) 2017, Anomaly Software Pty Ltd.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#      * Redistributions of source code must retain the above copyright
+#        notice, this list of conditions and the following disclaimer.
+#      * Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#      * Neither the name of Anomaly Software nor the
+#        names of its contributors may be used to endorse or promote products
+#        derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+#  ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+#  WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL ANOMALY SOFTWARE BE LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#  (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+#  LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+#  ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#  (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+_SPECIAL_CHARACTERS = ".^$*+?{}[]()|\\"
+_OPTIONAL_QUANTIFIERS = "*?{"
+
+
+def literal_prefix(pattern):
+    """
+    Returns the literal text every match of pattern has to start with
+
+    Scanning stops at the first regular expression construct; a literal followed
+    by a quantifier that allows zero occurrences is dropped. Patterns with a top
+    level alternation have no literal prefix.
+
+    :param pattern: regular expression source, optionally anchored with ^
+    :type pattern: str
+    :rtype: str
+    """
+
+    if has_top_level_alternation(pattern):
+        return ""
+
+    index = 1 if pattern.startswith("^") else 0
+    prefix = list()
+
+    while index < len(pattern):
+
+        character = pattern[index]
+
+        if character == "\\":
+            escaped = pattern[index + 1:index + 2]
+            # \d, \w, \b, back references etc. are not literals
+            if not escaped or escaped.isalnum() or escaped == "_":
+                break
+            literal = escaped
+            step = 2
+        elif character in _SPECIAL_CHARACTERS:
+            break
+        else:
+            literal = character
+            step = 1
+
+        following = pattern[index + step:index + step + 1]
+        if following and following in _OPTIONAL_QUANTIFIERS:
+            break
+
+        prefix.append(literal)
+
+        # one or more occurrences, the first one is still literal
+        if following == "+":
+            break
+
+        index += step
+
+    return "".join(prefix)
+
+
+def has_top_level_alternation(pattern):
+    """
+    :return: True if pattern contains a | outside of any group or character class
+    :rtype: bool
+    """
+
+    depth = 0
+    in_class = False
+    index = 0
+
+    while index < len(pattern):
+
+        character = pattern[index]
+
+        if character == "\\":
+            index += 2
+            continue
+
+        if in_class:
+            if character == "]":
+                in_class = False
+        elif character == "[":
+            in_class = True
+            # a ] straight after the opening bracket is a literal
+            if pattern[index + 1:index + 2] == "^":
+                index += 1
+            if pattern[index + 1:index + 2] == "]":
+                index += 1
+        elif character == "(":
+            depth += 1
+        elif character == ")":
+            depth -= 1
+        elif character == "|" and depth == 0:
+            return True
+
+        index += 1
+
+    return False
+
+
+class _RouteIndexNode(object):
+
+    __slots__ = ("children", "candidates")
+
+    def __init__(self):
+        self.children = dict()
+        self.candidates = ()
+
+
+class RouteIndex(object):
+    """
+    Segment trie over the literal path prefix of each route
+
+    Every route is stored at the trie node for the complete path segments of its
+    literal prefix. A lookup walks the requested path down the trie and only runs
+    the regular expressions of the routes stored along that walk, in registration
+    order, so first match wins semantics are kept regardless of the number of
+    registered routes.
+    """
+
+    def __init__(self, route_map):
+        """
+        :param route_map: compiled (regexp, handler_class) tuples in registration order
+        :type route_map: tuple
+        """
+
+        self._routes = tuple(route_map)
+        self._root = _RouteIndexNode()
+
+        routes_at_node = dict()
+        nodes = [(self._root, None)]
+
+        for index, (regexp, handler_class) in enumerate(self._routes):
+
+            # only segments terminated by a / in the prefix are complete
+            segments = literal_prefix(regexp.pattern).split("/")[:-1]
+
+            node = self._root
+            for segment in segments:
+                child = node.children.get(segment)
+                if child is None:
+                    child = _RouteIndexNode()
+                    node.children[segment] = child
+                    nodes.append((child, node))
+                node = child
+
+            routes_at_node.setdefault(id(node), list()).append(index)
+
+        # nodes are listed parents first; each node carries the routes of its ancestors
+        for node, parent in nodes:
+            inherited = parent.candidates if parent is not None else ()
+            own = routes_at_node.get(id(node), [])
+            node.candidates = tuple(sorted(inherited + tuple(own)))
+
+    def __len__(self):
+        return len(self._routes)
+
+    def candidates(self, path):
+        """
+        :return: indices of the routes that could match path, in registration order
+        :rtype: tuple
+        """
+
+        node = self._root
+        children = node.children
+
+        for segment in path.split("/"):
+            child = children.get(segment)
+            if child is None:
+                break
+            node = child
+            children = node.children
+
+        return node.candidates
+
+    def match(self, path):
+        """
+        :param path: the requested PATH_INFO
+        :type path: str
+        :return: handler_class, args and kwargs of the first matching route or None
+        :rtype: tuple | None
+        """
+
+        routes = self._routes
+
+        for index in self.candidates(path):
+
+            regexp, handler_class = routes[index]
+            match = regexp.match(path)
+
+            if match:
+                kwargs = match.groupdict()
+                if kwargs:
+                    return handler_class, (), kwargs
+
+                return handler_class, match.groups(), kwargs
+
+        return None
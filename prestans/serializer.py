@@ -32,6 +32,7 @@
 import sys
 
 from prestans import exception
+from prestans import json_backend
 from prestans.types import DataCollection
 
 __all__ = ['Base', 'JSON', 'XMLPlist']
@@ -42,6 +43,27 @@ class Base(object):
     def dumps(self, serializable_object):
         raise NotImplementedError
 
+    def dumps_iter(self, serializable_elements, batch_size=100):
+        """
+        Serializes a list one chunk at a time, used to stream Array responses.
+
+        Serializers that can't write a list in parts serialize all of it as a
+        single chunk.
+
+        :param serializable_elements: iterable of the serializable list elements
+        :param batch_size: number of elements to write per chunk
+        :type batch_size: int
+        :return: generator of serialized chunks
+        """
+        yield self.dumps(list(serializable_elements))
+
+    def emits_bytes(self):
+        """
+        :return: True if dumps returns encoded bytes rather than str
+        :rtype: bool
+        """
+        return False
+
     def handler_body_type(self):
         raise NotImplementedError
 
@@ -51,14 +73,66 @@ class Base(object):
 
 class JSON(Base):
 
+    def __init__(self, backend=None, sort_keys=True):
+        """
+        :param backend: name or instance of the JSON backend, the fastest installed one if None
+        :type backend: str | prestans.json_backend.Backend | None
+        :param sort_keys: whether or not to write the keys of objects in sorted order
+        :type sort_keys: bool
+        """
+        if not isinstance(backend, json_backend.Backend):
+            backend = json_backend.get_backend(backend)
+
+        self._backend = backend
+        self._sort_keys = sort_keys
+
+    @property
+    def backend(self):
+        return self._backend
+
+    @property
+    def sort_keys(self):
+        return self._sort_keys
+
     def dumps(self, serializable_object):
-        
-        import json
+
         try:
-            return json.dumps(serializable_object, ensure_ascii=False, sort_keys=True)
+            return self._backend.dumps(serializable_object, self._sort_keys)
         except Exception as exp:
             raise exception.SerializationFailedError("JSON: %s" % exp)
 
+    def dumps_iter(self, serializable_elements, batch_size=100):
+        """
+        Writes the opening bracket with the first batch of elements, every further
+        batch and the closing bracket as separate chunks; joined together the output
+        is the same as dumps of the whole list.
+        """
+
+        separator = b"["
+        batch = list()
+
+        for element in serializable_elements:
+
+            try:
+                batch.append(self._backend.dumps(element, self._sort_keys))
+            except Exception as exp:
+                raise exception.SerializationFailedError("JSON: %s" % exp)
+
+            if len(batch) >= batch_size:
+                yield separator + b",".join(batch)
+                separator = b","
+                batch = list()
+
+        if batch:
+            yield separator + b",".join(batch) + b"]"
+        elif separator == b"[":
+            yield b"[]"
+        else:
+            yield b"]"
+
+    def emits_bytes(self):
+        return True
+
     def handler_body_type(self):
         return DataCollection
 
@@ -89,6 +163,9 @@ class XMLPlist(Base):
 
         return plist_str
 
+    def emits_bytes(self):
+        return True
+
     def handler_body_type(self):
         return DataCollection
 
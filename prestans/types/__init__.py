@@ -32,6 +32,8 @@
 from prestans.types.base import DataCollection
 from prestans.types.base import DataStructure
 from prestans.types.base import DataType
+from prestans.types.base import ScalarType
+from prestans.types.deferred import Deferred
 
 from prestans.types.boolean import Boolean
 from prestans.types.float import Float
@@ -43,11 +43,13 @@ from prestans.types import Date
 from prestans.types import DateTime
 from prestans.types import Time
 
+from prestans.types import typed_storage
+
 
 class Array(DataCollection):
 
     def __init__(self, required=True,element_template=None,
-                 min_length=None, max_length=None, description=None):
+                 min_length=None, max_length=None, description=None, elements=None, typed=False):
         """
         :param required:
         :type required: bool
@@ -58,6 +60,11 @@ class Array(DataCollection):
         :type max_length: int
         :param description:
         :type description: str
+        :param elements: initial elements, validated in bulk as by extend
+        :type elements: list | tuple
+        :param typed: whether or not to store Integer, Float or Boolean elements in a contiguous
+        typed buffer rather than a list
+        :type typed: bool
         """
 
         if not isinstance(element_template, DataType):
@@ -77,8 +84,83 @@ class Array(DataCollection):
         self._max_length = max_length
         self._description = description
 
+        self._typecode = None
         self._array_elements = list()
 
+        if typed:
+            self._typecode = typed_storage.typecode_for(element_template)
+            if self._typecode is None:
+                msg = "typed Array element_template must be an Integer, Float or Boolean; %s given" % (
+                    element_template.__class__.__name__
+                )
+                raise TypeError(msg)
+
+            self._array_elements = typed_storage.new_storage(self._typecode)
+
+        if elements is not None:
+            self.extend(elements)
+
+            if self._min_length is not None and len(self._array_elements) < self._min_length:
+                raise exception.LessThanMinimumError(elements, self._min_length)
+
+    @classmethod
+    def from_buffer(cls, element_template, buffer, required=True, min_length=None, max_length=None,
+                    description=None):
+        """
+        Creates a typed array over the memory of buffer without copying it
+
+        The elements are checked against the constraints of element_template all at once,
+        the buffer is copied the first time the array is modified.
+
+        :param element_template: Integer, Float or Boolean
+        :param buffer: array.array of the matching typecode (q, d or B), one dimensional
+        NumPy array of int64, float64 or bool, or any other contiguous buffer of those
+        :rtype: Array
+        """
+
+        _array = cls(
+            required=required,
+            element_template=element_template,
+            min_length=min_length,
+            max_length=max_length,
+            description=description,
+            typed=True
+        )
+
+        storage = typed_storage.wrap_buffer(_array._typecode, buffer)
+        typed_storage.validate_storage(element_template, storage)
+
+        if min_length is not None and len(storage) < min_length:
+            raise exception.LessThanMinimumError(len(storage), min_length)
+
+        if max_length is not None and len(storage) > max_length:
+            raise exception.MoreThanMaximumError(len(storage), max_length)
+
+        _array._array_elements = storage
+        return _array
+
+    @classmethod
+    def from_iterable(cls, element_template, iterable, required=True, description=None, serializable=None):
+        """
+        Creates an array that produces its elements from iterable on demand
+
+        Elements are checked against element_template as they are produced. Iterating
+        the array, e.g. to serialize or stream it, consumes the elements without keeping
+        them; any other use materializes the remaining elements into a list first.
+
+        :param element_template:
+        :param iterable: source of the elements, iterated at most once
+        :param serializable: optional function taking the attribute filter, compiled for
+        Model elements, and minified, returning the serializable form of the elements; used
+        in place of iterable when the array is serialized before anything else consumes it
+        :type serializable: function
+        :rtype: Array
+        """
+
+        _array = cls(required=required, element_template=element_template, description=description)
+        _array._array_elements = _LazyElements(_array._iter_validated(iterable), serializable)
+        return _array
+
     def __len__(self):
         return len(self._array_elements)
 
@@ -87,10 +169,15 @@ class Array(DataCollection):
         With a little help from:
         http://johnmc.co/llum/the-easiest-way-to-implement-__iter__-for-a-python-object
         """
-        for element in self._array_elements:
-            yield element
+        if self._typecode is not None:
+            return typed_storage.iter_elements(self._array_elements, self._typecode)
+
+        return iter(self._array_elements)
 
     def __getitem__(self, index):
+        if self._typecode is not None:
+            return typed_storage.element(self._array_elements, self._typecode, index)
+
         return self._array_elements[index]
 
     def __contains__(self, item):
@@ -108,6 +195,33 @@ class Array(DataCollection):
     def description(self):
         return self._description
 
+    @property
+    def typed(self):
+        """
+        :return: whether or not elements are held in a contiguous typed buffer
+        :rtype: bool
+        """
+        return self._typecode is not None
+
+    @property
+    def lazy(self):
+        """
+        :return: whether or not elements are still to be produced by an iterable
+        :rtype: bool
+        """
+        return isinstance(self._array_elements, _LazyElements) and self._array_elements.pending
+
+    @property
+    def buffer(self):
+        """
+        :return: the typed buffer holding the elements, None for list backed arrays
+        :rtype: array.array | memoryview | numpy.ndarray | None
+        """
+        if self._typecode is None:
+            return None
+
+        return self._array_elements
+
     @property
     def is_scalar(self):
         """
@@ -144,7 +258,7 @@ class Array(DataCollection):
         return blueprint
 
     def remove(self, value):
-        self._array_elements.remove(value)
+        self._writable_elements().remove(value)
 
     def validate(self, value, attribute_filter=None, minified=False):
         """
@@ -157,6 +271,32 @@ class Array(DataCollection):
         :return:
         """
 
+        from prestans.parser import compile_attribute_filter
+        from prestans.types import Model
+        from prestans.types.schema import ModelSchema
+
+        element_validator = None
+        if isinstance(self._element_template, Model):
+            # compiled once for all elements
+            attribute_filter = compile_attribute_filter(
+                self._element_template.__class__, attribute_filter, validation=True
+            )
+
+            if self._element_template.__compiled__:
+                element_validator = ModelSchema.for_class(self._element_template.__class__).validator(
+                    attribute_filter, minified
+                )
+
+        return self._validate(value, attribute_filter, minified, element_validator)
+
+    def _validate(self, value, attribute_filter, minified, element_validator):
+        """
+        Validates value, using element_validator for dictionary elements if given
+
+        :param element_validator: compiled validator of the element template
+        :type element_validator: function | None
+        """
+
         if not self._required and value is None:
             return None
         elif self._required and value is None:
@@ -165,20 +305,35 @@ class Array(DataCollection):
         _validated_value = self.__class__(
             element_template=self._element_template,
             min_length=self._min_length,
-            max_length=self._max_length
+            max_length=self._max_length,
+            typed=self._typecode is not None
         )
 
         if not isinstance(value, (list, tuple)):
             raise TypeError(value)
 
-        for array_element in value:
+        if element_validator is not None:
+            element_required = self._element_template._required
+
+            for array_element in value:
+
+                # compiled elements are of the template's class, append has nothing to check
+                if array_element.__class__ is dict and (element_required or array_element):
+                    _validated_value._array_elements.append(element_validator(array_element))
+                else:
+                    validated_array_element = self._element_template.validate(array_element, attribute_filter, minified)
+                    _validated_value.append(validated_array_element)
+        elif self._element_validator() is not None:
+            _validated_value._array_elements = self._validate_elements(value)
+        else:
+            for array_element in value:
 
-            if isinstance(self._element_template, DataCollection):
-                validated_array_element = self._element_template.validate(array_element, attribute_filter, minified)
-            else:
-                validated_array_element = self._element_template.validate(array_element)
+                if isinstance(self._element_template, DataCollection):
+                    validated_array_element = self._element_template.validate(array_element, attribute_filter, minified)
+                else:
+                    validated_array_element = self._element_template.validate(array_element)
 
-            _validated_value.append(validated_array_element)
+                _validated_value.append(validated_array_element)
 
         if self._min_length is not None and len(_validated_value) < self._min_length:
             raise exception.LessThanMinimumError(value, self._min_length)
@@ -196,45 +351,208 @@ class Array(DataCollection):
                 self.append(element)
             return
 
-        # check for basic types supported by array
-        if isinstance(self._element_template, Boolean) or \
-           isinstance(self._element_template, Float) or \
-           isinstance(self._element_template, Integer) or \
-           isinstance(self._element_template, String):
-            value = self._element_template.__class__().validate(value)
-        elif isinstance(self._element_template, Date) or \
-             isinstance(self._element_template, DateTime) or \
-             isinstance(self._element_template, Time):
-            value = self._element_template.__class__().validate(value)
+        element_validator = self._element_validator()
+
+        if element_validator is not None:
+            value = element_validator(value)
+
+            if value is None:
+                raise exception.RequiredAttributeError()
         elif not isinstance(value, self._element_template.__class__):
             msg = "prestans array elements must be of type %s; given %s" % (
                 self._element_template.__class__.__name__, value.__class__.__name__
             )
             raise TypeError(msg)
 
-        self._array_elements.append(value)
+        try:
+            self._writable_elements().append(value)
+        except OverflowError as exp:
+            raise exception.ParseFailedError("value does not fit typed array storage, %s" % exp)
+
+    def extend(self, values):
+        """
+        Validates values against the element template in one pass and appends them
+
+        Nothing is appended if any of the values fails validation or the array would
+        grow beyond max_length.
+
+        :param values: elements to append
+        :type values: list | tuple
+        """
+
+        elements = self._validate_elements(values)
+
+        if self._max_length is not None and len(self._array_elements) + len(elements) > self._max_length:
+            raise exception.MoreThanMaximumError(values, self._max_length)
+
+        self._writable_elements().extend(elements)
+
+    def _writable_elements(self):
+        """
+        :return: the element storage, copying a wrapped buffer into growable storage first
+        :rtype: list | array.array
+        """
+
+        elements = self._array_elements
+
+        if self._typecode is not None and not typed_storage.is_growable(elements):
+            elements = self._array_elements = typed_storage.new_storage(self._typecode, elements)
+
+        return elements
+
+    def _element_validator(self):
+        """
+        :return: validate of the element template for scalar and temporal elements, None
+        if elements only have to be instances of the element template's class
+        :rtype: function | None
+        """
+
+        if isinstance(self._element_template, (Boolean, Float, Integer, String, Date, DateTime, Time)):
+            return self._element_template.validate
+
+        return None
+
+    def _validate_elements(self, values):
+        """
+        :return: values validated for use as elements of this array
+        :rtype: list
+        """
+
+        element_validator = self._element_validator()
+
+        if self._typecode is not None:
+            return typed_storage.validate_elements(self._element_template, self._typecode, values, element_validator)
+
+        if element_validator is None:
+            for value in values:
+                if not isinstance(value, self._element_template.__class__):
+                    msg = "prestans array elements must be of type %s; given %s" % (
+                        self._element_template.__class__.__name__, value.__class__.__name__
+                    )
+                    raise TypeError(msg)
+
+            return list(values)
+
+        elements = [element_validator(value) for value in values]
+
+        # a template that is not required may let a None through
+        if None in elements:
+            raise exception.RequiredAttributeError()
+
+        return elements
+
+    def _iter_validated(self, values):
+        """
+        Validates values against the element template one at a time as they are iterated
+        """
+
+        element_validator = self._element_validator()
+        element_class = self._element_template.__class__
+
+        for value in values:
+
+            if element_validator is not None:
+                value = element_validator(value)
+
+                if value is None:
+                    raise exception.RequiredAttributeError()
+            elif not isinstance(value, element_class):
+                msg = "prestans array elements must be of type %s; given %s" % (
+                    element_class.__name__, value.__class__.__name__
+                )
+                raise TypeError(msg)
+
+            yield value
 
     def as_serializable(self, attribute_filter=None, minified=False):
 
-        _result_array = list()
+        if self._typecode is not None:
+            return typed_storage.to_list(self._array_elements, self._typecode)
+
+        return list(self.iter_serializable(attribute_filter, minified))
+
+    def iter_serializable(self, attribute_filter=None, minified=False):
+        """
+        Generates the serializable form of each element in turn, used to stream
+        large arrays without holding the serializable form of all of them.
+
+        :param attribute_filter:
+        :type attribute_filter: prestans.parser.AttributeFilter
+        :param minified:
+        :type minified: bool
+        """
 
-        # convert filter to immutable if it isn't already
         from prestans.parser import AttributeFilter
-        if isinstance(attribute_filter, AttributeFilter):
+        from prestans.parser import compile_attribute_filter
+        from prestans.types import Model
+        from prestans.types.schema import ModelSchema
+
+        if self._typecode is not None:
+            for array_element in typed_storage.iter_elements(self._array_elements, self._typecode):
+                yield array_element
+            return
+
+        if isinstance(self._element_template, Model):
+            # compiled once for all elements
+            attribute_filter = compile_attribute_filter(self._element_template.__class__, attribute_filter)
+        elif isinstance(attribute_filter, AttributeFilter):
             attribute_filter = attribute_filter.as_immutable()
 
-        for array_element in self._array_elements:
+        elements = self._array_elements
 
-            if isinstance(self._element_template, DataCollection):
-                serialized_value = array_element.as_serializable(attribute_filter, minified)
-                _result_array.append(serialized_value)
-            elif isinstance(self._element_template, DataStructure):
-                serialized_value = self._element_template.as_serializable(array_element)
-                _result_array.append(serialized_value)
-            elif isinstance(self._element_template, DataType):
-                _result_array.append(array_element)
+        # lazy arrays may write their serializable form without producing elements
+        if isinstance(elements, _LazyElements) and elements.pending and elements.serializable is not None:
+            for serializable in elements.serialize(attribute_filter, minified):
+                yield serializable
+            return
+
+        # look up the generated serializer once for the whole array
+        if isinstance(self._element_template, Model) and self._element_template.__compiled__:
+            element_class = self._element_template.__class__
+            serializer = ModelSchema.for_class(element_class).serializer(attribute_filter, minified)
+
+            for array_element in self._array_elements:
+                if array_element.__class__ is element_class:
+                    yield serializer(array_element)
+                else:
+                    yield array_element.as_serializable(attribute_filter, minified)
+
+        elif isinstance(self._element_template, DataCollection):
+            for array_element in self._array_elements:
+                yield array_element.as_serializable(attribute_filter, minified)
+        elif isinstance(self._element_template, DataStructure):
+            for array_element in self._array_elements:
+                yield self._element_template.as_serializable(array_element)
+        elif isinstance(self._element_template, DataType):
+            for array_element in self._array_elements:
+                yield array_element
+
+    def clone(self):
+        """
+        Creates a new array with the same constraints and elements
+
+        The element template is shared rather than copied, elements that are
+        Models or Arrays are cloned.
+
+        :rtype: Array
+        """
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+
+        elements = self._array_elements
+
+        # cloning must not consume the elements of a lazy array
+        if isinstance(elements, _LazyElements):
+            elements = elements.materialize()
+
+        if isinstance(self._element_template, DataCollection):
+            clone._array_elements = [element.clone() for element in elements]
+        elif self._typecode is not None:
+            clone._array_elements = typed_storage.new_storage(self._typecode, elements)
+        else:
+            clone._array_elements = list(elements)
 
-        return _result_array
+        return clone
 
     def attribute_rewrite_map(self):
         if isinstance(self._element_template, DataCollection):
@@ -258,3 +576,65 @@ class Array(DataCollection):
             attribute_filter = default_value
 
         return attribute_filter
+
+
+class _LazyElements(object):
+    """
+    Element storage of an Array backed by an iterator
+
+    Iterating hands out the iterator itself, so elements are consumed as they are
+    produced; length, indexing, membership and modification materialize the elements
+    that have not been consumed yet into a list. Serializing through serialize consumes
+    the elements too, without producing them.
+    """
+
+    __slots__ = ("_iterator", "_elements", "serializable")
+
+    def __init__(self, iterator, serializable=None):
+        self._iterator = iterator
+        self._elements = None
+        self.serializable = serializable
+
+    @property
+    def pending(self):
+        return self._elements is None
+
+    def serialize(self, attribute_filter, minified):
+        serializable = self.serializable(attribute_filter, minified)
+        self._iterator = None
+        self._elements = []
+        return serializable
+
+    def materialize(self):
+        if self._elements is None:
+            self._elements = list(self._iterator)
+            self._iterator = None
+
+        return self._elements
+
+    def __iter__(self):
+        if self._elements is not None:
+            return iter(self._elements)
+
+        iterator = self._iterator
+        self._iterator = None
+        self._elements = []
+        return iterator
+
+    def __len__(self):
+        return len(self.materialize())
+
+    def __getitem__(self, index):
+        return self.materialize()[index]
+
+    def __contains__(self, item):
+        return item in self.materialize()
+
+    def append(self, value):
+        self.materialize().append(value)
+
+    def extend(self, values):
+        self.materialize().extend(values)
+
+    def remove(self, value):
+        self.materialize().remove(value)
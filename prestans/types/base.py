@@ -31,8 +31,25 @@
 #
 
 
+def choices_lookup(choices):
+    """
+    :return: choices as a frozenset for constant time membership tests, or unchanged if
+    any of the choices is not hashable
+    """
+
+    if choices is None:
+        return None
+
+    try:
+        return frozenset(choices)
+    except TypeError:
+        return choices
+
+
 class DataType(object):
 
+    __slots__ = ()
+
     def blueprint(self):
         raise NotImplementedError
 
@@ -40,6 +57,48 @@ class DataType(object):
         raise NotImplementedError
 
 
+class ScalarType(DataType):
+    """
+    Scalar types validate through a closure specialised for their constraints
+
+    The closure is compiled by _compile_validator on first use and dropped whenever an
+    attribute is assigned, templates can be reconfigured after construction e.g. Array
+    marks its element template as required. Unless a subclass overrides validate the
+    closure is also bound as the instance's validate, saving a call per value.
+    """
+
+    def __setattr__(self, key, value):
+        object.__setattr__(self, key, value)
+
+        self.__dict__.pop("_validator", None)
+        self.__dict__.pop("validate", None)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_validator", None)
+        state.pop("validate", None)
+        return state
+
+    def validate(self, value):
+
+        validator = self.__dict__.get("_validator")
+
+        if validator is None:
+            validator = self.__dict__["_validator"] = self._compile_validator()
+
+            if self.__class__.validate is ScalarType.validate:
+                self.__dict__["validate"] = validator
+
+        return validator(value)
+
+    def _compile_validator(self):
+        """
+        :return: function validating a single value against the current constraints
+        :rtype: function
+        """
+        raise NotImplementedError
+
+
 class DataStructure(DataType):
     """
     Wrappers on Python types generally represented as structures e.g DateTime
@@ -51,6 +110,8 @@ class DataStructure(DataType):
     E.g DateTime serializes itself as a ISO string
     """
 
+    __slots__ = ()
+
     def blueprint(self):
         raise NotImplementedError
 
@@ -63,6 +124,8 @@ class DataStructure(DataType):
 
 class DataCollection(DataType):
 
+    __slots__ = ()
+
     def blueprint(self):
         raise NotImplementedError
 
@@ -80,3 +143,6 @@ class DataCollection(DataType):
 
     def get_attribute_filter(self, default_value=False):
         raise NotImplementedError
+
+    def clone(self):
+        raise NotImplementedError
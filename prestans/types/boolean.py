@@ -30,10 +30,10 @@
 #  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 from prestans import exception
-from prestans.types import DataType
+from prestans.types.base import ScalarType
 
 
-class Boolean(DataType):
+class Boolean(ScalarType):
 
     def __init__(self, default=None, required=True, description=None):
 
@@ -70,16 +70,23 @@ class Boolean(DataType):
         blueprint['constraints'] = constraints
         return blueprint
 
-    def validate(self, value):
+    def _compile_validator(self):
 
-        if not self._required and self._default is None and value is None:
-            return None
-        elif self._required and self._default is None and value is None:
-            raise exception.RequiredAttributeError()
-        elif value is None and self.default is not None:
-            value = self._default
+        required = self._required
+        default = self._default
 
-        if not isinstance(value, bool):
-            raise exception.ParseFailedError()
+        def validate(value):
 
-        return value
+            if value is None:
+                if default is None:
+                    if required:
+                        raise exception.RequiredAttributeError()
+                    return None
+                value = default
+
+            if not isinstance(value, bool):
+                raise exception.ParseFailedError()
+
+            return value
+
+        return validate
@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+#
+#  prestans, A WSGI compliant REST micro-framework
+#  http://prestans.org
+#
+#  Copyright (c) 2017, Anomaly Software Pty Ltd.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#      * Redistributions of source code must retain the above copyright
+#        notice, this list of conditions and the following disclaimer.
+#      * Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#      * Neither the name of Anomaly Software nor the
+#        names of its contributors may be used to endorse or promote products
+#        derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+#  ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+#  WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL ANOMALY SOFTWARE BE LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#  (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+#  LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+#  ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#  (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""
+Generates specialised Python functions for Model classes
+
+A generic Model walks its members and inspects the kind of every attribute and the
+attribute filter for every instance it processes. For a given Model class, attribute
+filter and minification flag all of those decisions are constant, the compiler makes
+them once and emits a function with only the remaining work.
+
+Models opt in by setting __compiled__ = True, compiled functions are cached by their
+ModelSchema.
+"""
+from prestans import exception
+from prestans.types import Model
+from prestans.types.schema import ModelSchema
+
+
+def _lazy_function(namespace, name, resolve):
+    """
+    Resolves the compiled function of a nested model on first use and replaces itself
+    in namespace, so models may refer to themselves without compiling recursively
+    """
+
+    def lazy(*args):
+        function = resolve()
+        namespace[name] = function
+        return function(*args)
+
+    return lazy
+
+
+def _resolve_serializer(model_class, attribute_filter, minified):
+    return lambda: ModelSchema.for_class(model_class).serializer(attribute_filter, minified)
+
+
+def _resolve_validator(model_class, attribute_filter, minified):
+    return lambda: ModelSchema.for_class(model_class).validator(attribute_filter, minified)
+
+
+def _is_compiled_model(type_instance):
+    return isinstance(type_instance, Model) and type_instance.__compiled__
+
+
+def _compile_function(function_name, lines, namespace, schema, kind):
+    source = "\n".join(lines) + "\n"
+    code = compile(source, "<prestans %s %s>" % (kind, schema.model_class.__name__), "exec")
+    exec(code, namespace)
+
+    function = namespace[function_name]
+    function.source = source
+    return function
+
+
+def filter_signature(attribute_filter):
+    """
+    Describes the decisions attribute_filter makes during validation as a hashable value;
+    filters with equal signatures validate input the same way.
+
+    :param attribute_filter:
+    :type attribute_filter: prestans.parser.AttributeFilter | prestans.parser.AttributeFilterImmutable |
+        prestans.parser.CompiledAttributeFilter | None
+    :return: tuple of (key, visible, sub filter signature) or None if the input is unfiltered
+    :rtype: tuple | None
+    """
+    from prestans.parser import AttributeFilter
+    from prestans.parser import AttributeFilterImmutable
+    from prestans.parser import CompiledAttributeFilter
+
+    if isinstance(attribute_filter, AttributeFilter):
+        return attribute_filter._get_signature()
+    elif not isinstance(attribute_filter, (AttributeFilterImmutable, CompiledAttributeFilter)):
+        return None
+
+    signature = list()
+
+    for key in attribute_filter.keys():
+        sub_signature = None
+        if attribute_filter.is_filter_at_key(key):
+            sub_signature = filter_signature(getattr(attribute_filter, key))
+
+        signature.append((key, attribute_filter.is_attribute_visible(key), sub_signature))
+
+    return tuple(signature)
+
+
+def compile_serializer(schema, attribute_filter=None, minified=False):
+    """
+    Compiles the equivalent of Model.as_serializable for a schema
+
+    :param schema: schema of the model class to compile for
+    :type schema: prestans.types.schema.ModelSchema
+    :param attribute_filter: filter applied to the output
+    :type attribute_filter: prestans.parser.CompiledAttributeFilter | prestans.parser.AttributeFilterImmutable | None
+    :param minified: whether or not to use minified attribute names
+    :type minified: bool
+    :return: function taking a model instance and returning its serializable dict
+    :rtype: function
+    """
+    from prestans.parser import compile_attribute_filter
+
+    attribute_filter = compile_attribute_filter(schema.model_class, attribute_filter)
+
+    rewrite_map = schema.rewrite_map if minified is True else None
+    is_filtered = attribute_filter is not None
+
+    namespace = {"minified": minified}
+    statements = list()
+    items = list()
+    hidden = set()
+
+    for index, (attribute_name, type_instance) in enumerate(schema.members):
+
+        if is_filtered and not attribute_filter.is_visible(index):
+            hidden.add(attribute_name)
+            continue
+
+        sub_attribute_filter = attribute_filter.child(index) if is_filtered else None
+
+        serialized_attribute_name = attribute_name
+        if minified is True:
+            serialized_attribute_name = rewrite_map[attribute_name]
+
+        kind = schema.kinds[attribute_name]
+        key = repr(serialized_attribute_name)
+        value = "value_%i" % index
+
+        if kind == ModelSchema.OTHER:
+            items.append("%s: None" % key)
+
+        elif kind == ModelSchema.DATA_TYPE:
+            items.append("%s: get(%r)" % (key, attribute_name))
+
+        elif kind == ModelSchema.DATA_STRUCTURE:
+            namespace["template_%i" % index] = type_instance
+            statements.append("%s = get(%r)" % (value, attribute_name))
+            items.append("%s: None if %s is None else template_%i.as_serializable(%s)" % (
+                key, value, index, value
+            ))
+
+        elif kind == ModelSchema.DATA_COLLECTION and _is_compiled_model(type_instance):
+            # call the nested serializer directly for instances of the template class
+            namespace["class_%i" % index] = type_instance.__class__
+            namespace["serializer_%i" % index] = _lazy_function(
+                namespace,
+                "serializer_%i" % index,
+                _resolve_serializer(type_instance.__class__, sub_attribute_filter, minified)
+            )
+            namespace["filter_%i" % index] = sub_attribute_filter
+            statements.append("%s = get(%r)" % (value, attribute_name))
+            items.append(
+                "%s: None if %s is None else serializer_%i(%s) if %s.__class__ is class_%i "
+                "else %s.as_serializable(filter_%i, minified)" % (
+                    key, value, index, value, value, index, value, index
+                )
+            )
+
+        else:
+            namespace["filter_%i" % index] = sub_attribute_filter
+            statements.append("%s = get(%r)" % (value, attribute_name))
+            items.append("%s: %s if %s is None else %s.as_serializable(filter_%i, minified)" % (
+                key, "[]" if kind == ModelSchema.ARRAY else "None", value, value, index
+            ))
+
+    function_name = "as_serializable_%s" % schema.model_class.__name__
+
+    # deferred values are only computed for visible attributes
+    namespace["hidden"] = frozenset(hidden)
+
+    lines = [
+        "def %s(model):" % function_name,
+        "    if model._deferred is not None:",
+        "        model._resolve_deferred(hidden)",
+        "    get = model._attributes.get"
+    ]
+    lines.extend("    " + statement for statement in statements)
+    lines.append("    return {")
+    lines.extend("        %s," % item for item in items)
+    lines.append("    }")
+
+    return _compile_function(function_name, lines, namespace, schema, "serializer")
+
+
+def compile_validator(schema, attribute_filter=None, minified=False):
+    """
+    Compiles the equivalent of Model.validate for dictionary input
+
+    The compiled function takes the input dictionary and validates every attribute once,
+    straight into the attributes of a new instance. The attribute filter and the sub
+    filters for nested types are applied when the function is generated.
+
+    :param schema: schema of the model class to compile for
+    :type schema: prestans.types.schema.ModelSchema
+    :param attribute_filter: filter the input is validated against
+    :type attribute_filter: prestans.parser.CompiledAttributeFilter | prestans.parser.AttributeFilter | None
+    :param minified: whether or not the input uses minified attribute names
+    :type minified: bool
+    :return: function taking the input dict, returning a model instance
+    :rtype: function
+    """
+    from prestans.parser import compile_attribute_filter
+
+    attribute_filter = compile_attribute_filter(schema.model_class, attribute_filter, validation=True)
+
+    rewrite_map = schema.rewrite_map if minified is True else None
+    is_filtered = attribute_filter is not None
+
+    namespace = {
+        "minified": minified,
+        "from_attributes": schema.model_class._from_attributes,
+        "DataValidationException": exception.DataValidationException,
+        "ValidationError": exception.ValidationError
+    }
+    lines = list()
+    items = list()
+
+    for index, (attribute_name, type_instance) in enumerate(schema.members):
+
+        kind = schema.kinds[attribute_name]
+
+        if kind == ModelSchema.OTHER:
+            lines.append("    raise TypeError(%r)" % ("%s must be a DataType subclass" % attribute_name))
+            break
+
+        if is_filtered and not attribute_filter.is_visible(index):
+            items.append("%r: None" % attribute_name)
+            continue
+
+        sub_attribute_filter = attribute_filter.child(index) if is_filtered else None
+
+        input_value_key = attribute_name
+        if minified is True:
+            input_value_key = rewrite_map[attribute_name]
+
+        input_value = "input_%i" % index
+        result = "result_%i" % index
+        template = "template_%i" % index
+
+        namespace[template] = type_instance
+        lines.append("    %s = value.get(%r)" % (input_value, input_value_key))
+        lines.append("    try:")
+
+        if kind >= ModelSchema.DATA_COLLECTION:
+
+            namespace["filter_%i" % index] = sub_attribute_filter
+
+            if kind == ModelSchema.DATA_COLLECTION and _is_compiled_model(type_instance):
+                # dictionaries the template would not turn away go straight to the nested validator
+                validator = "validator_%i" % index
+                namespace[validator] = _lazy_function(
+                    namespace, validator, _resolve_validator(type_instance.__class__, sub_attribute_filter, minified)
+                )
+
+                if type_instance._required:
+                    lines.append("        if %s.__class__ is dict:" % input_value)
+                else:
+                    lines.append("        if %s and %s.__class__ is dict:" % (input_value, input_value))
+                lines.append("            %s = %s(%s)" % (result, validator, input_value))
+                lines.append("        else:")
+                lines.append("            %s = %s.validate(%s, filter_%i, minified)" % (
+                    result, template, input_value, index
+                ))
+
+            elif kind == ModelSchema.ARRAY and _is_compiled_model(type_instance.element_template):
+                validator = "validator_%i" % index
+                namespace[validator] = _lazy_function(
+                    namespace, validator,
+                    _resolve_validator(type_instance.element_template.__class__, sub_attribute_filter, minified)
+                )
+                lines.append("        %s = %s._validate(%s, filter_%i, minified, %s)" % (
+                    result, template, input_value, index, validator
+                ))
+
+            else:
+                lines.append("        %s = %s.validate(%s, filter_%i, minified)" % (
+                    result, template, input_value, index
+                ))
+        else:
+            lines.append("        %s = %s.validate(%s)" % (result, template, input_value))
+
+        lines.append("    except DataValidationException as exp:")
+        lines.append("        raise ValidationError(")
+        lines.append("            message=str(exp),")
+        lines.append("            attribute_name=%r," % attribute_name)
+        lines.append("            value=%s," % input_value)
+        lines.append("            blueprint=%s.blueprint()" % template)
+        lines.append("        )")
+
+        items.append("%r: %s" % (attribute_name, result))
+
+    function_name = "validate_%s" % schema.model_class.__name__
+
+    lines.insert(0, "def %s(value):" % function_name)
+    lines.append("    return from_attributes({")
+    lines.extend("        %s," % item for item in items)
+    lines.append("    })")
+
+    return _compile_function(function_name, lines, namespace, schema, "validator")
@@ -35,6 +35,9 @@ from datetime import datetime
 
 from prestans import exception
 from prestans.types import DataStructure
+from prestans.types.date_format import DATE_FIELDS
+from prestans.types.date_format import compile_date_format
+from prestans.util import string_types
 
 
 class Date(DataStructure):
@@ -53,6 +56,7 @@ class Date(DataStructure):
 
         self._required = required
         self._format = format
+        self._date_format = compile_date_format(format, DATE_FIELDS)
         self._description = description
 
     @property
@@ -104,13 +108,11 @@ class Date(DataStructure):
             else:
                 value = self._default
 
-        from prestans.util import string_types
-
         if isinstance(value, date_type):
             _validated_value = value
         elif isinstance(value, string_types):
             try:
-                _validated_value = datetime.strptime(value, self._format).date()
+                _validated_value = self._parse(value)
             except ValueError as exp:
                 raise exception.ParseFailedError("date parsing failed %s" % exp)
         else:
@@ -123,4 +125,20 @@ class Date(DataStructure):
         if not isinstance(value, date_type):
             raise exception.InvalidTypeError(value, 'datetime.date')
 
+        if self._date_format is not None:
+            return self._date_format.format_value(value)
+
         return value.strftime(self._format)
+
+    def _parse(self, value):
+
+        if self._date_format is not None:
+            arguments = self._date_format.parse(value)
+            if arguments is not None:
+                try:
+                    return date_type(*arguments[:3])
+                except ValueError:
+                    # out of range fields are reported by strptime
+                    pass
+
+        return datetime.strptime(value, self._format).date()
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+#
+#  prestans, A WSGI compliant REST micro-framework
+#  http://prestans.org
+#
+#  Copyright (c) 2017, Anomaly Software Pty Ltd.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#      * Redistributions of source code must retain the above copyright
+#        notice, this list of conditions and the following disclaimer.
+#      * Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#      * Neither the name of Anomaly Software nor the
+#        names of its contributors may be used to endorse or promote products
+#        derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+#  ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+#  WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL ANOMALY SOFTWARE BE LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#  (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+#  LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+#  ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#  (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import operator
+import re
+
+#: directive: (field index in datetime arguments, parse pattern, format specifier)
+_DIRECTIVES = {
+    "Y": (0, "([0-9]{4})", "%04d"),
+    "m": (1, "([0-9]{2})", "%02d"),
+    "d": (2, "([0-9]{2})", "%02d"),
+    "H": (3, "([0-9]{2})", "%02d"),
+    "M": (4, "([0-9]{2})", "%02d"),
+    "S": (5, "([0-9]{2})", "%02d"),
+    "f": (6, "([0-9]{6})", "%06d")
+}
+
+_FIELD_NAMES = ("year", "month", "day", "hour", "minute", "second", "microsecond")
+
+#: strptime defaults for fields missing from the format
+_FIELD_DEFAULTS = (1900, 1, 1, 0, 0, 0, 0)
+
+_LITERALS = "-:T. Z"
+
+#: fields a date or a time carry, formats of other directives are left to strftime
+DATE_FIELDS = (0, 1, 2)
+TIME_FIELDS = (3, 4, 5, 6)
+DATETIME_FIELDS = DATE_FIELDS + TIME_FIELDS
+
+
+class DateFormat(object):
+    """
+    Parser and formatter for a strftime format made of zero padded numeric directives
+
+    parse only accepts the fixed width form of each directive, it returns None for
+    anything else so the caller can fall back to strptime which is more lenient
+    e.g. with padding and whitespace. Both paths agree on every value parse accepts.
+    """
+
+    __slots__ = ("_format", "_match", "_fields", "_leading", "_defaults", "_template", "_getter", "_year_field")
+
+    def __init__(self, format, match, fields, template):
+        self._format = format
+        self._match = match
+        self._fields = fields
+        # fields in datetime argument order from the year on need no reordering
+        self._leading = fields == tuple(range(len(fields)))
+        self._defaults = list(_FIELD_DEFAULTS[len(fields):])
+        self._template = template
+        self._getter = operator.attrgetter(*[_FIELD_NAMES[field] for field in fields])
+        self._year_field = 0 in fields
+
+    @property
+    def format(self):
+        return self._format
+
+    def parse(self, value):
+        """
+        :return: year, month, day, hour, minute, second and microsecond or None
+        :rtype: list | None
+        """
+
+        match = self._match(value)
+        if match is None:
+            return None
+
+        if self._leading:
+            return [int(text) for text in match.groups()] + self._defaults
+
+        arguments = list(_FIELD_DEFAULTS)
+        for field, text in zip(self._fields, match.groups()):
+            arguments[field] = int(text)
+
+        return arguments
+
+    def format_value(self, value):
+        """
+        :param value: date, datetime or time with the attributes of the format's directives
+        :rtype: str
+        """
+
+        # strftime does not zero pad years before 1000 on every platform
+        if self._year_field and value.year < 1000:
+            return value.strftime(self._format)
+
+        return self._template % self._getter(value)
+
+
+def compile_date_format(format, allowed_fields=DATETIME_FIELDS):
+    """
+    :param format: strftime / strptime format
+    :type format: str
+    :param allowed_fields: DATE_FIELDS, TIME_FIELDS or DATETIME_FIELDS
+    :type allowed_fields: tuple
+    :return: a DateFormat for format, or None if format uses anything other than
+    the numeric directives of allowed_fields and ISO-8601 separators
+    :rtype: DateFormat | None
+    """
+
+    if not format:
+        return None
+
+    pattern = list()
+    template = list()
+    fields = list()
+
+    index = 0
+    while index < len(format):
+
+        character = format[index]
+
+        if character == "%":
+            directive = _DIRECTIVES.get(format[index + 1:index + 2])
+
+            # strptime rejects formats that repeat a directive
+            if directive is None or directive[0] in fields or directive[0] not in allowed_fields:
+                return None
+
+            field, directive_pattern, specifier = directive
+            fields.append(field)
+            pattern.append(directive_pattern)
+            template.append(specifier)
+            index += 2
+        elif character in _LITERALS:
+            pattern.append(re.escape(character))
+            template.append(character)
+            index += 1
+        else:
+            return None
+
+    if not fields:
+        return None
+
+    return DateFormat(format, re.compile("".join(pattern) + r"\Z").match, tuple(fields), "".join(template))
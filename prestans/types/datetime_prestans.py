@@ -34,6 +34,8 @@ from datetime import datetime
 
 from prestans import exception
 from prestans.types import DataStructure
+from prestans.types.date_format import compile_date_format
+from prestans.util import string_types
 
 
 class DateTime(DataStructure):
@@ -57,6 +59,7 @@ class DateTime(DataStructure):
         self._timezone = timezone
         self._utc = utc
         self._format = format
+        self._date_format = compile_date_format(format)
         self._description = description
 
     @property
@@ -123,13 +126,11 @@ class DateTime(DataStructure):
             else:
                 value = self._default
 
-        from prestans.util import string_types
-
         if isinstance(value, datetime_type):
             _validated_value = value
         elif isinstance(value, string_types):
             try:
-                _validated_value = datetime.strptime(value, self._format)
+                _validated_value = self._parse(value)
             except ValueError as exp:
                 raise exception.ParseFailedError("date time parsing failed %s" % exp)
         else:
@@ -142,4 +143,20 @@ class DateTime(DataStructure):
         if not type(value) == datetime:
             raise exception.InvalidTypeError(value, 'datetime.datetime')
 
+        if self._date_format is not None:
+            return self._date_format.format_value(value)
+
         return value.strftime(self._format)
+
+    def _parse(self, value):
+
+        if self._date_format is not None:
+            arguments = self._date_format.parse(value)
+            if arguments is not None:
+                try:
+                    return datetime_type(*arguments)
+                except ValueError:
+                    # out of range fields are reported by strptime
+                    pass
+
+        return datetime.strptime(value, self._format)
@@ -30,10 +30,11 @@
 #  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 from prestans import exception
-from prestans.types import DataType
+from prestans.types.base import ScalarType
+from prestans.types.base import choices_lookup
 
 
-class Float(DataType):
+class Float(ScalarType):
 
     def __init__(self, default=None, minimum=None, maximum=None, required=True,
                  choices=None, description=None):
@@ -88,29 +89,38 @@ class Float(DataType):
         blueprint['constraints'] = constraints
         return blueprint
 
-    def validate(self, value):
+    def _compile_validator(self):
 
-        if not self._required and self._default is None and value is None:
-            return None
-        if self._required and self._default is None and value is None:
-            raise exception.RequiredAttributeError()
-        elif self._required and value is None:
-            value = self._default
-        elif not self._required and value is None:
-            value = self._default
+        required = self._required
+        default = self._default
+        minimum = self._minimum
+        maximum = self._maximum
+        choices = self._choices
+        choices_set = choices_lookup(choices)
 
-        try:
-            _validated_value = float(value)
-        except Exception as exp:
-            raise exception.ParseFailedError("float encoding failed %s" % exp)
+        def validate(value):
 
-        if _validated_value is not None and self._minimum is not None and _validated_value < self._minimum:
-            raise exception.LessThanMinimumError(value, self._minimum)
+            if value is None:
+                if default is None:
+                    if required:
+                        raise exception.RequiredAttributeError()
+                    return None
+                value = default
 
-        if _validated_value is not None and self._maximum is not None and _validated_value > self._maximum:
-            raise exception.MoreThanMaximumError(value, self._maximum)
+            try:
+                _validated_value = float(value)
+            except Exception as exp:
+                raise exception.ParseFailedError("float encoding failed %s" % exp)
 
-        if self._choices is not None and _validated_value not in self._choices:
-            raise exception.InvalidChoiceError(value, self._choices)
+            if minimum is not None and _validated_value < minimum:
+                raise exception.LessThanMinimumError(value, minimum)
 
-        return _validated_value
+            if maximum is not None and _validated_value > maximum:
+                raise exception.MoreThanMaximumError(value, maximum)
+
+            if choices_set is not None and _validated_value not in choices_set:
+                raise exception.InvalidChoiceError(value, choices)
+
+            return _validated_value
+
+        return validate
@@ -30,10 +30,12 @@
 #  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 from prestans import exception
-from prestans.types import DataType
+from prestans.types.base import ScalarType
+from prestans.types.base import choices_lookup
+from prestans.util import integer_types
 
 
-class Integer(DataType):
+class Integer(ScalarType):
 
     def __init__(self, default=None, minimum=None, maximum=None,
                  required=True, choices=None, description=None):
@@ -91,31 +93,40 @@ class Integer(DataType):
 
         return blueprint
 
-    def validate(self, value):
+    def _compile_validator(self):
 
-        if not self._required and self._default is None and value is None:
-            return None
-        elif self._required and self._default is None and value is None:
-            raise exception.RequiredAttributeError()
-        elif self._default is not None and value is None:
-            value = self._default
+        required = self._required
+        default = self._default
+        minimum = self._minimum
+        maximum = self._maximum
+        choices = self._choices
+        choices_set = choices_lookup(choices)
 
-        try:
-            from prestans.util import integer_types
+        def validate(value):
+
+            if value is None:
+                if default is None:
+                    if required:
+                        raise exception.RequiredAttributeError()
+                    return None
+                value = default
 
             if isinstance(value, integer_types):
                 _validated_value = value
             else:
-                _validated_value = int(value)
-        except Exception:
-            raise exception.ParseFailedError("encoding failed: value is not an integer or a long")
+                try:
+                    _validated_value = int(value)
+                except Exception:
+                    raise exception.ParseFailedError("encoding failed: value is not an integer or a long")
+
+            if minimum is not None and _validated_value < minimum:
+                raise exception.LessThanMinimumError(value, minimum)
+            if maximum is not None and _validated_value > maximum:
+                raise exception.MoreThanMaximumError(value, maximum)
 
-        if _validated_value is not None and self._minimum is not None and _validated_value < self._minimum:
-            raise exception.LessThanMinimumError(value, self._minimum)
-        if _validated_value is not None and self._maximum is not None and _validated_value > self._maximum:
-            raise exception.MoreThanMaximumError(value, self._maximum)
+            if choices_set is not None and _validated_value not in choices_set:
+                raise exception.InvalidChoiceError(value, choices)
 
-        if self._choices is not None and not _validated_value in self._choices:
-            raise exception.InvalidChoiceError(value, self._choices)
+            return _validated_value
 
-        return _validated_value
+        return validate
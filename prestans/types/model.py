@@ -29,17 +29,119 @@
 #  (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 #  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
-import copy
 import inspect
 import string
 
 from prestans import exception
 from prestans.types import DataCollection
-from prestans.types import DataStructure
 from prestans.types import DataType
+from prestans.types.deferred import Deferred
+from prestans.types.schema import ModelSchema
+from prestans.util import with_metaclass
 
 
-class Model(DataCollection):
+class FieldDescriptor(object):
+    """
+    Gives access to the value of a prestans type attribute of a Model instance
+
+    ModelMeta replaces every DataType class attribute with one of these. Reading
+    from the class returns the type template, reading from an instance returns the
+    stored value; a nested collection that has no value is created from a clone of
+    the template on first access, a Deferred value is computed on first access.
+    Writes are validated by Model.__setattr__.
+    """
+
+    __slots__ = ("_name", "_template", "_is_collection")
+
+    def __init__(self, name, template):
+        self._name = name
+        self._template = template
+        self._is_collection = isinstance(template, DataCollection)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def template(self):
+        return self._template
+
+    def __get__(self, instance, owner):
+
+        if instance is None:
+            return self._template
+
+        value = instance._attributes.get(self._name)
+
+        if value is None:
+
+            deferred = instance._deferred
+            if deferred is not None and self._name in deferred:
+                instance._resolve_deferred_attribute(self._name)
+                value = instance._attributes.get(self._name)
+
+            # if attribute is a data collection and no value found we need to copy the template
+            if value is None and self._is_collection:
+                value = self._template.clone()
+                instance._attributes[self._name] = value
+
+        return value
+
+    def __set__(self, instance, value):
+        Model.__setattr__(instance, self._name, value)
+
+
+class ModelMeta(type):
+    """
+    Installs a FieldDescriptor for every prestans type attribute of a Model class
+    and invalidates compiled schemas when attributes of a Model class are changed
+
+    Classes using compact storage are given empty __slots__ so their instances
+    don't carry a __dict__.
+    """
+
+    def __new__(mcs, name, bases, namespace):
+
+        compact = namespace.get("__compact__", any(getattr(base, "__compact__", False) for base in bases))
+
+        if compact and "__slots__" not in namespace:
+            namespace = dict(namespace)
+            namespace["__slots__"] = ()
+
+        model_class = super(ModelMeta, mcs).__new__(mcs, name, bases, namespace)
+
+        for key, value in iter(namespace.items()):
+            if not key.startswith("__") and isinstance(value, DataType):
+                type.__setattr__(model_class, key, FieldDescriptor(key, value))
+
+        return model_class
+
+    def __setattr__(cls, key, value):
+
+        if not key.startswith("__") and isinstance(value, DataType):
+            value = FieldDescriptor(key, value)
+
+        super(ModelMeta, cls).__setattr__(key, value)
+
+        if not key.startswith("__"):
+            ModelSchema.invalidate()
+
+    def __delattr__(cls, key):
+        super(ModelMeta, cls).__delattr__(key)
+
+        if not key.startswith("__"):
+            ModelSchema.invalidate()
+
+
+class Model(with_metaclass(ModelMeta, DataCollection)):
+
+    #: set to True to serialize and validate instances with functions generated per class
+    __compiled__ = False
+    #: set to True to store attribute values in a list instead of a dict, and drop the
+    #: instance __dict__; instances can then not be given any other attributes
+    __compact__ = False
+
+    __slots__ = ("_required", "_description", "_templates", "_attributes", "_deferred")
 
     def __init__(self, required=True, description=None, **kwargs):
         """
@@ -56,9 +158,9 @@ class Model(DataCollection):
 
         self._required = required
         self._description = description
+        #: Deferred values by attribute name, None if there are none
+        self._deferred = None
 
-        self._templates = {}
-        self._attributes = {}
         self._create_instance_attributes(kwargs)
 
     def getmembers(self):
@@ -66,21 +168,10 @@ class Model(DataCollection):
         :return: list of members as name, type tuples
         :rtype: list
         """
-        return filter(
-            lambda m: not m[0].startswith("__") and not inspect.isfunction(m[1]) and not inspect.ismethod(m[1]),
-            inspect.getmembers(self.__class__)
-        )
+        return list(ModelSchema.for_class(self.__class__).members)
 
     def attribute_count(self):
-
-        attribute_count = 0
-
-        for attribute_name, type_instance in self.getmembers():
-
-            if isinstance(type_instance, DataType):
-                attribute_count += 1
-
-        return attribute_count
+        return ModelSchema.for_class(self.__class__).attribute_count
 
     def blueprint(self):
 
@@ -96,7 +187,7 @@ class Model(DataCollection):
         blueprint['constraints'] = constraints
 
         fields = dict()
-        for attribute_name, type_instance in self.getmembers():
+        for attribute_name, type_instance in ModelSchema.for_class(self.__class__).members:
 
             if not isinstance(type_instance, DataType):
                 raise TypeError("%s must be of a DataType subclass" % attribute_name)
@@ -106,42 +197,20 @@ class Model(DataCollection):
         blueprint['fields'] = fields
         return blueprint
 
-    def __getattribute__(self, key):
-        value = object.__getattribute__(self, key)
-
-        if key[0:1] == "_":
-            return value
-
-        attributes = self.__dict__["_attributes"]
-        templates = self.__dict__["_templates"]
-
-        if value is not None and key not in templates:
-            return value
-
-        validator = templates.get(key)
-        # grab the value from local attribute dictionary for prestans types
-        if validator is not None:
-            value = attributes.get(key)
-
-        # if attribute is a data collection and no value found we need to copy the template
-        if isinstance(validator, DataCollection) and value is None:
-            copied = copy.deepcopy(validator)
-
-            self._attributes[key] = copied
-            value = copied
-
-        return value
-
     def __setattr__(self, key, value):
 
         if key[0:1] == "_":
-            self.__dict__[key] = value
+            object.__setattr__(self, key, value)
             return
 
         validator = self._templates.get(key)
         if validator is None:
             raise KeyError("No key named: %s in instance of type: %s" % (key, self.__class__.__name__))
 
+        if isinstance(value, Deferred):
+            self._defer(key, value)
+            return
+
         try:
             # if given an instance of data collection we can directly set it
             if isinstance(validator, DataCollection) and validator.__class__ == value.__class__:
@@ -157,6 +226,93 @@ class Model(DataCollection):
                 blueprint=validator.blueprint()
             )
 
+        # an assigned value replaces a deferred one
+        deferred = self._deferred
+        if deferred is not None and key in deferred:
+            del deferred[key]
+            if not deferred:
+                self._deferred = None
+
+    def _defer(self, key, value):
+        if self._deferred is None:
+            self._deferred = dict()
+
+        self._deferred[key] = value
+        self._attributes[key] = None
+
+    def _resolve_deferred_attribute(self, key):
+        """
+        Computes and assigns the deferred value of key, the value stays deferred if
+        computing or validating it fails
+        """
+        Model.__setattr__(self, key, self._deferred[key].resolve())
+
+    def _resolve_deferred(self, hidden=frozenset()):
+        """
+        Computes the deferred values of all attributes except hidden ones
+
+        :param hidden: names of the attributes hidden by the attribute filter
+        :type hidden: frozenset
+        """
+        for key in list(self._deferred):
+            if key not in hidden:
+                self._resolve_deferred_attribute(key)
+
+    @classmethod
+    def _from_attributes(cls, attributes):
+        """
+        Creates an instance around already validated attributes
+
+        Used by compiled validators, skips __init__ and with it the validation of
+        default values for every attribute.
+
+        :param attributes: validated value of every attribute
+        :type attributes: dict
+        :rtype: Model
+        """
+        schema = ModelSchema.for_class(cls)
+
+        # private attributes skip the checks of Model.__setattr__
+        model_instance = cls.__new__(cls)
+        set_attribute = object.__setattr__
+        set_attribute(model_instance, "_required", True)
+        set_attribute(model_instance, "_description", None)
+        set_attribute(model_instance, "_deferred", None)
+        set_attribute(model_instance, "_templates", schema.templates)
+        set_attribute(
+            model_instance,
+            "_attributes",
+            schema.record_class.from_dict(attributes) if cls.__compact__ else attributes
+        )
+
+        return model_instance
+
+    def clone(self):
+        """
+        Creates a new instance with the same settings and attribute values
+
+        Unlike copy.deepcopy the attribute templates are shared rather than copied,
+        only nested Models and Arrays holding values are cloned.
+
+        :rtype: Model
+        """
+        model_class = self.__class__
+        attributes = self._attributes
+
+        clone = model_class.__new__(model_class)
+        clone._required = self._required
+        clone._description = self._description
+        clone._templates = self._templates
+        clone._attributes = attributes.__class__(attributes)
+        clone._deferred = dict(self._deferred) if self._deferred is not None else None
+
+        for attribute_name in ModelSchema.for_class(model_class).collections:
+            value = attributes.get(attribute_name)
+            if value is not None:
+                clone._attributes[attribute_name] = value.clone()
+
+        return clone
+
     def _create_instance_attributes(self, arguments):
         """
         Copies class level attribute templates and makes instance placeholders
@@ -167,19 +323,28 @@ class Model(DataCollection):
 
         DataType instances are initialized to None or default value.
         """
-        for attribute_name, type_instance in self.getmembers():
-            if isinstance(type_instance, DataType):
-                self._templates[attribute_name] = type_instance
+        schema = ModelSchema.for_class(self.__class__)
+        templates = schema.templates
+
+        # templates are shared by all instances of the class
+        self._templates = templates
+        self._attributes = schema.new_attributes()
+
+        for attribute_name, type_instance in iter(templates.items()):
+
+            value = None
+            if attribute_name in arguments:
+                value = arguments[attribute_name]
 
-                value = None
-                if attribute_name in arguments:
-                    value = arguments[attribute_name]
+            if isinstance(value, Deferred):
+                self._defer(attribute_name, value)
+                continue
 
-                try:
-                    self._attributes[attribute_name] = type_instance.validate(value)
-                # we can safely ignore required warnings during initialization
-                except exception.RequiredAttributeError:
-                    self._attributes[attribute_name] = None
+            try:
+                self._attributes[attribute_name] = type_instance.validate(value)
+            # we can safely ignore required warnings during initialization
+            except exception.RequiredAttributeError:
+                self._attributes[attribute_name] = None
 
     def get_attribute_keys(self):
         """
@@ -189,21 +354,14 @@ class Model(DataCollection):
         attribute names in a prestans model
         """
 
-        _attribute_keys = list()
-
-        for attribute_name, type_instance in self.getmembers():
-
-            if isinstance(type_instance, DataType):
-                _attribute_keys.append(attribute_name)
-
-        return _attribute_keys
+        return list(ModelSchema.for_class(self.__class__).fields)
 
     def get_attribute_filter(self, default_value=False):
         from prestans.parser import AttributeFilter
 
         attribute_filter = AttributeFilter()
 
-        for attribute_name, type_instance in self.getmembers():
+        for attribute_name, type_instance in ModelSchema.for_class(self.__class__).members:
 
             if isinstance(type_instance, DataCollection):
                 setattr(attribute_filter, attribute_name, type_instance.get_attribute_filter(default_value))
@@ -237,20 +395,33 @@ class Model(DataCollection):
             """
             return None
 
-        _model_instance = self.__class__()
+        schema = ModelSchema.for_class(self.__class__)
 
-        rewrite_map = self.attribute_rewrite_map()
+        if attribute_filter is not None:
+            from prestans.parser import compile_attribute_filter
+            attribute_filter = compile_attribute_filter(self.__class__, attribute_filter, validation=True)
 
-        from prestans.parser import AttributeFilter
-        from prestans.parser import AttributeFilterImmutable
+        if self.__compiled__ and isinstance(value, dict):
+            return schema.validator(attribute_filter, minified)(value)
 
-        for attribute_name, type_instance in self.getmembers():
-            if not isinstance(type_instance, DataType):
+        attributes = dict()
+
+        rewrite_map = schema.rewrite_map if minified is True else None
+        kinds = schema.kinds
+
+        is_filtered = attribute_filter is not None
+        if is_filtered:
+            visible_mask = attribute_filter._mask
+            sub_attribute_filters = attribute_filter._children
+
+        for index, (attribute_name, type_instance) in enumerate(schema.members):
+            kind = kinds[attribute_name]
+
+            if kind == ModelSchema.OTHER:
                 raise TypeError("%s must be a DataType subclass" % attribute_name)
 
-            if isinstance(attribute_filter, (AttributeFilter, AttributeFilterImmutable)) and \
-               not attribute_filter.is_attribute_visible(attribute_name):
-                _model_instance._attributes[attribute_name] = None
+            if is_filtered and not visible_mask >> index & 1:
+                attributes[attribute_name] = None
                 continue
 
             validation_input = None
@@ -266,20 +437,16 @@ class Model(DataCollection):
 
             try:
 
-                if isinstance(type_instance, DataCollection):
-                    sub_attribute_filter = None
-                    if attribute_filter and attribute_name in attribute_filter:
-                        sub_attribute_filter = getattr(attribute_filter, attribute_name)
-
+                if kind >= ModelSchema.DATA_COLLECTION:
                     validated_object = type_instance.validate(
                         validation_input,
-                        sub_attribute_filter,
+                        sub_attribute_filters[index] if is_filtered else None,
                         minified
                     )
                 else:
                     validated_object = type_instance.validate(validation_input)
 
-                _model_instance._attributes[attribute_name] = validated_object
+                attributes[attribute_name] = validated_object
 
             except exception.DataValidationException as exp:
                 raise exception.ValidationError(
@@ -289,60 +456,25 @@ class Model(DataCollection):
                     blueprint=type_instance.blueprint()
                 )
 
-        return _model_instance
+        return self.__class__._from_attributes(attributes)
 
     def attribute_rewrite_map(self):
         """
         Example: long_name -> a_b
 
-        :return: the rewrite map
+        :return: the read only rewrite map, shared by all instances of the class
         :rtype: dict
         """
-
-        rewrite_map = dict()
-        token_rewrite_map = self.generate_attribute_token_rewrite_map()
-
-        for attribute_name, type_instance in self.getmembers():
-
-            if isinstance(type_instance, DataType):
-                attribute_tokens = attribute_name.split('_')
-
-                rewritten_attribute_name = ''
-                for token in attribute_tokens:
-                    rewritten_attribute_name += token_rewrite_map[token] + "_"
-                # remove the trailing underscore
-                rewritten_attribute_name = rewritten_attribute_name[:-1]
-
-                rewrite_map[attribute_name] = rewritten_attribute_name
-
-        return rewrite_map
+        return ModelSchema.for_class(self.__class__).rewrite_map
 
     def attribute_rewrite_reverse_map(self):
         """
         Example: a_b -> long_name
 
-        :return: the reverse rewrite map
+        :return: the read only reverse rewrite map, shared by all instances of the class
         :rtype: dict
         """
-
-        rewrite_map = dict()
-
-        token_rewrite_map = self.generate_attribute_token_rewrite_map()
-
-        for attribute_name, type_instance in self.getmembers():
-
-            if isinstance(type_instance, DataType):
-
-                attribute_tokens = attribute_name.split('_')
-                rewritten_attribute_name = ''
-                for token in attribute_tokens:
-                    rewritten_attribute_name += token_rewrite_map[token] + "_"
-                # remove the trailing underscore
-                rewritten_attribute_name = rewritten_attribute_name[:-1]
-
-                rewrite_map[rewritten_attribute_name] = attribute_name
-
-        return rewrite_map
+        return ModelSchema.for_class(self.__class__).rewrite_reverse_map
 
     def __contains__(self, attribute_name):
 
@@ -369,27 +501,10 @@ class Model(DataCollection):
         return has_key
 
     def generate_attribute_token_rewrite_map(self):
-
-        rewrite_tokens = self.generate_attribute_tokens()
-        minified_tokens = self.generate_minified_keys(len(rewrite_tokens))
-
-        return dict(zip(rewrite_tokens, minified_tokens))
+        return ModelSchema.for_class(self.__class__).token_rewrite_map
 
     def generate_attribute_tokens(self):
-
-        rewrite_tokens = list()
-
-        # create a list of tokens
-        for attribute_name, type_instance in self.getmembers():
-
-            if isinstance(type_instance, DataType):
-                rewrite_tokens = rewrite_tokens + attribute_name.split('_')
-
-        # remove duplicated; sort alphabetically for the algorithm to work
-        rewrite_tokens = list(set(rewrite_tokens))
-        rewrite_tokens.sort()
-
-        return rewrite_tokens
+        return ModelSchema.for_class(self.__class__).attribute_tokens
 
     @classmethod
     def generate_minified_keys(cls, length=26, prefix=''):
@@ -444,22 +559,30 @@ class Model(DataCollection):
         :param minified:
         :type minified: bool
         """
-        from prestans.parser import AttributeFilter
-        from prestans.parser import AttributeFilterImmutable
-        from prestans.types import Array
+        schema = ModelSchema.for_class(self.__class__)
+
+        # compiled against this class once, nested models receive their compiled sub filters
+        if attribute_filter is not None:
+            from prestans.parser import compile_attribute_filter
+            attribute_filter = compile_attribute_filter(self.__class__, attribute_filter)
+
+        if self.__compiled__:
+            return schema.serializer(attribute_filter, minified)(self)
 
         model_dictionary = dict()
 
-        rewrite_map = self.attribute_rewrite_map()
+        rewrite_map = schema.rewrite_map if minified is True else None
+        kinds = schema.kinds
+        attributes = self._attributes
 
-        # convert filter to immutable if it isn't already
-        if isinstance(attribute_filter, AttributeFilter):
-            attribute_filter = attribute_filter.as_immutable()
+        is_filtered = attribute_filter is not None
+        if is_filtered:
+            visible_mask = attribute_filter._mask
+            sub_attribute_filters = attribute_filter._children
 
-        for attribute_name, type_instance in self.getmembers():
+        for index, (attribute_name, type_instance) in enumerate(schema.members):
 
-            if isinstance(attribute_filter, (AttributeFilter, AttributeFilterImmutable)) and \
-               not attribute_filter.is_attribute_visible(attribute_name):
+            if is_filtered and not visible_mask >> index & 1:
                 continue
 
             # support minification
@@ -467,27 +590,31 @@ class Model(DataCollection):
             if minified is True:
                 serialized_attribute_name = rewrite_map[attribute_name]
 
-            if attribute_name not in self._attributes or self._attributes[attribute_name] is None:
-                if isinstance(type_instance, Array):
+            kind = kinds[attribute_name]
+            value = attributes.get(attribute_name)
+
+            # only visible deferred attributes are computed
+            if value is None and self._deferred is not None and attribute_name in self._deferred:
+                self._resolve_deferred_attribute(attribute_name)
+                value = attributes.get(attribute_name)
+
+            if value is None:
+                if kind == ModelSchema.ARRAY:
                     model_dictionary[serialized_attribute_name] = []
                 else:
                     model_dictionary[serialized_attribute_name] = None
                 continue
 
-            if isinstance(type_instance, DataCollection):
-
-                sub_attribute_filter = None
-                if isinstance(attribute_filter, (AttributeFilter, AttributeFilterImmutable)) and attribute_name in attribute_filter:
-                    sub_attribute_filter = getattr(attribute_filter, attribute_name)
-
-                model_dictionary[serialized_attribute_name] = self._attributes[attribute_name].as_serializable(sub_attribute_filter, minified)
+            if kind >= ModelSchema.DATA_COLLECTION:
+                model_dictionary[serialized_attribute_name] = value.as_serializable(
+                    sub_attribute_filters[index] if is_filtered else None,
+                    minified
+                )
 
-            elif isinstance(type_instance, DataStructure):
-                python_value = self._attributes[attribute_name]
-                serializable_value = type_instance.as_serializable(python_value)
-                model_dictionary[serialized_attribute_name] = serializable_value
+            elif kind == ModelSchema.DATA_STRUCTURE:
+                model_dictionary[serialized_attribute_name] = type_instance.as_serializable(value)
 
-            elif isinstance(type_instance, DataType):
-                model_dictionary[serialized_attribute_name] = self._attributes[attribute_name]
+            elif kind == ModelSchema.DATA_TYPE:
+                model_dictionary[serialized_attribute_name] = value
 
         return model_dictionary
@@ -0,0 +1,412 @@
+# -*- coding: utf-8 -*-
+#
+#  prestans, A WSGI compliant REST micro-framework
+#  http://prestans.org
+#
+#  Copyright (c) 2017, Anomaly Software Pty Ltd.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#      * Redistributions of source code must retain the above copyright
+#        notice, this list of conditions and the following disclaimer.
+#      * Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#      * Neither the name of Anomaly Software nor the
+#        names of its contributors may be used to endorse or promote products
+#        derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+#  ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+#  WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL ANOMALY SOFTWARE BE LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#  (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+#  LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+#  ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#  (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+import inspect
+import weakref
+
+from prestans.types import Array
+from prestans.types import DataCollection
+from prestans.types import DataStructure
+from prestans.types import DataType
+from prestans.util import frozen_dict
+
+
+class AttributeRecord(list):
+    """
+    Compact storage for the attribute values of a Model instance
+
+    Values are kept in a list in the field order of the schema, subclasses are
+    generated per Model class and carry the name to position index. Implements the
+    parts of the dict interface Model uses for its attributes.
+    """
+
+    __slots__ = ()
+
+    #: map of field name to position, set on generated subclasses
+    _index = {}
+
+    @classmethod
+    def from_dict(cls, attributes):
+        """
+        :param attributes: map of field name to value, missing fields are None
+        :type attributes: dict
+        :rtype: AttributeRecord
+        """
+        record = cls([None] * len(cls._index))
+
+        for key, value in iter(attributes.items()):
+            record[key] = value
+
+        return record
+
+    def get(self, key, default=None):
+        position = self._index.get(key)
+
+        if position is None:
+            return default
+
+        return list.__getitem__(self, position)
+
+    def __getitem__(self, key):
+        return list.__getitem__(self, self._index[key])
+
+    def __setitem__(self, key, value):
+        list.__setitem__(self, self._index[key], value)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def keys(self):
+        return list(self._index.keys())
+
+    def items(self):
+        return [(key, list.__getitem__(self, position)) for key, position in iter(self._index.items())]
+
+
+class ModelSchema(object):
+    """
+    Compiled, per class description of a Model's attributes
+
+    Inspecting a Model class is expensive; ModelSchema does it once per class and
+    keeps the ordered list of attributes, what kind of prestans type each one is
+    and the minification rewrite maps. Rewrite maps are only compiled the first
+    time minification is used.
+
+    Models that opt in with __compiled__ = True also keep their generated
+    serializers and validators here, so they are discarded along with the schema,
+    as do Models that opt in to compact storage with __compact__ = True.
+
+    Schemas are cached on the class itself. Assigning or deleting attributes on any
+    Model class bumps a generation counter which invalidates every cached schema,
+    subclasses inherit attributes so a change to one class may affect others.
+    """
+
+    #: kinds of members
+    OTHER = 0
+    DATA_TYPE = 1
+    DATA_STRUCTURE = 2
+    DATA_COLLECTION = 3
+    ARRAY = 4
+
+    _CACHE_KEY = "__prestans_schema__"
+    #: request filters are client supplied, bound the number of validators kept
+    _MAX_VALIDATORS = 256
+    _generation = 0
+
+    @classmethod
+    def for_class(cls, model_class):
+        """
+        :param model_class: subclass of prestans.types.Model
+        :return: the cached schema for model_class, compiled if required
+        :rtype: ModelSchema
+        """
+        schema = model_class.__dict__.get(cls._CACHE_KEY)
+
+        if schema is None or schema.generation != cls._generation:
+            schema = cls(model_class)
+            # bypass the metaclass so caching doesn't invalidate itself
+            type.__setattr__(model_class, cls._CACHE_KEY, schema)
+
+        return schema
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Invalidates all compiled schemas
+        """
+        cls._generation += 1
+
+    @classmethod
+    def kind_of(cls, type_instance):
+        """
+        :return: the kind of member type_instance is
+        :rtype: int
+        """
+        if isinstance(type_instance, Array):
+            return cls.ARRAY
+        elif isinstance(type_instance, DataCollection):
+            return cls.DATA_COLLECTION
+        elif isinstance(type_instance, DataStructure):
+            return cls.DATA_STRUCTURE
+        elif isinstance(type_instance, DataType):
+            return cls.DATA_TYPE
+
+        return cls.OTHER
+
+    def __init__(self, model_class):
+
+        self._model_class = model_class
+        self._generation = ModelSchema._generation
+
+        self._members = tuple(
+            (name, value) for name, value in inspect.getmembers(model_class)
+            if not name.startswith("__") and not inspect.isfunction(value) and not inspect.ismethod(value) and
+            not inspect.ismemberdescriptor(value)
+        )
+
+        self._kinds = dict((name, self.kind_of(value)) for name, value in self._members)
+        self._fields = tuple(name for name, value in self._members if self._kinds[name] != self.OTHER)
+        self._templates = dict((name, value) for name, value in self._members if self._kinds[name] != self.OTHER)
+        self._collections = tuple(name for name in self._fields if self._kinds[name] >= self.DATA_COLLECTION)
+
+        self._member_index = None
+
+        self._token_rewrite_map = None
+        self._rewrite_map = None
+        self._rewrite_reverse_map = None
+
+        self._record_class = None
+
+        # unfiltered serializers by minified, filtered ones weakly by filter
+        self._serializers = dict()
+        self._filtered_serializers = weakref.WeakKeyDictionary()
+        # validators by compiled filter and minified
+        self._validators = dict()
+
+    @property
+    def model_class(self):
+        return self._model_class
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def is_current(self):
+        """
+        :return: False once schemas have been invalidated since this one was compiled
+        :rtype: bool
+        """
+        return self._generation == ModelSchema._generation
+
+    @property
+    def members(self):
+        """
+        :return: all members, sorted by name, as name, value tuples
+        :rtype: tuple
+        """
+        return self._members
+
+    @property
+    def member_index(self):
+        """
+        :return: read only map of member name to its position in members
+        :rtype: dict
+        """
+        if self._member_index is None:
+            self._member_index = frozen_dict(dict((name, position) for position, (name, _) in enumerate(self._members)))
+
+        return self._member_index
+
+    @property
+    def fields(self):
+        """
+        :return: names of all prestans type attributes, sorted by name
+        :rtype: tuple
+        """
+        return self._fields
+
+    @property
+    def collections(self):
+        """
+        :return: names of all Model and Array attributes, sorted by name
+        :rtype: tuple
+        """
+        return self._collections
+
+    @property
+    def templates(self):
+        """
+        :return: map of attribute name to its type template
+        :rtype: dict
+        """
+        return self._templates
+
+    @property
+    def kinds(self):
+        """
+        :return: map of member name to its kind
+        :rtype: dict
+        """
+        return self._kinds
+
+    @property
+    def record_class(self):
+        """
+        :return: AttributeRecord subclass holding the fields of this schema
+        :rtype: type
+        """
+        if self._record_class is None:
+            index = frozen_dict(dict((name, position) for position, name in enumerate(self._fields)))
+            self._record_class = type(
+                "%sRecord" % self._model_class.__name__, (AttributeRecord,), {"__slots__": (), "_index": index}
+            )
+
+        return self._record_class
+
+    def new_attributes(self):
+        """
+        :return: empty attribute storage for an instance of the model class
+        :rtype: dict | AttributeRecord
+        """
+        if self._model_class.__compact__:
+            return self.record_class([None] * len(self._fields))
+
+        return dict()
+
+    @property
+    def attribute_count(self):
+        return len(self._fields)
+
+    @property
+    def attribute_tokens(self):
+        """
+        :return: unique tokens of all attribute names, sorted alphabetically
+        :rtype: list
+        """
+        rewrite_tokens = set()
+
+        for attribute_name in self._fields:
+            rewrite_tokens.update(attribute_name.split('_'))
+
+        return sorted(rewrite_tokens)
+
+    @property
+    def token_rewrite_map(self):
+        """
+        :return: read only map of attribute name token to minified token
+        :rtype: dict
+        """
+        if self._token_rewrite_map is None:
+            self._compile_rewrite_maps()
+
+        return self._token_rewrite_map
+
+    @property
+    def rewrite_map(self):
+        """
+        :return: read only map of attribute name to minified name
+        :rtype: dict
+        """
+        if self._rewrite_map is None:
+            self._compile_rewrite_maps()
+
+        return self._rewrite_map
+
+    @property
+    def rewrite_reverse_map(self):
+        """
+        :return: read only map of minified name to attribute name
+        :rtype: dict
+        """
+        if self._rewrite_reverse_map is None:
+            self._compile_rewrite_maps()
+
+        return self._rewrite_reverse_map
+
+    def serializer(self, attribute_filter=None, minified=False):
+        """
+        :param attribute_filter: filter applied to the output
+        :type attribute_filter: prestans.parser.AttributeFilter | prestans.parser.AttributeFilterImmutable |
+            prestans.parser.CompiledAttributeFilter | None
+        :param minified: whether or not to use minified attribute names
+        :type minified: bool
+        :return: compiled serializer for attribute_filter and minified
+        :rtype: function
+        """
+        if attribute_filter is not None:
+            from prestans.parser import compile_attribute_filter
+            attribute_filter = compile_attribute_filter(self._model_class, attribute_filter)
+
+        minified = minified is True
+
+        if attribute_filter is None:
+            serializers = self._serializers
+        else:
+            serializers = self._filtered_serializers.get(attribute_filter)
+            if serializers is None:
+                serializers = dict()
+                self._filtered_serializers[attribute_filter] = serializers
+
+        serializer = serializers.get(minified)
+
+        if serializer is None:
+            from prestans.types.compiler import compile_serializer
+            serializer = compile_serializer(self, attribute_filter, minified)
+            serializers[minified] = serializer
+
+        return serializer
+
+    def validator(self, attribute_filter=None, minified=False):
+        """
+        :param attribute_filter: filter the input is validated against
+        :type attribute_filter: prestans.parser.AttributeFilter | prestans.parser.AttributeFilterImmutable |
+            prestans.parser.CompiledAttributeFilter | None
+        :param minified: whether or not the input uses minified attribute names
+        :type minified: bool
+        :return: compiled validator for attribute_filter and minified
+        :rtype: function
+        """
+        if attribute_filter is not None:
+            from prestans.parser import compile_attribute_filter
+            attribute_filter = compile_attribute_filter(self._model_class, attribute_filter, validation=True)
+
+        key = (attribute_filter, minified is True)
+        validator = self._validators.get(key)
+
+        if validator is None:
+            from prestans.types.compiler import compile_validator
+            validator = compile_validator(self, attribute_filter, minified is True)
+
+            if len(self._validators) >= self._MAX_VALIDATORS:
+                self._validators.clear()
+            self._validators[key] = validator
+
+        return validator
+
+    def _compile_rewrite_maps(self):
+
+        rewrite_tokens = self.attribute_tokens
+        minified_tokens = self._model_class.generate_minified_keys(len(rewrite_tokens))
+        token_rewrite_map = dict(zip(rewrite_tokens, minified_tokens))
+
+        rewrite_map = dict()
+        rewrite_reverse_map = dict()
+
+        for attribute_name in self._fields:
+            rewritten_attribute_name = '_'.join(token_rewrite_map[token] for token in attribute_name.split('_'))
+
+            rewrite_map[attribute_name] = rewritten_attribute_name
+            rewrite_reverse_map[rewritten_attribute_name] = attribute_name
+
+        # shared by every instance of the class, must not be modified
+        self._token_rewrite_map = frozen_dict(token_rewrite_map)
+        self._rewrite_map = frozen_dict(rewrite_map)
+        self._rewrite_reverse_map = frozen_dict(rewrite_reverse_map)
@@ -32,10 +32,12 @@
 import re
 
 from prestans import exception
-from prestans.types import DataType
+from prestans.types.base import ScalarType
+from prestans.types.base import choices_lookup
+from prestans.util import string_types
 
 
-class String(DataType):
+class String(ScalarType):
 
     def __init__(self, default=None, min_length=None, max_length=None,
                  required=True, format=None, choices=None, utf_encoding='utf-8',
@@ -116,50 +118,56 @@ class String(DataType):
 
         return blueprint
 
-    def validate(self, value):
+    def _compile_validator(self):
 
-        _validated_value = None
+        required = self._required
+        default = self._default
+        min_length = self._min_length
+        max_length = self._max_length
+        choices = self._choices
+        choices_set = choices_lookup(choices)
+        search = re.compile(self._format).search if self._format is not None else None
+        trim = self._trim
 
-        if self._required and self._default is None and value is None:
-            raise exception.RequiredAttributeError()
-        elif self._required and value is None:
-            value = self._default
-        elif not self._required and self._default is None and value is None:
-            return _validated_value
-        elif not self._required and value is None:
-            value = self._default
+        def validate(value):
 
-        try:
-            from prestans.util import string_types
+            if value is None:
+                if default is None:
+                    if required:
+                        raise exception.RequiredAttributeError()
+                    return None
+                value = default
 
             if isinstance(value, string_types):
                 _validated_value = value
             else:
-                _validated_value = str(value)
-        except Exception as exp:
-            raise exception.ParseFailedError("unicode or string encoding failed, %s" % exp)
+                try:
+                    _validated_value = str(value)
+                except Exception as exp:
+                    raise exception.ParseFailedError("unicode or string encoding failed, %s" % exp)
 
-        if self._trim:
-            _validated_value = _validated_value.strip()
+            if trim:
+                _validated_value = _validated_value.strip()
 
-        # check for required and empty string
-        if self._required and len(_validated_value) == 0:
-            raise exception.RequiredAttributeError()
+            length = len(_validated_value)
 
-        if not self._required and len(_validated_value) == 0:
-            return _validated_value
+            # check for required and empty string
+            if length == 0:
+                if required:
+                    raise exception.RequiredAttributeError()
+                return _validated_value
 
-        if _validated_value is not None and self._min_length is not None and \
-                len(_validated_value) < self._min_length:
-            raise exception.MinimumLengthError(value, self._min_length)
-        if _validated_value is not None and self._max_length is not None and \
-                len(_validated_value) > self._max_length:
-            raise exception.MaximumLengthError(value, self._max_length)
+            if min_length is not None and length < min_length:
+                raise exception.MinimumLengthError(value, min_length)
+            if max_length is not None and length > max_length:
+                raise exception.MaximumLengthError(value, max_length)
 
-        if self._choices is not None and not _validated_value in self._choices:
-            raise exception.InvalidChoiceError(value, self._choices)
+            if choices_set is not None and _validated_value not in choices_set:
+                raise exception.InvalidChoiceError(value, choices)
 
-        if self._format is not None and re.search(self._format, _validated_value) is None:
-            raise exception.InvalidFormatError(_validated_value)
+            if search is not None and search(_validated_value) is None:
+                raise exception.InvalidFormatError(_validated_value)
+
+            return _validated_value
 
-        return _validated_value
+        return validate
@@ -34,6 +34,9 @@ from datetime import time
 
 from prestans import exception
 from prestans.types import DataStructure
+from prestans.types.date_format import TIME_FIELDS
+from prestans.types.date_format import compile_date_format
+from prestans.util import string_types
 
 
 class Time(DataStructure):
@@ -54,6 +57,7 @@ class Time(DataStructure):
 
         self._required = required
         self._format = format
+        self._date_format = compile_date_format(format, TIME_FIELDS)
         self._description = description
 
     @property
@@ -91,8 +95,6 @@ class Time(DataStructure):
         return blueprint
 
     def validate(self, value):
-        from prestans.util import string_types
-
         _validated_value = None
 
         # no need to do any validation if None, not required and default provided
@@ -112,7 +114,7 @@ class Time(DataStructure):
             _validated_value = value
         elif isinstance(value, string_types):
             try:
-                _validated_value = datetime.strptime(value, self._format).time()
+                _validated_value = self._parse(value)
             except ValueError as exp:
                 raise exception.ParseFailedError("time parsing failed %s" % exp)
         else:
@@ -125,4 +127,20 @@ class Time(DataStructure):
         if not type(value) == time:
             raise exception.InvalidTypeError(value, 'datetime.time')
 
+        if self._date_format is not None:
+            return self._date_format.format_value(value)
+
         return value.strftime(self._format)
+
+    def _parse(self, value):
+
+        if self._date_format is not None:
+            arguments = self._date_format.parse(value)
+            if arguments is not None:
+                try:
+                    return time(*arguments[3:])
+                except ValueError:
+                    # out of range fields are reported by strptime
+                    pass
+
+        return datetime.strptime(value, self._format).time()
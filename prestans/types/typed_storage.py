@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+#
+#  prestans, A WSGI compliant REST micro-framework
+#  http://prestans.org
+#
+#  Copyright (c) 2017, Anomaly Software Pty Ltd.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#      * Redistributions of source code must retain the above copyright
+#        notice, this list of conditions and the following disclaimer.
+#      * Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#      * Neither the name of Anomaly Software nor the
+#        names of its contributors may be used to endorse or promote products
+#        derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+#  ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+#  WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL ANOMALY SOFTWARE BE LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#  (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+#  LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+#  ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#  (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+"""
+Contiguous storage for Arrays of Integer, Float and Boolean elements
+
+Elements are held in an array.array, or in a buffer wrapped without copying: a
+memoryview or, when NumPy is installed, a one dimensional ndarray. Wrapped buffers
+are read only as far as the Array is concerned, the first write copies them into an
+array.array. Constraints of the element template are checked over the whole buffer
+at once, NumPy arrays with vectorized operations.
+"""
+from __future__ import absolute_import
+
+import array
+
+from prestans import exception
+from prestans.types import Boolean
+from prestans.types import Float
+from prestans.types import Integer
+from prestans.types.base import choices_lookup
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#: elements are read out in chunks of this size when iterating a buffer
+CHUNK_SIZE = 4096
+
+#: Python type of the elements of each typecode
+_ELEMENT_TYPES = {"q": int, "d": float, "B": bool}
+
+#: NumPy dtype of each typecode, booleans are stored a byte each in an array.array
+_NUMPY_DTYPES = {"q": "int64", "d": "float64", "B": "bool"}
+
+
+def typecode_for(element_template):
+    """
+    :return: the array.array typecode for elements of element_template, None if it is
+    not an Integer, Float or Boolean
+    :rtype: str | None
+    """
+
+    if isinstance(element_template, Boolean):
+        return "B"
+    elif isinstance(element_template, Integer):
+        return "q"
+    elif isinstance(element_template, Float):
+        return "d"
+
+    return None
+
+
+def new_storage(typecode, elements=None):
+    """
+    :param elements: array.array, memoryview or ndarray to copy, or an iterable of elements
+    :return: growable storage holding a copy of elements
+    :rtype: array.array
+    """
+
+    storage = array.array(typecode)
+
+    if elements is None:
+        return storage
+
+    if isinstance(elements, array.array) and elements.typecode == typecode:
+        return elements[:]
+
+    if isinstance(elements, memoryview) or (numpy is not None and isinstance(elements, numpy.ndarray)):
+        storage.frombytes(elements.tobytes())
+        return storage
+
+    try:
+        storage.extend(elements)
+    except OverflowError as exp:
+        raise exception.ParseFailedError("value does not fit typed array storage, %s" % exp)
+
+    return storage
+
+
+def is_growable(storage):
+    """
+    :return: whether or not elements can be added to storage in place
+    :rtype: bool
+    """
+    return isinstance(storage, array.array)
+
+
+def wrap_buffer(typecode, buffer):
+    """
+    :param buffer: array.array, one dimensional ndarray or object supporting the buffer protocol
+    :return: storage sharing the memory of buffer
+    :rtype: array.array | memoryview | numpy.ndarray
+    """
+
+    if isinstance(buffer, array.array):
+        if buffer.typecode != typecode:
+            raise TypeError("array typecode %s given, %s expected" % (buffer.typecode, typecode))
+        return buffer
+
+    if numpy is not None and isinstance(buffer, numpy.ndarray):
+        if buffer.ndim != 1 or buffer.dtype != numpy.dtype(_NUMPY_DTYPES[typecode]):
+            raise TypeError("ndarray of dtype %s and %i dimensions given, one dimension of %s expected" % (
+                buffer.dtype, buffer.ndim, _NUMPY_DTYPES[typecode]
+            ))
+        return buffer
+
+    view = memoryview(buffer)
+
+    if view.format == typecode and view.ndim == 1:
+        return view
+
+    # raises TypeError unless the buffer is contiguous and a whole number of elements long
+    return view.cast("B").cast(typecode)
+
+
+def validate_storage(element_template, storage):
+    """
+    Checks every element of storage against the constraints of element_template at once
+
+    :raises: LessThanMinimumError, MoreThanMaximumError or InvalidChoiceError for the
+    first offending element found
+    """
+
+    if isinstance(element_template, Boolean) or len(storage) == 0:
+        return
+
+    minimum = element_template.minimum
+    maximum = element_template.maximum
+    choices = element_template.choices
+
+    if numpy is not None and isinstance(storage, numpy.ndarray):
+
+        if minimum is not None and (storage < minimum).any():
+            raise exception.LessThanMinimumError(storage[storage < minimum][0].item(), minimum)
+
+        if maximum is not None and (storage > maximum).any():
+            raise exception.MoreThanMaximumError(storage[storage > maximum][0].item(), maximum)
+
+        if choices is not None:
+            rejected = numpy.isin(storage, list(choices), invert=True)
+            if rejected.any():
+                raise exception.InvalidChoiceError(storage[rejected][0].item(), choices)
+
+        return
+
+    if minimum is not None:
+        lowest = _extreme(min, storage)
+        if lowest is not None and lowest < minimum:
+            raise exception.LessThanMinimumError(lowest, minimum)
+
+    if maximum is not None:
+        highest = _extreme(max, storage)
+        if highest is not None and highest > maximum:
+            raise exception.MoreThanMaximumError(highest, maximum)
+
+    if choices is not None:
+        choices_set = choices_lookup(choices)
+
+        if not isinstance(choices_set, frozenset) or not choices_set.issuperset(storage):
+            for element in storage:
+                if element not in choices_set:
+                    raise exception.InvalidChoiceError(element, choices)
+
+
+def _extreme(function, storage):
+    """
+    :param function: min or max
+    :return: the smallest or largest element of storage, ignoring NaN
+    """
+
+    extreme = function(storage)
+
+    # NaN compares false with everything, it is only returned when it comes first
+    if extreme != extreme:
+        numbers = [element for element in storage if element == element]
+        extreme = function(numbers) if numbers else None
+
+    return extreme
+
+
+def validate_elements(element_template, typecode, values, element_validator):
+    """
+    :param values: input elements
+    :type values: list | tuple
+    :param element_validator: validates a single element, used when values need converting
+    :type element_validator: function
+    :return: values as validated storage
+    :rtype: array.array
+    """
+
+    storage = None
+
+    # booleans have to be checked to be bool, anything else is converted
+    if typecode != "B":
+        try:
+            storage = array.array(typecode, values)
+        except (TypeError, OverflowError):
+            pass
+
+    if storage is None:
+        elements = [element_validator(value) for value in values]
+
+        if None in elements:
+            raise exception.RequiredAttributeError()
+
+        return new_storage(typecode, elements)
+
+    validate_storage(element_template, storage)
+    return storage
+
+
+def element(storage, typecode, index):
+    """
+    :return: the element or slice of storage at index as Python objects
+    """
+
+    value = storage[index]
+
+    if isinstance(index, slice):
+        return to_list(value, typecode)
+
+    return _ELEMENT_TYPES[typecode](value)
+
+
+def to_list(storage, typecode):
+    """
+    :return: the elements of storage as a list of int, float or bool
+    :rtype: list
+    """
+
+    elements = storage.tolist()
+
+    if typecode == "B":
+        return [bool(value) for value in elements]
+
+    return elements
+
+
+def iter_elements(storage, typecode):
+    """
+    Generates the elements of storage as int, float or bool a chunk at a time
+    """
+
+    for start in range(0, len(storage), CHUNK_SIZE):
+        for value in to_list(storage[start:start + CHUNK_SIZE], typecode):
+            yield value
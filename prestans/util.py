@@ -1,3 +1,5 @@
+from __future__ import absolute_import
+
 import sys
 
 if sys.version_info < (3,):
@@ -10,3 +12,43 @@ if sys.version_info < (3,):
     string_types = (str, unicode)
 else:
     string_types = (str,)
+
+
+try:
+    from types import MappingProxyType as frozen_dict
+except ImportError:
+    class frozen_dict(dict):
+        """
+        Read only dictionary for python 2, where MappingProxyType is not available
+        """
+
+        def _immutable(self, *args, **kwargs):
+            raise TypeError("'%s' object does not support item assignment" % self.__class__.__name__)
+
+        __setitem__ = _immutable
+        __delitem__ = _immutable
+        clear = _immutable
+        pop = _immutable
+        popitem = _immutable
+        setdefault = _immutable
+        update = _immutable
+
+
+def with_metaclass(meta, *bases):
+    """
+    Creates a base class with a metaclass, works with both python 2 and 3
+
+    Borrowed from six, the temporary class replaces itself with the actual
+    class so it never appears in the method resolution order.
+    """
+
+    class metaclass(type):
+
+        def __new__(cls, name, this_bases, d):
+            return meta(name, bases, d)
+
+        @classmethod
+        def __prepare__(cls, name, this_bases):
+            return meta.__prepare__(name, bases)
+
+    return type.__new__(metaclass, 'temporary_class', (), {})
@@ -88,6 +88,7 @@ setup(
         'pytest-cov',
         'pytest-runner',
         'mock',
+        'sqlalchemy',
         'tox',
         'tox-pyenv',
         'webtest'
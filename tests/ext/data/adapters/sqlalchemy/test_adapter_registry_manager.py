@@ -131,3 +131,24 @@ class AdapterRegistryManagerTest(unittest.TestCase):
         # check they have been cleared
         self.assertRaises(TypeError, registry_manager.get_adapter_for_rest_model, RESTModelA())
         self.assertRaises(TypeError, registry_manager.get_adapter_for_persistent_model, PersistentModelA())
+
+    def test_register_batch_loader(self):
+
+        class Loader(adapters.BatchLoader):
+            pass
+
+        loader = Loader()
+        registry_manager = adapters.AdapterRegistryManager()
+        self.assertIsNone(registry_manager.get_batch_loader(RESTModelA))
+
+        generation = registry_manager.generation
+        registry_manager.register_batch_loader(RESTModelA, loader)
+        self.assertGreater(registry_manager.generation, generation)
+        self.assertIs(registry_manager.get_batch_loader(RESTModelA), loader)
+        self.assertIs(registry_manager.get_batch_loader(RESTModelA()), loader)
+        self.assertIsNone(registry_manager.get_batch_loader(RESTModelB))
+
+        self.assertRaises(TypeError, registry_manager.register_batch_loader, RESTModelB, object())
+
+        registry_manager.clear_registered_adapters()
+        self.assertIsNone(registry_manager.get_batch_loader(RESTModelA))
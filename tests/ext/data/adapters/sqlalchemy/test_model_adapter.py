@@ -1,3 +1,4 @@
+import datetime
 import unittest
 
 from prestans import exception
@@ -231,3 +232,522 @@ class ModelAdapterUnitTest(unittest.TestCase):
         person.short_string = "a longer string"
 
         self.assertRaises(exception.InconsistentPersistentDataError, model_adapter.adapt_persistent_to_rest, person)
+
+
+class AdaptationPlanUnitTest(unittest.TestCase):
+
+    def setUp(self):
+        adapters.registry.register_persistent_rest_pair(Address, AddressREST)
+        self.model_adapter = adapters.ModelAdapter(rest_model_class=PersonREST, persistent_model_class=Person)
+
+    def tearDown(self):
+        adapters.registry.clear_registered_adapters()
+
+    def test_plan_cached_per_class_and_filter(self):
+        plan = self.model_adapter.adaptation_plan(Person)
+        self.assertIs(self.model_adapter.adaptation_plan(Person), plan)
+        self.assertIsNot(self.model_adapter.adaptation_plan(PersonWithAddress), plan)
+
+        attribute_filter = parser.AttributeFilter.from_model(PersonREST(), default_value=False)
+        attribute_filter.last_name = True
+        filtered_plan = self.model_adapter.adaptation_plan(Person, attribute_filter)
+        self.assertIsNot(filtered_plan, plan)
+
+        # equal filters share a plan
+        equal_filter = parser.AttributeFilter.from_model(PersonREST(), default_value=False)
+        equal_filter.last_name = True
+        self.assertIs(self.model_adapter.adaptation_plan(Person, equal_filter), filtered_plan)
+        self.assertIs(self.model_adapter.adaptation_plan(Person, equal_filter.as_immutable()), filtered_plan)
+
+    def test_plan_rebuilt_when_registry_changes(self):
+        plan = self.model_adapter.adaptation_plan(Person)
+        self.assertTrue(plan.is_current())
+
+        adapters.registry.register_persistent_rest_pair(Person, PersonREST)
+        self.assertFalse(plan.is_current())
+        self.assertIsNot(self.model_adapter.adaptation_plan(Person), plan)
+
+    def test_methods_ignored(self):
+
+        class PersonWithMethod(Person):
+            def short_string(self):
+                return "method"
+
+        person_rest = self.model_adapter.adapt_persistent_to_rest(PersonWithMethod())
+        self.assertEqual(person_rest.first_name, "first_name")
+        self.assertIsNone(person_rest.short_string)
+
+    def test_defaults_created_per_object(self):
+
+        class Event(object):
+            pass
+
+        class EventREST(types.Model):
+            name = types.String(default="event")
+            created = types.DateTime(default=types.DateTime.NOW)
+
+        model_adapter = adapters.ModelAdapter(rest_model_class=EventREST, persistent_model_class=Event)
+
+        first = model_adapter.adapt_persistent_to_rest(Event())
+        second = model_adapter.adapt_persistent_to_rest(Event())
+        self.assertEqual(first.name, "event")
+        self.assertIsNotNone(first.created)
+        self.assertLessEqual(first.created, second.created)
+
+    def test_nested_adapter_override(self):
+
+        class UpperCaseAdapter(adapters.ModelAdapter):
+            def adapt_persistent_to_rest(self, persistent_object, attribute_filter=None):
+                address = super(UpperCaseAdapter, self).adapt_persistent_to_rest(persistent_object, attribute_filter)
+                address.street = address.street.upper()
+                return address
+
+        adapters.registry.register_adapter(UpperCaseAdapter(rest_model_class=AddressREST, persistent_model_class=Address))
+
+        person_rest = self.model_adapter.adapt_persistent_to_rest(PersonWithAddress())
+        self.assertEqual(person_rest.address.street, "STREET")
+
+    def test_compact_rest_model(self):
+
+        class CompactPersonREST(types.Model):
+            __compact__ = True
+
+            first_name = types.String()
+            last_name = types.String(required=False)
+            address = AddressREST(required=False)
+
+        model_adapter = adapters.ModelAdapter(rest_model_class=CompactPersonREST, persistent_model_class=Person)
+
+        person_rest = model_adapter.adapt_persistent_to_rest(PersonWithAddress())
+        self.assertEqual(person_rest.as_serializable(), {
+            "first_name": "first_name",
+            "last_name": "last_name",
+            "address": {"street": "street", "short_string": None}
+        })
+
+
+class AdaptPartiallyVisibleNestedFilterUnitTest(unittest.TestCase):
+
+    def tearDown(self):
+        adapters.registry.clear_registered_adapters()
+
+    def test_nested_model_adapted(self):
+
+        class Tag(object):
+            label = "label"
+            code = "code"
+
+        class Addr(object):
+            street = "street"
+            tags = [Tag()]
+
+        class Owner(object):
+            name = "name"
+            addr = Addr()
+
+        class TagREST(types.Model):
+            label = types.String()
+            code = types.String()
+
+        class AddrREST(types.Model):
+            street = types.String()
+            tags = types.Array(element_template=TagREST())
+
+        class OwnerREST(types.Model):
+            name = types.String()
+            addr = AddrREST(required=False)
+
+        adapters.registry.register_persistent_rest_pair(Tag, TagREST)
+        adapters.registry.register_persistent_rest_pair(Addr, AddrREST)
+        adapters.registry.register_persistent_rest_pair(Owner, OwnerREST)
+
+        # addr is only visible through an attribute of a sub filter of its sub filter
+        attribute_filter = parser.AttributeFilter.from_model(OwnerREST(), False, name=True)
+        attribute_filter.addr.tags.label = True
+
+        adapted = adapters.adapt_persistent_instance(Owner(), OwnerREST, attribute_filter)
+        self.assertEqual(adapted.addr.tags[0].label, "label")
+        self.assertIsNone(adapted.addr.street)
+        self.assertEqual(
+            adapted.as_serializable(attribute_filter),
+            {"name": "name", "addr": {"tags": [{"label": "label"}]}}
+        )
+
+
+class AdaptMissingNestedModelUnitTest(unittest.TestCase):
+
+    def setUp(self):
+
+        class StrictPersonREST(types.Model):
+            first_name = types.String()
+            address = AddressREST()
+
+        self.StrictPersonREST = StrictPersonREST
+
+        adapters.registry.register_persistent_rest_pair(Address, AddressREST)
+        adapters.registry.register_persistent_rest_pair(Person, StrictPersonREST)
+        adapters.registry.register_persistent_rest_pair(PersonWithAddress, StrictPersonREST)
+
+        self.person_without_address = PersonWithAddress()
+        self.person_without_address.address = None
+
+    def tearDown(self):
+        adapters.registry.clear_registered_adapters()
+
+    def test_adapt_persistent_to_rest(self):
+        model_adapter = adapters.ModelAdapter(self.StrictPersonREST, PersonWithAddress)
+
+        for persistent_object in [Person(), self.person_without_address]:
+            self.assertRaises(exception.ValidationError, model_adapter.adapt_persistent_to_rest, persistent_object)
+
+    def test_adapt_persistent_collection(self):
+        for persistent_object in [Person(), self.person_without_address]:
+            self.assertRaises(
+                exception.ValidationError,
+                adapters.adapt_persistent_collection,
+                [persistent_object],
+                self.StrictPersonREST
+            )
+
+            lazy = adapters.adapt_persistent_collection([persistent_object], self.StrictPersonREST, lazy=True)
+            self.assertRaises(exception.ValidationError, lazy.as_serializable)
+
+            projected = adapters.adapt_persistent_collection([persistent_object], self.StrictPersonREST, project=True)
+            self.assertRaises(exception.ValidationError, projected.as_serializable)
+
+    def test_inconsistent_nested_model(self):
+        person = PersonWithAddress()
+        person.address.short_string = "a longer string"
+
+        self.assertRaises(
+            exception.InconsistentPersistentDataError,
+            adapters.adapt_persistent_collection,
+            [person],
+            self.StrictPersonREST
+        )
+
+
+class BatchLoaderUnitTest(unittest.TestCase):
+
+    class Author(object):
+        def __init__(self, id, name):
+            self.id = id
+            self.name = name
+
+    class Book(object):
+        def __init__(self, title, author_id):
+            self.title = title
+            self.author_id = author_id
+
+    class RecordingLoader(adapters.BatchLoader):
+
+        def __init__(self, key_attribute, objects):
+            self.key_attribute = key_attribute
+            self.objects = objects
+            self.calls = []
+
+        def key(self, persistent_object, attribute_key):
+            return getattr(persistent_object, self.key_attribute)
+
+        def load(self, keys):
+            self.calls.append(keys)
+            return dict((key, self.objects[key]) for key in keys if key in self.objects)
+
+    def setUp(self):
+
+        class AuthorREST(types.Model):
+            name = types.String()
+
+        class BookREST(types.Model):
+            title = types.String()
+            author = AuthorREST(required=False)
+
+        class ShelfREST(types.Model):
+            name = types.String()
+            books = types.Array(element_template=BookREST())
+
+        class Shelf(object):
+            def __init__(self, id, name):
+                self.id = id
+                self.name = name
+
+        self.AuthorREST = AuthorREST
+        self.BookREST = BookREST
+        self.ShelfREST = ShelfREST
+        self.Shelf = Shelf
+
+        self.authors = {1: self.Author(1, "Austen"), 2: self.Author(2, "Bronte")}
+        self.books = {
+            "fiction": [self.Book("Emma", 1), self.Book("Jane Eyre", 2)],
+            "classics": [self.Book("Persuasion", 1)]
+        }
+
+        self.author_loader = self.RecordingLoader("author_id", self.authors)
+        self.book_loader = self.RecordingLoader("id", self.books)
+
+        adapters.registry.register_persistent_rest_pair(self.Author, AuthorREST)
+        adapters.registry.register_persistent_rest_pair(self.Book, BookREST)
+        adapters.registry.register_persistent_rest_pair(Shelf, ShelfREST)
+        adapters.registry.register_batch_loader(AuthorREST, self.author_loader)
+
+    def tearDown(self):
+        adapters.registry.clear_registered_adapters()
+
+    def test_model_attribute_loaded_once(self):
+        books = [self.Book("Emma", 1), self.Book("Jane Eyre", 2), self.Book("Persuasion", 1), self.Book("Anon", 3)]
+
+        adapted_books = adapters.adapt_persistent_collection(books, self.BookREST)
+        self.assertEqual(self.author_loader.calls, [[1, 2, 3]])
+        self.assertEqual(adapted_books[0].author.name, "Austen")
+        self.assertEqual(adapted_books[1].author.name, "Bronte")
+        self.assertEqual(adapted_books[2].author.name, "Austen")
+        self.assertIsNot(adapted_books[0].author, adapted_books[2].author)
+        self.assertIsNone(adapted_books[3].author.name)
+
+    def test_none_key_not_loaded(self):
+        adapted_books = adapters.adapt_persistent_collection([self.Book("Anon", None)], self.BookREST)
+        self.assertEqual(self.author_loader.calls, [])
+        self.assertIsNone(adapted_books[0].author.name)
+
+    def test_batch_size(self):
+        books = [self.Book("Emma", 1), self.Book("Jane Eyre", 2), self.Book("Persuasion", 1)]
+
+        adapted_books = adapters.adapt_persistent_collection(books, self.BookREST, batch_size=2)
+        self.assertEqual(self.author_loader.calls, [[1, 2], [1]])
+        self.assertEqual([book.author.name for book in adapted_books], ["Austen", "Bronte", "Austen"])
+
+    def test_lazy(self):
+        books = [self.Book("Emma", 1), self.Book("Jane Eyre", 2)]
+
+        adapted_books = adapters.adapt_persistent_collection(books, self.BookREST, lazy=True)
+        self.assertEqual(self.author_loader.calls, [])
+        self.assertEqual(
+            adapted_books.as_serializable(),
+            [{"title": "Emma", "author": {"name": "Austen"}}, {"title": "Jane Eyre", "author": {"name": "Bronte"}}]
+        )
+        self.assertEqual(self.author_loader.calls, [[1, 2]])
+
+    def test_array_attribute_and_nested_loaders(self):
+        adapters.registry.register_batch_loader(self.BookREST, self.book_loader)
+
+        shelves = [self.Shelf("fiction", "Fiction"), self.Shelf("classics", "Classics"), self.Shelf("empty", "Empty")]
+
+        adapted_shelves = adapters.adapt_persistent_collection(shelves, self.ShelfREST)
+        self.assertEqual(self.book_loader.calls, [["fiction", "classics", "empty"]])
+        # authors of the books of every shelf are loaded together
+        self.assertEqual(self.author_loader.calls, [[1, 2]])
+
+        self.assertEqual(adapted_shelves.as_serializable(), [
+            {"name": "Fiction", "books": [
+                {"title": "Emma", "author": {"name": "Austen"}},
+                {"title": "Jane Eyre", "author": {"name": "Bronte"}}
+            ]},
+            {"name": "Classics", "books": [{"title": "Persuasion", "author": {"name": "Austen"}}]},
+            {"name": "Empty", "books": []}
+        ])
+
+    def test_adapt_persistent_instance(self):
+        adapted_book = adapters.adapt_persistent_instance(self.Book("Emma", 1), self.BookREST)
+        self.assertEqual(self.author_loader.calls, [[1]])
+        self.assertEqual(adapted_book.author.name, "Austen")
+
+    def test_attribute_filter(self):
+        attribute_filter = parser.AttributeFilter.from_model(self.BookREST(), True)
+        attribute_filter.author = False
+
+        adapted_books = adapters.adapt_persistent_collection([self.Book("Emma", 1)], self.BookREST, attribute_filter)
+        self.assertEqual(self.author_loader.calls, [])
+        self.assertIsNone(adapted_books[0].author.name)
+
+    def test_required_model_missing(self):
+
+        class StrictBookREST(types.Model):
+            title = types.String()
+            author = self.AuthorREST()
+
+        adapters.registry.register_persistent_rest_pair(self.Book, StrictBookREST)
+
+        self.assertRaises(
+            exception.ValidationError,
+            adapters.adapt_persistent_collection,
+            [self.Book("Anon", 3)],
+            StrictBookREST
+        )
+
+
+class ProjectionPlanUnitTest(unittest.TestCase):
+
+    class Tag(object):
+        def __init__(self, name):
+            self.name = name
+
+    class Post(object):
+        def __init__(self, id, title, tags, author=None):
+            self.id = id
+            self.title = title
+            self.published = datetime.date(2017, 1, id + 1)
+            self.scores = [id, id * 2]
+            self.tags = tags
+            self.author = author
+
+        def summary(self):
+            return "method"
+
+    def setUp(self):
+
+        class TagREST(types.Model):
+            name = types.String()
+
+        class AuthorREST(types.Model):
+            name = types.String()
+
+        class PostREST(types.Model):
+            id = types.Integer()
+            title = types.String(max_length=10)
+            published = types.Date()
+            scores = types.Array(element_template=types.Integer())
+            tags = types.Array(element_template=TagREST())
+            author = AuthorREST(required=False)
+            summary = types.String(required=False, default="summary")
+            missing = types.String(required=False)
+
+        self.TagREST = TagREST
+        self.AuthorREST = AuthorREST
+        self.PostREST = PostREST
+
+        adapters.registry.register_persistent_rest_pair(self.Tag, TagREST)
+        adapters.registry.register_persistent_rest_pair(self.Tag, AuthorREST)
+        adapters.registry.register_persistent_rest_pair(self.Post, PostREST)
+
+        self.posts = [
+            self.Post(1, "first", [self.Tag("a"), self.Tag("b")], self.Tag("Jane")),
+            self.Post(2, "second", [])
+        ]
+
+    def tearDown(self):
+        adapters.registry.clear_registered_adapters()
+
+    def _assert_projection_matches(self, attribute_filter=None, minified=False):
+        adapted = adapters.adapt_persistent_collection(self.posts, self.PostREST, attribute_filter)
+        projected = adapters.adapt_persistent_collection(self.posts, self.PostREST, attribute_filter, project=True)
+
+        self.assertTrue(projected.lazy)
+        self.assertEqual(
+            projected.as_serializable(attribute_filter, minified),
+            adapted.as_serializable(attribute_filter, minified)
+        )
+
+    def test_matches_adapted(self):
+        self._assert_projection_matches()
+        self._assert_projection_matches(minified=True)
+
+        projected = adapters.adapt_persistent_collection(self.posts, self.PostREST, project=True)
+        self.assertEqual(projected.as_serializable()[0], {
+            "id": 1,
+            "title": "first",
+            "published": "2017-01-02",
+            "scores": [1, 2],
+            "tags": [{"name": "a"}, {"name": "b"}],
+            "author": {"name": "Jane"},
+            "summary": "summary",
+            "missing": None
+        })
+
+    def test_matches_adapted_filtered(self):
+        attribute_filter = parser.AttributeFilter.from_model(self.PostREST(), True)
+        attribute_filter.published = False
+        attribute_filter.tags = False
+        attribute_filter.author.name = False
+
+        self._assert_projection_matches(attribute_filter)
+        self._assert_projection_matches(attribute_filter, minified=True)
+
+    def test_serialization_filter_wider_than_adapted(self):
+        attribute_filter = parser.AttributeFilter.from_model(self.PostREST(), True)
+        attribute_filter.title = False
+
+        adapted = adapters.adapt_persistent_collection(self.posts, self.PostREST, attribute_filter)
+        projected = adapters.adapt_persistent_collection(self.posts, self.PostREST, attribute_filter, project=True)
+        self.assertEqual(projected.as_serializable(), adapted.as_serializable())
+        self.assertIsNone(adapted.as_serializable()[0]["title"])
+
+    def test_streams(self):
+        projected = adapters.adapt_persistent_collection(
+            iter(self.posts), self.PostREST, project=True, lazy=True, batch_size=1
+        )
+
+        serialized = projected.iter_serializable()
+        self.assertEqual(next(serialized)["id"], 1)
+        self.assertEqual(next(serialized)["id"], 2)
+        self.assertEqual(list(serialized), [])
+        self.assertEqual(len(projected), 0)
+
+    def test_used_as_array(self):
+        projected = adapters.adapt_persistent_collection(self.posts, self.PostREST, project=True)
+        self.assertEqual(len(projected), 2)
+        self.assertIsInstance(projected[0], self.PostREST)
+        self.assertEqual(projected[1].title, "second")
+        self.assertEqual(projected.as_serializable()[1]["title"], "second")
+
+    def test_validates(self):
+        self.posts[1].title = "a title that is too long"
+
+        projected = adapters.adapt_persistent_collection(self.posts, self.PostREST, project=True)
+        self.assertRaises(exception.InconsistentPersistentDataError, projected.as_serializable)
+
+    def test_trusted(self):
+        self.posts[1].title = "a title that is too long"
+        self.posts[1].scores = (3, 4)
+
+        projected = adapters.adapt_persistent_collection(self.posts, self.PostREST, project=True, trusted=True)
+        serializable = projected.as_serializable()
+        self.assertEqual(serializable[1]["title"], "a title that is too long")
+        self.assertEqual(serializable[1]["scores"], [3, 4])
+        self.assertEqual(serializable[0]["published"], "2017-01-02")
+
+    def test_overridden_adapter(self):
+
+        class TagAdapter(adapters.ModelAdapter):
+
+            def adapt_persistent_to_rest(self, persistent_object, attribute_filter=None):
+                rest_model = super(TagAdapter, self).adapt_persistent_to_rest(persistent_object, attribute_filter)
+                rest_model.name = rest_model.name.upper()
+                return rest_model
+
+        adapters.registry.register_adapter(TagAdapter(self.TagREST, self.Tag))
+
+        self._assert_projection_matches()
+        projected = adapters.adapt_persistent_collection(self.posts, self.PostREST, project=True)
+        self.assertEqual(projected.as_serializable()[0]["tags"], [{"name": "A"}, {"name": "B"}])
+
+    def test_batch_loaded_attributes(self):
+
+        class AuthorLoader(adapters.BatchLoader):
+
+            calls = []
+
+            def key(self, persistent_object, attribute_key):
+                return persistent_object.id
+
+            def load(self, keys):
+                self.calls.append(keys)
+                return {1: ProjectionPlanUnitTest.Tag("Loaded")}
+
+        adapters.registry.register_batch_loader(self.AuthorREST, AuthorLoader())
+
+        self._assert_projection_matches()
+        projected = adapters.adapt_persistent_collection(self.posts, self.PostREST, project=True)
+        self.assertEqual(projected.as_serializable()[0]["author"], {"name": "Loaded"})
+        # once adapting, once for each projection
+        self.assertEqual(AuthorLoader.calls, [[1, 2], [1, 2], [1, 2]])
+
+    def test_projection_plan_cached(self):
+        adapter = adapters.registry.get_adapter_for_rest_model(self.PostREST)
+
+        plan = adapter.projection_plan(self.Post)
+        self.assertIs(adapter.projection_plan(self.Post), plan)
+        self.assertIsNot(adapter.projection_plan(self.Post, minified=True), plan)
+        self.assertIsNot(adapter.projection_plan(self.Post, trusted=True), plan)
+
+        adapters.registry.register_persistent_rest_pair(self.Tag, self.TagREST)
+        self.assertIsNot(adapter.projection_plan(self.Post), plan)
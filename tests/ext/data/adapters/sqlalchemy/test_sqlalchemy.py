@@ -1,5 +1,11 @@
 import unittest
 
+try:
+    import sqlalchemy as sa
+    from sqlalchemy import orm
+except ImportError:
+    sa = None
+
 from prestans.ext.data import adapters
 from prestans.ext.data.adapters import sqlalchemy
 from prestans.parser import AttributeFilter
@@ -219,5 +225,341 @@ class SQLAlchemyDataAdapterAdaptPersistentInstance(unittest.TestCase):
 
 class SQLAlchemyDataAdapterAdaptPersistentCollection(unittest.TestCase):
 
-    def test_(self):
-        pass
+    class UserREST(types.Model):
+        id = types.Integer()
+        name = types.String()
+
+    class UserPersistent(object):
+
+        def __init__(self, id, name):
+            self.id = id
+            self.name = name
+
+    def setUp(self):
+        adapters.registry.register_persistent_rest_pair(self.UserPersistent, self.UserREST)
+
+    def tearDown(self):
+        adapters.registry.clear_registered_adapters()
+
+    def test_list(self):
+        users = [self.UserPersistent(1, "Jane"), self.UserPersistent(2, "John")]
+
+        adapted_users = sqlalchemy.adapt_persistent_collection(users, self.UserREST)
+        self.assertIsInstance(adapted_users, types.Array)
+        self.assertIsInstance(adapted_users.element_template, self.UserREST)
+        self.assertFalse(adapted_users.lazy)
+        self.assertEqual(len(adapted_users), 2)
+        self.assertEqual(adapted_users[0].name, "Jane")
+        self.assertEqual(adapted_users[1].name, "John")
+
+    def test_generator(self):
+        users = (self.UserPersistent(index, "user") for index in range(3))
+
+        adapted_users = sqlalchemy.adapt_persistent_collection(users)
+        self.assertEqual([user.id for user in adapted_users], [0, 1, 2])
+
+    def test_empty(self):
+        for empty in ([], (), None, iter([])):
+            adapted_users = sqlalchemy.adapt_persistent_collection(empty, self.UserREST)
+            self.assertIsInstance(adapted_users, types.Array)
+            self.assertIsInstance(adapted_users.element_template, self.UserREST)
+            self.assertEqual(len(adapted_users), 0)
+
+        adapted_users = sqlalchemy.adapt_persistent_collection([], self.UserREST())
+        self.assertIsInstance(adapted_users.element_template, self.UserREST)
+
+        self.assertRaises(TypeError, sqlalchemy.adapt_persistent_collection, [])
+
+    def test_attribute_filter(self):
+        users = [self.UserPersistent(1, "Jane")]
+
+        attribute_filter = AttributeFilter.from_model(self.UserREST(), False)
+        attribute_filter.name = True
+
+        adapted_users = sqlalchemy.adapt_persistent_collection(users, self.UserREST, attribute_filter)
+        self.assertIsNone(adapted_users[0].id)
+        self.assertEqual(adapted_users[0].name, "Jane")
+
+    def test_lazy(self):
+        adapted = []
+
+        def users():
+            for index in range(3):
+                adapted.append(index)
+                yield self.UserPersistent(index, "user")
+
+        adapted_users = sqlalchemy.adapt_persistent_collection(users(), self.UserREST, batch_size=1, lazy=True)
+        self.assertTrue(adapted_users.lazy)
+        # the adapter is picked from the first object only
+        self.assertEqual(adapted, [0])
+
+        serialized = adapted_users.iter_serializable()
+        self.assertEqual(next(serialized), {"id": 0, "name": "user"})
+        self.assertEqual(adapted, [0])
+        self.assertEqual(next(serialized), {"id": 1, "name": "user"})
+        self.assertEqual(adapted, [0, 1])
+        self.assertEqual(list(serialized), [{"id": 2, "name": "user"}])
+
+        # iterating consumed the elements
+        self.assertEqual(len(adapted_users), 0)
+
+    def test_lazy_materializes(self):
+        users = [self.UserPersistent(1, "Jane"), self.UserPersistent(2, "John")]
+
+        adapted_users = sqlalchemy.adapt_persistent_collection(users, self.UserREST, lazy=True)
+        self.assertEqual(len(adapted_users), 2)
+        self.assertFalse(adapted_users.lazy)
+        self.assertEqual(adapted_users[1].name, "John")
+        self.assertEqual(adapted_users.as_serializable(), [{"id": 1, "name": "Jane"}, {"id": 2, "name": "John"}])
+
+    def test_overridden_adapt_persistent_to_rest(self):
+
+        class CustomAdapter(adapters.ModelAdapter):
+
+            def adapt_persistent_to_rest(self, persistent_object, attribute_filter=None):
+                rest_model = super(CustomAdapter, self).adapt_persistent_to_rest(persistent_object, attribute_filter)
+                rest_model.name = rest_model.name.upper()
+                return rest_model
+
+        adapters.registry.clear_registered_adapters()
+        adapters.registry.register_adapter(CustomAdapter(self.UserREST, self.UserPersistent))
+
+        adapted_users = sqlalchemy.adapt_persistent_collection([self.UserPersistent(1, "Jane")], self.UserREST)
+        self.assertEqual(adapted_users[0].name, "JANE")
+
+
+@unittest.skipIf(sa is None, "requires sqlalchemy")
+class SQLAlchemyDataAdapterAdaptPersistentQuery(unittest.TestCase):
+
+    def setUp(self):
+
+        class Base(orm.declarative_base()):
+            __abstract__ = True
+
+        class User(Base):
+            __tablename__ = "users"
+            id = sa.Column(sa.Integer, primary_key=True)
+            name = sa.Column(sa.String)
+
+        class UserREST(types.Model):
+            id = types.Integer()
+            name = types.String()
+
+        self.User = User
+        self.UserREST = UserREST
+
+        self.engine = sa.create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.session = orm.Session(self.engine)
+        self.session.add_all([User(id=index, name="user %d" % index) for index in range(1, 11)])
+        self.session.commit()
+
+        self.statements = []
+        sa.event.listen(self.engine, "before_cursor_execute", self._record_statement)
+
+        adapters.registry.register_persistent_rest_pair(User, UserREST)
+
+    def tearDown(self):
+        adapters.registry.clear_registered_adapters()
+        self.session.close()
+        self.engine.dispose()
+
+    def _record_statement(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def test_query_executed_once(self):
+        query = self.session.query(self.User).order_by(self.User.id)
+
+        adapted_users = sqlalchemy.adapt_persistent_collection(query, self.UserREST)
+        self.assertEqual(len(adapted_users), 10)
+        self.assertEqual(adapted_users[9].name, "user 10")
+        self.assertEqual(len(self.statements), 1)
+        self.assertNotIn("count", self.statements[0].lower())
+        self.assertNotIn("limit", self.statements[0].lower())
+
+    def test_empty_query(self):
+        query = self.session.query(self.User).filter(self.User.id > 100)
+
+        adapted_users = sqlalchemy.adapt_persistent_collection(query, self.UserREST)
+        self.assertEqual(len(adapted_users), 0)
+        self.assertIsInstance(adapted_users.element_template, self.UserREST)
+        self.assertEqual(len(self.statements), 1)
+
+    def test_batch_size(self):
+        query = self.session.query(self.User).order_by(self.User.id)
+
+        adapted_users = sqlalchemy.adapt_persistent_collection(query, self.UserREST, batch_size=3)
+        self.assertEqual([user.id for user in adapted_users], list(range(1, 11)))
+        self.assertEqual(len(self.statements), 1)
+
+    def test_lazy_batches(self):
+        query = self.session.query(self.User).order_by(self.User.id)
+
+        adapted_users = sqlalchemy.adapt_persistent_collection(query, self.UserREST, batch_size=2, lazy=True)
+        self.assertTrue(adapted_users.lazy)
+        self.assertEqual(
+            [user["id"] for user in adapted_users.iter_serializable()],
+            list(range(1, 11))
+        )
+        self.assertEqual(len(self.statements), 1)
+
+
+@unittest.skipIf(sa is None, "requires sqlalchemy")
+class SQLAlchemyApplyAttributeFilter(unittest.TestCase):
+
+    def setUp(self):
+
+        class Base(orm.declarative_base()):
+            __abstract__ = True
+
+        class User(Base):
+            __tablename__ = "users"
+            id = sa.Column(sa.Integer, primary_key=True)
+            name = sa.Column(sa.String)
+            biography = sa.Column(sa.Text)
+            addresses = orm.relationship("Address", back_populates="user", order_by="Address.id")
+
+        class Address(Base):
+            __tablename__ = "addresses"
+            id = sa.Column(sa.Integer, primary_key=True)
+            user_id = sa.Column(sa.Integer, sa.ForeignKey("users.id"))
+            street = sa.Column(sa.String)
+            city = sa.Column(sa.String)
+            user = orm.relationship(User, back_populates="addresses")
+
+        class AddressREST(types.Model):
+            id = types.Integer()
+            street = types.String()
+            city = types.String()
+
+        class UserREST(types.Model):
+            id = types.Integer()
+            name = types.String()
+            biography = types.String(required=False)
+            addresses = types.Array(element_template=AddressREST())
+
+        class OwnerREST(types.Model):
+            name = types.String()
+
+        class OwnedAddressREST(types.Model):
+            street = types.String()
+            user = OwnerREST()
+
+        self.User = User
+        self.Address = Address
+        self.UserREST = UserREST
+        self.AddressREST = AddressREST
+        self.OwnedAddressREST = OwnedAddressREST
+
+        self.engine = sa.create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.session = orm.Session(self.engine)
+
+        for index in range(1, 6):
+            user = User(id=index, name="user %d" % index, biography="biography %d" % index)
+            user.addresses = [
+                Address(street="street %d" % index, city="city %d" % index),
+                Address(street="road %d" % index, city="town %d" % index)
+            ]
+            self.session.add(user)
+        self.session.commit()
+        self.session.expunge_all()
+
+        self.statements = []
+        sa.event.listen(self.engine, "before_cursor_execute", self._record_statement)
+
+        adapters.registry.register_persistent_rest_pair(User, UserREST)
+        adapters.registry.register_persistent_rest_pair(Address, AddressREST)
+        adapters.registry.register_persistent_rest_pair(Address, OwnedAddressREST)
+        adapters.registry.register_persistent_rest_pair(User, OwnerREST)
+
+    def tearDown(self):
+        adapters.registry.clear_registered_adapters()
+        self.session.close()
+        self.engine.dispose()
+
+    def _record_statement(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def _adapt_users(self, query, attribute_filter=None):
+        adapted_users = sqlalchemy.adapt_persistent_collection(query, self.UserREST, attribute_filter)
+        return adapted_users.as_serializable(attribute_filter)
+
+    def test_relationships_loaded_in_one_query(self):
+        query = self.session.query(self.User).order_by(self.User.id)
+
+        expected = self._adapt_users(query)
+        self.assertEqual(len(self.statements), 6)
+
+        self.session.expunge_all()
+        del self.statements[:]
+
+        query = sqlalchemy.apply_attribute_filter(query, self.UserREST)
+        self.assertEqual(self._adapt_users(query), expected)
+        self.assertEqual(len(self.statements), 2)
+
+    def test_hidden_columns_not_loaded(self):
+        attribute_filter = AttributeFilter.from_model(self.UserREST(), True)
+        attribute_filter.biography = False
+        attribute_filter.addresses.city = False
+
+        query = self.session.query(self.User).order_by(self.User.id)
+        query = sqlalchemy.apply_attribute_filter(query, self.UserREST, attribute_filter)
+
+        adapted_users = self._adapt_users(query, attribute_filter)
+        self.assertEqual(adapted_users[0], {
+            "id": 1,
+            "name": "user 1",
+            "addresses": [{"id": 1, "street": "street 1"}, {"id": 2, "street": "road 1"}]
+        })
+
+        self.assertEqual(len(self.statements), 2)
+        self.assertNotIn("biography", self.statements[0])
+        self.assertIn("name", self.statements[0])
+        self.assertNotIn("city", self.statements[1])
+        self.assertIn("street", self.statements[1])
+
+    def test_hidden_relationship_not_loaded(self):
+        attribute_filter = AttributeFilter.from_model(self.UserREST(), True)
+        attribute_filter.addresses = False
+
+        query = self.session.query(self.User).order_by(self.User.id)
+        query = sqlalchemy.apply_attribute_filter(query, self.UserREST, attribute_filter)
+
+        adapted_users = self._adapt_users(query, attribute_filter)
+        self.assertEqual(len(adapted_users), 5)
+        self.assertEqual(len(self.statements), 1)
+        self.assertNotIn("addresses", self.statements[0])
+
+    def test_many_to_one(self):
+        attribute_filter = AttributeFilter.from_model(self.OwnedAddressREST(), True)
+
+        query = self.session.query(self.Address).order_by(self.Address.id)
+        query = sqlalchemy.apply_attribute_filter(query, self.OwnedAddressREST(), attribute_filter)
+
+        adapted_addresses = sqlalchemy.adapt_persistent_collection(query, self.OwnedAddressREST, attribute_filter)
+        self.assertEqual(adapted_addresses.as_serializable(attribute_filter)[9], {"street": "road 5", "user": {"name": "user 5"}})
+        self.assertEqual(len(self.statements), 2)
+        self.assertNotIn("city", self.statements[0])
+        self.assertNotIn("biography", self.statements[1])
+
+    def test_property_loads_all_columns(self):
+        self.User.summary = property(lambda user: user.biography[:5])
+
+        class SummaryREST(types.Model):
+            name = types.String()
+            summary = types.String()
+
+        query = self.session.query(self.User).order_by(self.User.id)
+        query = sqlalchemy.apply_attribute_filter(query, SummaryREST)
+
+        self.assertEqual(query.first().summary, "biogr")
+        self.assertEqual(len(self.statements), 1)
+        self.assertIn("biography", self.statements[0])
+
+    def test_select(self):
+        statement = sqlalchemy.apply_attribute_filter(sa.select(self.User), self.UserREST)
+        users = self.session.scalars(statement).all()
+        self.assertEqual(len(users), 5)
+        self.assertEqual(len(users[0].addresses), 2)
+        self.assertEqual(len(self.statements), 2)
@@ -4,6 +4,7 @@ import unittest
 from prestans import exception
 from prestans.parser import AttributeFilter
 from prestans import types
+from prestans.types.compiler import filter_signature
 
 
 class AttributeFilterTest(unittest.TestCase):
@@ -328,6 +329,27 @@ class AttributeFilterAsDict(unittest.TestCase):
         self.assertEqual(filter_b.as_dict(), dict_b)
 
 
+class AttributeFilterCopy(unittest.TestCase):
+
+    def test_copy_is_independent(self):
+        attribute_filter = AttributeFilter(from_dictionary={"a": True, "b": {"c": True, "d": False}})
+        immutable = attribute_filter.as_immutable()
+
+        copy = attribute_filter.copy()
+        self.assertIsNot(copy, attribute_filter)
+        self.assertIsNot(copy.b, attribute_filter.b)
+        self.assertEqual(copy.as_dict(), attribute_filter.as_dict())
+        self.assertIs(copy.as_immutable(), immutable)
+
+        copy.a = False
+        copy.b.c = False
+        self.assertTrue(attribute_filter.a)
+        self.assertTrue(attribute_filter.b.c)
+        self.assertIs(attribute_filter.as_immutable(), immutable)
+        self.assertFalse(copy.as_immutable().is_attribute_visible("a"))
+        self.assertFalse(copy.as_immutable().b.is_attribute_visible("c"))
+
+
 class AttributeFilterInitFromDictionary(unittest.TestCase):
 
     def test_init_from_dictionary(self):
@@ -408,3 +430,73 @@ class AttributeFilterImmutable(unittest.TestCase):
         mutable_filter = AttributeFilter()
         immutable_filter = mutable_filter.as_immutable()
         self.assertTrue(isinstance(immutable_filter, AttributeFilterImmutable))
+
+    def test_kept_until_changed(self):
+        attribute_filter = AttributeFilter(from_dictionary={"a": True, "b": {"c": True}})
+        immutable_filter = attribute_filter.as_immutable()
+        self.assertIs(attribute_filter.as_immutable(), immutable_filter)
+        self.assertIs(immutable_filter.b, attribute_filter.b.as_immutable())
+
+        attribute_filter.b.c = False
+        self.assertIsNot(attribute_filter.as_immutable(), immutable_filter)
+        self.assertFalse(attribute_filter.as_immutable().is_attribute_visible("b"))
+        self.assertTrue(immutable_filter.is_attribute_visible("b"))
+
+
+class AttributeFilterCachedSummary(unittest.TestCase):
+
+    def test_keys_are_only_attributes(self):
+        attribute_filter = AttributeFilter(from_dictionary={"b": True, "a": {"c": False}})
+        self.assertEqual(attribute_filter.keys(), ["a", "b"])
+        self.assertEqual(attribute_filter.a.keys(), ["c"])
+        self.assertEqual(AttributeFilter().keys(), [])
+
+    def test_nested_change_invalidates_parents(self):
+        attribute_filter = AttributeFilter(from_dictionary={"a": True, "b": {"c": {"d": True}}})
+        self.assertTrue(attribute_filter.are_all_attributes_visible())
+        signature = filter_signature(attribute_filter)
+
+        attribute_filter.b.c.d = False
+        self.assertFalse(attribute_filter.are_all_attributes_visible())
+        self.assertFalse(attribute_filter.is_attribute_visible("b"))
+        self.assertNotEqual(filter_signature(attribute_filter), signature)
+
+        attribute_filter.b = True
+        self.assertTrue(attribute_filter.are_all_attributes_visible())
+        self.assertEqual(filter_signature(attribute_filter), signature)
+
+    def test_shared_sub_filter_invalidates_every_parent(self):
+        sub_filter = AttributeFilter(from_dictionary={"c": True})
+        first = AttributeFilter()
+        first.b = sub_filter
+        second = AttributeFilter()
+        second.b = sub_filter
+        self.assertTrue(first.is_attribute_visible("b"))
+        self.assertTrue(second.is_attribute_visible("b"))
+
+        sub_filter.c = False
+        self.assertFalse(first.is_attribute_visible("b"))
+        self.assertFalse(second.is_attribute_visible("b"))
+
+    def test_replaced_sub_filter_detached(self):
+        sub_filter = AttributeFilter(from_dictionary={"c": True})
+        attribute_filter = AttributeFilter()
+        attribute_filter.b = sub_filter
+        attribute_filter.d = sub_filter
+        self.assertIn(attribute_filter, sub_filter._parents)
+
+        attribute_filter.b = AttributeFilter(from_dictionary={"c": True})
+        self.assertIn(attribute_filter, sub_filter._parents)
+
+        del attribute_filter.d
+        self.assertNotIn(attribute_filter, sub_filter._parents)
+        self.assertEqual(attribute_filter.keys(), ["b"])
+        self.assertRaises(AttributeError, delattr, attribute_filter, "d")
+
+    def test_set_all_attribute_values_invalidates(self):
+        attribute_filter = AttributeFilter(from_dictionary={"a": True, "b": {"c": True}})
+        self.assertTrue(attribute_filter.are_any_attributes_visible())
+
+        attribute_filter.set_all_attribute_values(False)
+        self.assertFalse(attribute_filter.are_any_attributes_visible())
+        self.assertFalse(attribute_filter.b.is_attribute_visible("c"))
@@ -0,0 +1,57 @@
+import unittest
+
+from prestans.parser import AttributeFilter
+from prestans.parser import AttributeFilterCache
+
+
+class AttributeFilterCacheUnitTest(unittest.TestCase):
+
+    def test_maxsize(self):
+        self.assertEqual(AttributeFilterCache().maxsize, 256)
+        self.assertEqual(AttributeFilterCache(maxsize=2).maxsize, 2)
+        self.assertRaises(ValueError, AttributeFilterCache, 0)
+
+    def test_hits_and_misses(self):
+        cache = AttributeFilterCache()
+        first = AttributeFilter()
+
+        self.assertIs(cache.get("a", lambda: first), first)
+        self.assertIs(cache.get("a", AttributeFilter), first)
+        self.assertIs(cache.get("a", AttributeFilter), first)
+        self.assertIsNot(cache.get("b", AttributeFilter), first)
+
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(len(cache), 2)
+
+    def test_least_recently_used_dropped(self):
+        cache = AttributeFilterCache(maxsize=2)
+        cache.get("a", AttributeFilter)
+        cache.get("b", AttributeFilter)
+        cache.get("a", AttributeFilter)
+        cache.get("c", AttributeFilter)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+
+    def test_factory_errors_are_not_cached(self):
+        cache = AttributeFilterCache()
+
+        def factory():
+            raise TypeError("invalid")
+
+        self.assertRaises(TypeError, cache.get, "a", factory)
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.misses, 1)
+
+    def test_clear(self):
+        cache = AttributeFilterCache()
+        cache.get("a", AttributeFilter)
+        cache.get("a", AttributeFilter)
+        cache.clear()
+
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.misses, 0)
@@ -0,0 +1,239 @@
+import unittest
+
+from prestans.parser import AttributeFilter
+from prestans.parser import CompiledAttributeFilter
+from prestans.parser import compile_attribute_filter
+from prestans import types
+
+
+class Address(types.Model):
+    street = types.String()
+    city = types.String(required=False)
+
+
+class Person(types.Model):
+    first_name = types.String()
+    last_name = types.String(required=False)
+    address = Address(required=False)
+    addresses = types.Array(element_template=Address())
+    tags = types.Array(element_template=types.String())
+
+
+def _filter(**visible):
+    return AttributeFilter.from_model(Person(), default_value=False, **visible)
+
+
+class CompileAttributeFilterUnitTest(unittest.TestCase):
+
+    def test_not_filters(self):
+        self.assertIsNone(compile_attribute_filter(Person, None))
+        self.assertIsNone(compile_attribute_filter(Person, True))
+
+    def test_aligned_to_member_order(self):
+        compiled = compile_attribute_filter(Person, _filter(first_name=True, addresses=True))
+
+        self.assertIsInstance(compiled, CompiledAttributeFilter)
+        self.assertIs(compiled.model_class, Person)
+        self.assertEqual(compiled.keys(), ["address", "addresses", "first_name", "last_name", "tags"])
+        self.assertEqual(
+            [compiled.is_visible(index) for index in range(5)],
+            [False, True, True, False, False]
+        )
+        self.assertTrue(compiled.is_attribute_visible("first_name"))
+        self.assertFalse(compiled.is_attribute_visible("last_name"))
+        self.assertFalse(compiled.is_attribute_visible("missing"))
+
+        self.assertIsInstance(compiled.child(1), CompiledAttributeFilter)
+        self.assertIs(compiled.child(1).model_class, Address)
+        self.assertTrue(compiled.child(1).are_all_attributes_visible())
+        self.assertIsNone(compiled.child(4))
+        self.assertTrue(compiled.is_filter_at_key("address"))
+        self.assertFalse(compiled.is_filter_at_key("tags"))
+
+        self.assertIs(compiled.addresses, compiled.child(1))
+        self.assertTrue(compiled.first_name)
+        self.assertRaises(AttributeError, getattr, compiled, "missing")
+
+    def test_as_dict_matches_source(self):
+        attribute_filter = _filter(first_name=True, addresses=True)
+        attribute_filter.addresses.city = False
+
+        self.assertEqual(compile_attribute_filter(Person, attribute_filter).as_dict(), attribute_filter.as_dict())
+
+    def test_equal_filters_are_interned(self):
+        first = compile_attribute_filter(Person, _filter(first_name=True))
+        second = compile_attribute_filter(Person, _filter(first_name=True).as_immutable())
+        other = compile_attribute_filter(Person, _filter(last_name=True))
+
+        self.assertIs(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertNotEqual(first, other)
+        self.assertEqual(len(set([first, second, other])), 2)
+
+    def test_kept_until_filter_changes(self):
+        attribute_filter = _filter(first_name=True)
+        compiled = compile_attribute_filter(Person, attribute_filter)
+        self.assertIs(attribute_filter._compiled[compiled._schema], compiled)
+
+        attribute_filter.address.city = True
+        self.assertIsNone(attribute_filter._compiled)
+
+        recompiled = compile_attribute_filter(Person, attribute_filter)
+        self.assertTrue(recompiled.is_attribute_visible("address"))
+        self.assertTrue(recompiled.address.city)
+
+    def test_compiled_for_other_class(self):
+        class Employee(Person):
+            employee_number = types.Integer()
+
+        compiled = compile_attribute_filter(Person, _filter(first_name=True))
+        self.assertIs(compile_attribute_filter(Person, compiled), compiled)
+
+        employee = compile_attribute_filter(Employee, compiled)
+        self.assertIs(employee.model_class, Employee)
+        self.assertTrue(employee.first_name)
+        self.assertFalse(employee.is_attribute_visible("employee_number"))
+
+
+class CompiledAttributeFilterCombineUnitTest(unittest.TestCase):
+
+    def test_union(self):
+        names = compile_attribute_filter(Person, _filter(first_name=True, last_name=True))
+        street = _filter()
+        street.address.street = True
+        street = compile_attribute_filter(Person, street)
+
+        union = names | street
+        self.assertEqual(union, names.union(street))
+        self.assertEqual(union.as_dict(), {
+            "first_name": True,
+            "last_name": True,
+            "address": {"street": True, "city": False},
+            "addresses": {"street": False, "city": False},
+            "tags": False
+        })
+
+        # a member visible without sub filter shows everything
+        everything = compile_attribute_filter(Person, AttributeFilter(from_dictionary={"address": True}))
+        self.assertIsNone((street | everything).child(0))
+        self.assertTrue((street | everything).address)
+
+    def test_intersection(self):
+        client = _filter(first_name=True, address=True)
+        template = _filter(first_name=True, last_name=True)
+        template.address.city = True
+
+        intersection = compile_attribute_filter(Person, client) & compile_attribute_filter(Person, template)
+        self.assertEqual(intersection.as_dict(), {
+            "first_name": True,
+            "last_name": False,
+            "address": {"street": False, "city": True},
+            "addresses": False,
+            "tags": False
+        })
+
+        nothing = compile_attribute_filter(Person, _filter())
+        self.assertFalse((intersection & nothing).are_any_attributes_visible())
+
+    def test_different_classes(self):
+        person = compile_attribute_filter(Person, _filter())
+        address = compile_attribute_filter(Address, AttributeFilter.from_model(Address()))
+
+        self.assertRaises(ValueError, person.union, address)
+        self.assertRaises(ValueError, person.intersection, _filter())
+
+
+class CompiledAttributeFilterModelUnitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.person = Person(first_name="Jane", last_name="Doe", tags=["a"])
+        self.person.address = Address(street="First", city="City")
+        self.person.addresses.append(Address(street="Second", city="Town"))
+
+        self.attribute_filter = _filter(first_name=True, addresses=True, address=True)
+        self.attribute_filter.addresses.city = False
+
+    def test_as_serializable(self):
+        compiled = compile_attribute_filter(Person, self.attribute_filter)
+
+        self.assertEqual(
+            self.person.as_serializable(compiled),
+            self.person.as_serializable(self.attribute_filter.as_immutable())
+        )
+        self.assertEqual(self.person.as_serializable(compiled), {
+            "first_name": "Jane",
+            "address": {"street": "First", "city": "City"},
+            "addresses": [{"street": "Second"}]
+        })
+
+    def test_partially_visible_nested_filter(self):
+
+        class Team(types.Model):
+            name = types.String()
+            lead = Person(required=False)
+
+        team = Team(name="Team")
+        team.lead = self.person
+
+        # lead is only visible through an attribute of a sub filter of its sub filter
+        attribute_filter = AttributeFilter.from_model(Team(), default_value=False, name=True)
+        attribute_filter.lead.addresses.city = True
+
+        expected = {"name": "Team", "lead": {"addresses": [{"city": "Town"}]}}
+
+        self.assertEqual(compile_attribute_filter(Team, attribute_filter).keys(), ["lead", "name"])
+        self.assertTrue(compile_attribute_filter(Team, attribute_filter).is_attribute_visible("lead"))
+        self.assertEqual(team.as_serializable(attribute_filter), expected)
+        self.assertEqual(team.as_serializable(attribute_filter.as_immutable()), expected)
+
+        teams = types.Array(element_template=Team())
+        teams.append(team)
+        self.assertEqual(teams.as_serializable(attribute_filter), [expected])
+
+    def test_validate_partially_visible_nested_filter(self):
+
+        for compiled in [False, True]:
+
+            class Team(types.Model):
+                __compiled__ = compiled
+                name = types.String()
+                lead = Person(required=False)
+
+            team = Team(name="Team")
+            team.lead = self.person
+            value = team.as_serializable()
+
+            # validation keeps the rules of the mutable filter, a sub filter of a sub filter
+            # only makes its parent visible if all of its attributes are
+            attribute_filter = AttributeFilter.from_model(Team(), default_value=False, name=True)
+            attribute_filter.lead.addresses.city = True
+
+            compiled_filter = compile_attribute_filter(Team, attribute_filter, validation=True)
+            self.assertFalse(compiled_filter.is_attribute_visible("lead"))
+            validated = Team().validate(value, attribute_filter)
+            self.assertIsNone(validated.lead.first_name)
+            self.assertEqual(len(validated.lead.addresses), 0)
+
+            teams = types.Array(element_template=Team()).validate([value], attribute_filter)
+            self.assertEqual(len(teams[0].lead.addresses), 0)
+
+            # the immutable form is validated by its own rules
+            validated = Team().validate(value, attribute_filter.as_immutable())
+            self.assertIsNone(validated.lead.first_name)
+            self.assertEqual(validated.lead.addresses[0].city, "Town")
+
+            attribute_filter.lead.first_name = True
+
+            validated = Team().validate(value, attribute_filter)
+            self.assertEqual(validated.lead.first_name, "Jane")
+            self.assertIsNone(validated.lead.addresses[0].street)
+            self.assertEqual(validated.lead.addresses[0].city, "Town")
+
+    def test_validate(self):
+        compiled = compile_attribute_filter(Person, self.attribute_filter)
+        validated = Person().validate(self.person.as_serializable(), compiled)
+
+        self.assertEqual(validated.first_name, "Jane")
+        self.assertIsNone(validated.last_name)
+        self.assertEqual(validated.addresses[0].street, "Second")
+        self.assertIsNone(validated.addresses[0].city)
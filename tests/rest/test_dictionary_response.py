@@ -70,8 +70,8 @@ class DictionaryResponseCall(unittest.TestCase):
             pass
 
         response = dict_response({}, start_response)
-        self.assertEqual(response, ['{"key": "value"}'])
-        self.assertEqual(dict_response.content_length, 16)
+        self.assertEqual(response, [b'{"key":"value"}'])
+        self.assertEqual(dict_response.content_length, 15)
 
     def test_call_serializer_returns_non_string_type_raises_type_error(self):
         from prestans.serializer import Base
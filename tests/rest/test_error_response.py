@@ -28,7 +28,7 @@ class ErrorResponseTest(unittest.TestCase):
 
         self.assertEqual(
             error_response(environ, start_response),
-            [b'{"code": 404, "message": "API does not provide this end-point", "trace": []}']
+            [b'{"code":404,"message":"API does not provide this end-point","trace":[]}']
         )
 
     def test_call_custom(self):
@@ -55,4 +55,4 @@ class ErrorResponseTest(unittest.TestCase):
 
         environ = {}
 
-        self.assertEqual(error_response(environ, start_response), [b'{"custom_message": "custom"}'])
+        self.assertEqual(error_response(environ, start_response), [b'{"custom_message":"custom"}'])
@@ -32,6 +32,8 @@
 import logging
 import unittest
 
+from mock import patch
+
 from prestans.deserializer import JSON
 from prestans.deserializer import XMLPlist
 from prestans import exception
@@ -160,6 +162,36 @@ class RESTRequestParsedBody(unittest.TestCase):
         self.assertEqual(request.parsed_body.first_name, "John")
         self.assertEqual(request.parsed_body.last_name, "Smith")
 
+    def test_body_decoded_for_deserializers_not_accepting_bytes(self):
+
+        class TextJSON(JSON):
+
+            def loads(self, input_string):
+                if not isinstance(input_string, str):
+                    raise AssertionError("expected str, got %s" % input_string.__class__.__name__)
+                return super(TextJSON, self).loads(input_string)
+
+            def accepts_bytes(self):
+                return False
+
+        request = Request(
+            environ={
+                "REQUEST_METHOD": VERB.POST,
+                "CONTENT_TYPE": "application/json"
+            },
+            charset="utf-8",
+            logger=logging.getLogger(),
+            deserializers=[TextJSON()],
+            default_deserializer=TextJSON()
+        )
+
+        class Person(types.Model):
+            first_name = types.String()
+
+        request.body = u'{"first_name": "J\u00f6hn"}'.encode("utf-8")
+        request.body_template = Person()
+        self.assertEqual(request.parsed_body.first_name, u"J\u00f6hn")
+
 
 class RESTRequestSupportedMimeTypes(unittest.TestCase):
     def test_supported_mime_types(self):
@@ -384,6 +416,95 @@ class RESTRequestGetResponseAttributeFilter(unittest.TestCase):
         self.assertTrue(response_filter.first_name)
         self.assertFalse(response_filter.last_name)
 
+    def _request(self, attribute_list):
+        return Request(
+            environ={
+                "REQUEST_METHOD": VERB.GET,
+                "HTTP_PRESTANS_RESPONSE_ATTRIBUTE_LIST": attribute_list
+            },
+            charset="utf-8",
+            logger=logging.getLogger(),
+            deserializers=[JSON()],
+            default_deserializer=JSON()
+        )
+
+    def test_header_parsed_once(self):
+        Request.response_attribute_filter_cache.clear()
+
+        class Person(types.Model):
+            first_name = types.String()
+            last_name = types.String()
+
+        template_filter = AttributeFilter.from_model(Person())
+        first = self._request('{"first_name": true}').get_response_attribute_filter(template_filter)
+
+        with patch("prestans.rest.request.AttributeFilter") as attribute_filter_class:
+            second = self._request('{"first_name": true}').get_response_attribute_filter(template_filter)
+            attribute_filter_class.assert_not_called()
+
+        self.assertIsNot(first, second)
+        self.assertEqual(first.as_dict(), second.as_dict())
+        self.assertEqual(Request.response_attribute_filter_cache.hits, 1)
+        self.assertEqual(Request.response_attribute_filter_cache.misses, 1)
+
+        other = self._request('{"last_name": true}').get_response_attribute_filter(template_filter)
+        self.assertTrue(other.last_name)
+        self.assertFalse(other.first_name)
+        self.assertEqual(Request.response_attribute_filter_cache.misses, 2)
+
+    def test_changes_not_shared_between_requests(self):
+        Request.response_attribute_filter_cache.clear()
+
+        class Person(types.Model):
+            first_name = types.String()
+            last_name = types.String()
+
+        template_filter = AttributeFilter.from_model(Person())
+        header = '{"first_name": true, "last_name": true}'
+
+        first = self._request(header).get_response_attribute_filter(template_filter)
+        first.first_name = False
+
+        second = self._request(header).get_response_attribute_filter(template_filter)
+        self.assertTrue(second.first_name)
+        self.assertTrue(second.last_name)
+        self.assertTrue(second.as_immutable().is_attribute_visible("first_name"))
+        self.assertEqual(Request.response_attribute_filter_cache.hits, 1)
+
+    def test_header_cached_per_template(self):
+        Request.response_attribute_filter_cache.clear()
+
+        class Person(types.Model):
+            first_name = types.String()
+            last_name = types.String()
+
+        class Pet(types.Model):
+            first_name = types.String()
+            last_name = types.String()
+
+        minified = self._request('{"%s": true}' % Person().attribute_rewrite_map()["first_name"])
+        minified.get_response_attribute_filter(AttributeFilter.from_model(Person()), Person())
+        minified.get_response_attribute_filter(AttributeFilter.from_model(Pet()), Pet())
+
+        plain = self._request('{"first_name": true}')
+        plain.get_response_attribute_filter(AttributeFilter.from_model(Person()))
+        plain.get_response_attribute_filter(AttributeFilter.from_model(Person(), last_name=True))
+
+        self.assertEqual(Request.response_attribute_filter_cache.hits, 0)
+        self.assertEqual(Request.response_attribute_filter_cache.misses, 4)
+
+    def test_invalid_header_not_cached(self):
+        Request.response_attribute_filter_cache.clear()
+
+        class Person(types.Model):
+            first_name = types.String()
+
+        request = self._request('{"middle_name": true}')
+        template_filter = AttributeFilter.from_model(Person())
+
+        self.assertRaises(exception.AttributeFilterDiffers, request.get_response_attribute_filter, template_filter)
+        self.assertEqual(len(Request.response_attribute_filter_cache), 0)
+
 
 class RESTRequestIsMinified(unittest.TestCase):
     def test_default_false(self):
@@ -178,3 +178,39 @@ class RequestRouterTestCase(unittest.TestCase):
             route=match,
             assertion=assertion
         )
+
+
+class RequestRouterConstructionTestCase(unittest.TestCase):
+
+    def test_route_map_compiled_once(self):
+        test_router = rest.RequestRouter([
+            (r"/some/path/([0-9]+)", _UserHandler),
+            (r"^/other/path/(?P<id>[0-9]+)$", _UserHandler)
+        ], application_name="test-router")
+
+        self.assertTrue(isinstance(test_router.route_map, tuple))
+        self.assertEqual(len(test_router.route_map), 2)
+        self.assertEqual(test_router.route_map[0][0].pattern, r"^/some/path/([0-9]+)$")
+        self.assertEqual(test_router.route_map[1][0].pattern, r"^/other/path/(?P<id>[0-9]+)$")
+
+        from mock import patch
+        with patch.object(rest.RequestRouter, "generate_route_map") as generate_route_map:
+            test_router(environ={
+                "REQUEST_METHOD": VERB.GET,
+                "PATH_INFO": "/some/path/123",
+                "wsgi.url_scheme": "http",
+                "SERVER_NAME": "localhost",
+                "SERVER_PORT": "1234"
+            }, start_response=MockStartResponse.__call__)
+            generate_route_map.assert_not_called()
+
+    def test_mixed_groups_rejected_on_construction(self):
+        self.assertRaises(ValueError, rest.RequestRouter, [
+            (r"/some/path/(?P<id>[0-9]+)/([0-9]+)", _UserHandler)
+        ])
+
+    def test_bad_serializer_rejected_on_construction(self):
+        self.assertRaises(TypeError, rest.RequestRouter, [], serializers=[MockStartResponse()])
+
+    def test_bad_deserializer_rejected_on_construction(self):
+        self.assertRaises(TypeError, rest.RequestRouter, [], deserializers=[MockStartResponse()])
@@ -1,7 +1,12 @@
 import logging
 import unittest
 
+from mock import patch
+
+from prestans.ext.data import adapters
+from prestans.parser import AttributeFilter
 from prestans.rest import Response
+from prestans import types
 from prestans.serializer import JSON
 from prestans.serializer import XMLPlist
 
@@ -92,4 +97,271 @@ class ResponseMinify(unittest.TestCase):
             default_serializer=None
         )
         response.minify = True
-        self.assertTrue(response.minify)
\ No newline at end of file
+        self.assertTrue(response.minify)
+
+class ResponseStream(unittest.TestCase):
+
+    class Person(types.Model):
+        name = types.String()
+
+    def setUp(self):
+        self.start_response_calls = list()
+
+    def start_response(self, status, headers, exc_info=None):
+        self.start_response_calls.append((status, dict(headers)))
+
+    def _response(self, people):
+        response = Response(
+            charset="utf-8",
+            logger=logging.getLogger(),
+            serializers=[JSON()],
+            default_serializer=JSON()
+        )
+        response.content_type = "application/json"
+        response.template = types.Array(element_template=self.Person())
+        response.attribute_filter = AttributeFilter.from_model(self.Person(), default_value=True)
+
+        body = types.Array(element_template=self.Person())
+        for index in range(people):
+            body.append(self.Person(name="person %i" % index))
+        response.body = body
+
+        return response
+
+    def test_default(self):
+        response = self._response(0)
+        self.assertFalse(response.stream)
+        self.assertEqual(response.stream_batch_size, 100)
+
+        response.stream = True
+        self.assertTrue(response.stream)
+
+        response.stream_batch_size = 10
+        self.assertEqual(response.stream_batch_size, 10)
+        self.assertRaises(ValueError, setattr, response, "stream_batch_size", 0)
+
+    def test_stream_matches_buffered_body(self):
+        buffered = b"".join(self._response(5)({}, self.start_response))
+        self.assertEqual(self.start_response_calls[0][1]["Content-Length"], str(len(buffered)))
+
+        response = self._response(5)
+        response.stream = True
+        response.stream_batch_size = 2
+
+        chunks = list(response({}, self.start_response))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(b"".join(chunks), buffered)
+
+        status, headers = self.start_response_calls[1]
+        self.assertEqual(status, "200 OK")
+        self.assertNotIn("Content-Length", headers)
+        self.assertEqual(headers["Content-Type"], self.start_response_calls[0][1]["Content-Type"])
+
+    def test_stream_serializes_lazily(self):
+        response = self._response(3)
+        response.stream = True
+        response.stream_batch_size = 1
+
+        with patch.object(self.Person, "as_serializable", return_value={"name": "person"}) as as_serializable:
+            app_iter = response({}, self.start_response)
+            self.assertEqual(len(self.start_response_calls), 1)
+            self.assertEqual(as_serializable.call_count, 0)
+
+            self.assertEqual(next(app_iter), b'[{"name":"person"}')
+            self.assertEqual(as_serializable.call_count, 1)
+
+    def test_projected_body(self):
+
+        class PersonPersistent(object):
+            def __init__(self, name):
+                self.name = name
+
+        adapters.registry.register_persistent_rest_pair(PersonPersistent, self.Person)
+        self.addCleanup(adapters.registry.clear_registered_adapters)
+
+        buffered = b"".join(self._response(3)({}, self.start_response))
+
+        for stream in (False, True):
+            response = self._response(0)
+            response.stream = stream
+            response.body = adapters.adapt_persistent_collection(
+                [PersonPersistent("person %i" % index) for index in range(3)],
+                self.Person,
+                project=True
+            )
+
+            with patch.object(self.Person, "as_serializable") as as_serializable:
+                self.assertEqual(b"".join(response({}, self.start_response)), buffered)
+                self.assertEqual(as_serializable.call_count, 0)
+
+    def test_stream_ignored_for_models(self):
+        response = Response(
+            charset="utf-8",
+            logger=logging.getLogger(),
+            serializers=[JSON()],
+            default_serializer=JSON()
+        )
+        response.content_type = "application/json"
+        response.template = self.Person()
+        response.attribute_filter = AttributeFilter.from_model(self.Person(), default_value=True)
+        response.body = self.Person(name="person")
+        response.stream = True
+
+        self.assertEqual(response({}, self.start_response), [b'{"name":"person"}'])
+        self.assertIn("Content-Length", self.start_response_calls[0][1])
+
+
+class ResponseAttributeFilterCache(unittest.TestCase):
+
+    class Pet(types.Model):
+        name = types.String()
+        age = types.Integer()
+
+    def setUp(self):
+        Response._filters.clear()
+        self.start_response_calls = list()
+
+    def start_response(self, status, headers, exc_info=None):
+        self.start_response_calls.append((status, dict(headers)))
+
+    def _response(self, attribute_filter, debug=False):
+        response = Response(
+            charset="utf-8",
+            logger=logging.getLogger(),
+            serializers=[JSON()],
+            default_serializer=JSON(),
+            debug=debug
+        )
+        response.content_type = "application/json"
+        response.template = self.Pet()
+        response.attribute_filter = attribute_filter
+        response.body = self.Pet(name="Rex", age=3)
+
+        return response
+
+    def test_debug_default(self):
+        self.assertFalse(self._response(AttributeFilter()).debug)
+        self.assertTrue(self._response(AttributeFilter(), debug=True).debug)
+
+    def test_immutable_filter_shared_by_equal_filters(self):
+        first = self._response(AttributeFilter.from_model(self.Pet(), default_value=True))
+        second = self._response(AttributeFilter.from_model(self.Pet(), default_value=True))
+        self.assertEqual(first({}, self.start_response), [b'{"age":3,"name":"Rex"}'])
+        self.assertEqual(second({}, self.start_response), [b'{"age":3,"name":"Rex"}'])
+        self.assertEqual(len(Response._filters), 1)
+
+        self.assertIs(first._response_filter().immutable, second._response_filter().immutable)
+
+    def test_filters_differing_in_visibility_are_cached_apart(self):
+        name_only = AttributeFilter.from_model(self.Pet(), default_value=False, name=True)
+
+        self.assertEqual(self._response(name_only)({}, self.start_response), [b'{"name":"Rex"}'])
+        self.assertEqual(
+            self._response(AttributeFilter.from_model(self.Pet(), default_value=True))({}, self.start_response),
+            [b'{"age":3,"name":"Rex"}']
+        )
+        self.assertEqual(len(Response._filters), 2)
+
+    def test_conformance_skipped_outside_debug(self):
+        attribute_filter = AttributeFilter(from_dictionary={"name": True})
+
+        with patch.object(AttributeFilter, "from_model") as from_model:
+            self._response(attribute_filter)({}, self.start_response)
+            from_model.assert_not_called()
+
+    def test_conformance_checked_once_in_debug(self):
+        logger = logging.getLogger()
+
+        with patch.object(logger, "warn") as warn, \
+                patch.object(AttributeFilter, "from_model", wraps=AttributeFilter.from_model) as from_model:
+            for _ in range(2):
+                attribute_filter = AttributeFilter(from_dictionary={"name": True})
+                self._response(attribute_filter, debug=True)({}, self.start_response)
+
+        self.assertEqual(from_model.call_count, 1)
+        self.assertEqual(warn.call_count, 2)
+        self.assertIn("(age)", warn.call_args[0][0])
+
+
+class ResponseAttributeVisibility(unittest.TestCase):
+
+    def setUp(self):
+        class Owner(types.Model):
+            name = types.String()
+            email = types.String(required=False)
+
+        class Pet(types.Model):
+            name = types.String()
+            age = types.Integer(required=False)
+            owner = Owner(required=False)
+
+        self.Owner = Owner
+        self.Pet = Pet
+        self.calls = list()
+
+    def _response(self, attribute_filter):
+        response = Response(
+            charset="utf-8",
+            logger=logging.getLogger(),
+            serializers=[JSON()],
+            default_serializer=JSON()
+        )
+        response.content_type = "application/json"
+        response.template = self.Pet()
+        response.attribute_filter = attribute_filter
+        return response
+
+    def test_no_filter(self):
+        response = self._response(None)
+        self.assertTrue(response.is_attribute_visible("name"))
+        self.assertTrue(response.is_attribute_visible("owner", "email"))
+
+    def test_filter(self):
+        attribute_filter = AttributeFilter.from_model(self.Pet(), default_value=False, name=True)
+        attribute_filter.owner.email = True
+        response = self._response(attribute_filter)
+
+        self.assertTrue(response.is_attribute_visible("name"))
+        self.assertFalse(response.is_attribute_visible("age"))
+        self.assertTrue(response.is_attribute_visible("owner"))
+        self.assertTrue(response.is_attribute_visible("owner", "email"))
+        self.assertFalse(response.is_attribute_visible("owner", "name"))
+
+    def test_partially_visible_nested_filter(self):
+
+        class Household(types.Model):
+            name = types.String()
+            pet = self.Pet(required=False)
+
+        # pet is only visible through an attribute of a sub filter of its sub filter
+        attribute_filter = AttributeFilter.from_model(Household(), default_value=False, name=True)
+        attribute_filter.pet.owner.email = True
+
+        response = self._response(attribute_filter)
+        response.template = Household()
+
+        self.assertTrue(response.is_attribute_visible("pet"))
+        self.assertTrue(response.is_attribute_visible("pet", "owner"))
+        self.assertTrue(response.is_attribute_visible("pet", "owner", "email"))
+        self.assertFalse(response.is_attribute_visible("pet", "name"))
+
+        household = Household(name="Home")
+        household.pet = self.Pet(name="Rex")
+        household.pet.owner = self.Owner(name="Jane", email="jane@example.com")
+        response.body = household
+
+        self.assertEqual(
+            response({}, lambda status, headers: None),
+            [b'{"name":"Home","pet":{"owner":{"email":"jane@example.com"}}}']
+        )
+
+    def test_hidden_deferred_attributes_not_computed(self):
+        def age():
+            self.calls.append("age")
+            return 3
+
+        response = self._response(AttributeFilter.from_model(self.Pet(), default_value=False, name=True))
+        response.body = self.Pet(name="Rex", age=types.Deferred(age))
+
+        self.assertEqual(response({}, lambda status, headers: None), [b'{"name":"Rex"}'])
+        self.assertEqual(self.calls, [])
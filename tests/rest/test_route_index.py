@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+#
+#  prestans, A WSGI compliant REST micro-framework
+#  http://prestans.org
+#
+#  Copyright (c) 2017, Anomaly Software Pty Ltd.
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#      * Redistributions of source code must retain the above copyright
+#        notice, this list of conditions and the following disclaimer.
+#      * Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#      * Neither the name of Anomaly Software nor the
+#        names of its contributors may be used to endorse or promote products
+#        derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+#  ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+#  WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL ANOMALY SOFTWARE BE LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#  (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+#  LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+#  ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#  (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+import unittest
+
+from prestans.rest import RequestRouter
+from prestans.rest.route_index import has_top_level_alternation
+from prestans.rest.route_index import literal_prefix
+from prestans.rest.route_index import RouteIndex
+
+
+class LiteralPrefixUnitTest(unittest.TestCase):
+
+    def test_plain_literal(self):
+        self.assertEqual(literal_prefix("^/users$"), "/users")
+        self.assertEqual(literal_prefix("/users/"), "/users/")
+
+    def test_stops_at_group(self):
+        self.assertEqual(literal_prefix("^/users/([0-9]+)$"), "/users/")
+        self.assertEqual(literal_prefix("^/users/(?P<id>[0-9]+)$"), "/users/")
+
+    def test_stops_at_character_class_and_wildcard(self):
+        self.assertEqual(literal_prefix("^/users/[0-9]+$"), "/users/")
+        self.assertEqual(literal_prefix("^/users.json$"), "/users")
+
+    def test_escaped_literals(self):
+        self.assertEqual(literal_prefix(r"^/users\.json$"), "/users.json")
+        self.assertEqual(literal_prefix(r"^/users/\d+$"), "/users/")
+
+    def test_quantifiers(self):
+        self.assertEqual(literal_prefix("^/users/?$"), "/users")
+        self.assertEqual(literal_prefix("^/users*$"), "/user")
+        self.assertEqual(literal_prefix("^/users{0,1}$"), "/user")
+        self.assertEqual(literal_prefix("^/users+$"), "/users")
+
+    def test_alternation(self):
+        self.assertEqual(literal_prefix("^/users|/groups$"), "")
+        self.assertEqual(literal_prefix("^/users/(a|b)$"), "/users/")
+        self.assertEqual(literal_prefix("^/users/[|]$"), "/users/")
+
+    def test_has_top_level_alternation(self):
+        self.assertTrue(has_top_level_alternation("/a|/b"))
+        self.assertFalse(has_top_level_alternation("/(a|b)"))
+        self.assertFalse(has_top_level_alternation("/[a|b]"))
+        self.assertFalse(has_top_level_alternation(r"/a\|b"))
+        self.assertFalse(has_top_level_alternation("/[]|]"))
+
+
+class RouteIndexUnitTest(unittest.TestCase):
+
+    @classmethod
+    def _index(cls, routes):
+        return RouteIndex(RequestRouter.generate_route_map(routes))
+
+    def test_unnamed_groups(self):
+        index = self._index([(r"/users/([0-9]+)/posts/([0-9]+)", "posts")])
+        self.assertEqual(index.match("/users/1/posts/2"), ("posts", ("1", "2"), {}))
+
+    def test_named_groups(self):
+        index = self._index([(r"/users/(?P<user_id>[0-9]+)", "user")])
+        self.assertEqual(index.match("/users/1"), ("user", (), {"user_id": "1"}))
+
+    def test_no_match(self):
+        index = self._index([(r"/users/([0-9]+)", "user")])
+        self.assertIsNone(index.match("/users/abc"))
+        self.assertIsNone(index.match("/groups/1"))
+        self.assertIsNone(index.match(""))
+
+    def test_first_match_wins(self):
+        index = self._index([
+            (r"/users/.*", "catch_all"),
+            (r"/users/([0-9]+)", "user"),
+        ])
+        self.assertEqual(index.match("/users/1")[0], "catch_all")
+
+        index = self._index([
+            (r"/users/([0-9]+)", "user"),
+            (r"/users/.*", "catch_all"),
+        ])
+        self.assertEqual(index.match("/users/1")[0], "user")
+        self.assertEqual(index.match("/users/abc")[0], "catch_all")
+
+    def test_first_match_wins_across_trie_depths(self):
+        index = self._index([
+            (r"/(.*)", "root"),
+            (r"/users/(.*)", "users"),
+        ])
+        self.assertEqual(index.match("/users/1")[0], "root")
+
+    def test_partial_segment_prefix(self):
+        index = self._index([
+            (r"/users-([0-9]+)", "dashed"),
+            (r"/users/([0-9]+)", "user"),
+        ])
+        self.assertEqual(index.match("/users-1")[0], "dashed")
+        self.assertEqual(index.match("/users/1")[0], "user")
+
+    def test_top_level_alternation(self):
+        index = self._index([
+            (r"/users/([0-9]+)", "user"),
+            (r"/groups/([0-9]+)|/teams/([0-9]+)", "group"),
+        ])
+        self.assertEqual(index.match("/teams/1"), ("group", (None, "1"), {}))
+
+    def test_candidates_narrowed_by_prefix(self):
+        index = self._index([(r"/resource%i/([0-9]+)" % number, number) for number in range(100)])
+        self.assertEqual(len(index), 100)
+        self.assertEqual(index.candidates("/resource99/1"), (99,))
+        self.assertEqual(index.candidates("/missing/1"), ())
+
+    def test_equivalent_to_linear_scan(self):
+        routes = [
+            (r"/", "root"),
+            (r"/users", "users"),
+            (r"/users/", "users_slash"),
+            (r"/users/?", "users_optional_slash"),
+            (r"/users/([0-9]+)", "user"),
+            (r"/users/(?P<id>[0-9]+)/posts", "posts"),
+            (r"/users/([0-9]+)/posts/([0-9]+)", "post"),
+            (r"/users/me|/me", "me"),
+            (r"/files/(.+)", "file"),
+            (r"/files/static\.css", "static"),
+            (r"(.*)", "fallback"),
+        ]
+        route_map = RequestRouter.generate_route_map(routes)
+        index = RouteIndex(route_map)
+
+        paths = [
+            "", "/", "/users", "/users/", "/users/1", "/users/1/posts", "/users/1/posts/2",
+            "/users/me", "/me", "/files/a/b", "/files/static.css", "/unknown", "users"
+        ]
+
+        for path in paths:
+            expected = None
+            for regexp, handler_class in route_map:
+                if regexp.match(path):
+                    expected = handler_class
+                    break
+
+            matched = index.match(path)
+            self.assertEqual(matched[0] if matched else None, expected, path)
@@ -13,6 +13,9 @@ class DeserializerBaseUnitTest(unittest.TestCase):
     def test_loads(self):
         self.assertRaises(NotImplementedError, Base().loads, None)
 
+    def test_accepts_bytes(self):
+        self.assertTrue(Base().accepts_bytes())
+
     def test_content_type(self):
         self.assertRaises(NotImplementedError, Base().content_type)
 
@@ -26,6 +29,18 @@ class DeserializerJSONUnitTest(unittest.TestCase):
 
     def test_loads_fail(self):
         self.assertRaises(exception.DeSerializationFailedError, JSON().loads, "string")
+        self.assertRaises(exception.DeSerializationFailedError, JSON().loads, b"string")
+
+    def test_loads_bytes(self):
+        self.assertEqual(JSON().loads(b'{"key": "value"}'), {"key": "value"})
+        self.assertEqual(JSON(backend="json").loads(b'{"key": "value"}'), {"key": "value"})
+        self.assertEqual(JSON().loads(u'{"key": "\u00e9"}'.encode("utf-8")), {"key": u"\u00e9"})
+
+    def test_loads_big_integer(self):
+        self.assertEqual(JSON().loads(b'{"id": 123456789012345678901234567890}'), {"id": 123456789012345678901234567890})
+
+    def test_accepts_bytes(self):
+        self.assertTrue(JSON().accepts_bytes())
 
     def test_content_type(self):
         self.assertEqual(JSON().content_type(), "application/json")
@@ -0,0 +1,103 @@
+import unittest
+
+from prestans import json_backend
+
+
+class GetBackendUnitTest(unittest.TestCase):
+
+    def test_default_is_first_installed(self):
+        installed = list()
+        for backend_class in json_backend.BACKENDS:
+            try:
+                installed.append(json_backend.get_backend(backend_class.name))
+            except ImportError:
+                pass
+
+        self.assertIs(json_backend.get_backend(), installed[0])
+
+    def test_by_name(self):
+        backend = json_backend.get_backend("json")
+        self.assertIsInstance(backend, json_backend.Stdlib)
+        self.assertIs(json_backend.get_backend("json"), backend)
+
+    def test_unknown(self):
+        self.assertRaises(ValueError, json_backend.get_backend, "unknown")
+
+    def test_base(self):
+        self.assertRaises(NotImplementedError, json_backend.Backend().dumps, {})
+        self.assertRaises(NotImplementedError, json_backend.Backend().loads, "{}")
+
+
+class StdlibUnitTest(unittest.TestCase):
+
+    def test_dumps(self):
+        backend = json_backend.Stdlib()
+        self.assertEqual(backend.dumps({"b": 1, "a": [1, None]}), b'{"a":[1,null],"b":1}')
+        self.assertEqual(backend.dumps({"b": 1, "a": 2}, sort_keys=False), b'{"b":1,"a":2}')
+        self.assertEqual(backend.dumps(u"é"), u'"é"'.encode("utf-8"))
+
+    def test_loads(self):
+        backend = json_backend.Stdlib()
+        self.assertEqual(backend.loads(b'{"key": "value"}'), {"key": "value"})
+        self.assertEqual(backend.loads('{"key": "value"}'), {"key": "value"})
+        self.assertEqual(backend.loads(u'"é"'.encode("utf-8")), u"é")
+
+
+class InstalledBackendsUnitTest(unittest.TestCase):
+    """
+    Every installed backend reads and writes what Stdlib does
+    """
+
+    def setUp(self):
+        self.stdlib = json_backend.Stdlib()
+        self.backends = list()
+
+        for backend_class in json_backend.BACKENDS:
+            try:
+                self.backends.append(json_backend.get_backend(backend_class.name))
+            except ImportError:
+                pass
+
+    def assert_dumps_same(self, serializable_object, sort_keys=True):
+        expected = self.stdlib.dumps(serializable_object, sort_keys)
+
+        for backend in self.backends:
+            self.assertEqual(backend.dumps(serializable_object, sort_keys), expected, backend.name)
+
+    def assert_loads_same(self, input_string):
+        expected = self.stdlib.loads(input_string)
+
+        for backend in self.backends:
+            loaded = backend.loads(input_string)
+            self.assertEqual(repr(loaded), repr(expected), backend.name)
+
+    def test_dumps_big_integers(self):
+        self.assert_dumps_same(2 ** 64)
+        self.assert_dumps_same({"a": [1, 2 ** 100, None], "b": -2 ** 63 - 1})
+
+    def test_loads_big_integers(self):
+        self.assert_loads_same(b"123456789012345678901234567890")
+        self.assert_loads_same(b'{"a": [-9223372036854775809, null], "b": 18446744073709551616}')
+        self.assert_loads_same(u'[123456789012345678901234567890]')
+
+    def test_dumps_nan_and_infinity(self):
+        self.assert_dumps_same(float("nan"))
+        self.assert_dumps_same({"a": [1.5, float("inf"), None], "b": {"c": float("-inf")}})
+        self.assert_dumps_same({"a": 1.5, "b": None})
+
+    def test_loads_nan_and_infinity(self):
+        self.assert_loads_same(b'[NaN, Infinity, -Infinity, null]')
+
+    def test_non_ascii(self):
+        self.assert_dumps_same({u"ké": [u"é", u"日本語", u" "]})
+        self.assert_loads_same(u'{"ké": ["é", "日本語"]}'.encode("utf-8"))
+        self.assert_loads_same(u'{"ké": ["é", "日本語"]}')
+
+    def test_dumps_unsorted_keys(self):
+        self.assert_dumps_same({"b": 1, "a": {"d": None, "c": 2}}, sort_keys=False)
+        self.assert_dumps_same({"b": 2 ** 70, "a": float("nan")}, sort_keys=False)
+
+    def test_invalid(self):
+        for backend in self.backends:
+            self.assertRaises(ValueError, backend.loads, b'{"a": }')
+            self.assertRaises(TypeError, backend.dumps, {"a": object()})
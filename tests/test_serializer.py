@@ -1,9 +1,9 @@
-import json
 import plistlib
 import sys
 import unittest
 
 from prestans import exception
+from prestans import json_backend
 from prestans.serializer import Base
 from prestans.serializer import JSON
 from prestans.serializer import XMLPlist
@@ -15,6 +15,9 @@ class SerializerBaseUnitTest(unittest.TestCase):
     def test_dumps(self):
         self.assertRaises(NotImplementedError, Base().dumps, None)
 
+    def test_dumps_iter_writes_single_chunk(self):
+        self.assertEqual(list(XMLPlist().dumps_iter(iter([1, 2, 3]))), [XMLPlist().dumps([1, 2, 3])])
+
     def test_handler_body_type(self):
         self.assertRaises(NotImplementedError, Base().handler_body_type)
 
@@ -25,8 +28,34 @@ class SerializerBaseUnitTest(unittest.TestCase):
 class SerializerJSONUnitTest(unittest.TestCase):
 
     def test_dumps_success(self):
-        self.assertEqual(JSON().dumps({}), json.dumps({}))
-        self.assertEqual(JSON().dumps({"key": "value"}), json.dumps({"key": "value"}))
+        self.assertEqual(JSON().dumps({}), b"{}")
+        self.assertEqual(JSON().dumps({"key": "value"}), b'{"key":"value"}')
+        self.assertEqual(JSON().dumps({"b": [1, 2.5, None], "a": True}), b'{"a":true,"b":[1,2.5,null]}')
+        self.assertEqual(JSON().dumps({"key": u"\u00e9"}), u'{"key":"\u00e9"}'.encode("utf-8"))
+        self.assertEqual(JSON().dumps({"id": 2 ** 70}), b'{"id":1180591620717411303424}')
+
+    def test_dumps_key_order(self):
+        serializable_object = {"b": 1, "a": {"d": 2, "c": 3}}
+
+        self.assertEqual(JSON().dumps(serializable_object), b'{"a":{"c":3,"d":2},"b":1}')
+        self.assertEqual(JSON(sort_keys=False).dumps(serializable_object), b'{"b":1,"a":{"d":2,"c":3}}')
+
+    def test_emits_bytes(self):
+        self.assertFalse(Base().emits_bytes())
+        self.assertTrue(JSON().emits_bytes())
+        self.assertTrue(XMLPlist().emits_bytes())
+
+    def test_backends_write_the_same_output(self):
+        serializable_object = {"b": [1, 2.5, None, False], "a": {"d": u"\u00e9", "c": "/"}}
+        expected = JSON(backend="json").dumps(serializable_object)
+
+        for backend_class in json_backend.BACKENDS:
+            try:
+                backend = json_backend.get_backend(backend_class.name)
+            except ImportError:
+                continue
+
+            self.assertEqual(JSON(backend=backend).dumps(serializable_object), expected)
 
     def test_dumps_fail(self):
         class PythonObject(object):
@@ -34,6 +63,42 @@ class SerializerJSONUnitTest(unittest.TestCase):
 
         self.assertRaises(exception.SerializationFailedError, JSON().dumps, PythonObject)
 
+    def test_dumps_iter_matches_dumps(self):
+        for length in [0, 1, 2, 3, 7]:
+            elements = [{"key": index, "value": u"\u00e9"} for index in range(length)]
+
+            for batch_size in [1, 2, 3, 100]:
+                chunks = list(JSON().dumps_iter(iter(elements), batch_size))
+                self.assertEqual(b"".join(chunks), JSON().dumps(elements))
+
+    def test_dumps_iter_batches(self):
+        chunks = list(JSON().dumps_iter(iter([1, 2, 3, 4, 5]), 2))
+        self.assertEqual(chunks, [b"[1,2", b",3,4", b",5]"])
+
+        chunks = list(JSON().dumps_iter(iter([1, 2, 3, 4]), 2))
+        self.assertEqual(chunks, [b"[1,2", b",3,4", b"]"])
+
+        self.assertEqual(list(JSON().dumps_iter(iter([]), 2)), [b"[]"])
+
+    def test_dumps_iter_is_lazy(self):
+        consumed = list()
+
+        def elements():
+            for index in range(4):
+                consumed.append(index)
+                yield index
+
+        chunks = JSON().dumps_iter(elements(), 2)
+        self.assertEqual(consumed, [])
+        self.assertEqual(next(chunks), b"[0,1")
+        self.assertEqual(consumed, [0, 1])
+
+    def test_dumps_iter_fail(self):
+        class PythonObject(object):
+            pass
+
+        self.assertRaises(exception.SerializationFailedError, list, JSON().dumps_iter(iter([PythonObject])))
+
     def test_handler_body_type(self):
         self.assertEqual(JSON().handler_body_type(), DataCollection)
 
@@ -1,4 +1,6 @@
+import array as pyarray
 import unittest
+from datetime import date
 
 from prestans import exception
 from prestans import types
@@ -228,6 +230,204 @@ class ArrayAppend(unittest.TestCase):
         validated = array.validate([my_model.as_serializable()])
         self.assertEqual(validated.as_serializable(), [{"name": "alice"}])
 
+    def test_append_uses_element_template_constraints(self):
+        array = types.Array(element_template=types.Integer(maximum=10))
+        array.append("5")
+        self.assertEqual(array[0], 5)
+
+        self.assertRaises(exception.MoreThanMaximumError, array.append, 11)
+        self.assertEqual(len(array), 1)
+
+    def test_append_rejects_none_for_optional_template(self):
+        array = types.Array(element_template=types.DateTime(required=False))
+        self.assertRaises(exception.RequiredAttributeError, array.append, None)
+
+
+class ArrayExtend(unittest.TestCase):
+
+    def test_extend_data_type(self):
+        array = types.Array(element_template=types.Integer(minimum=0))
+        array.append(1)
+
+        array.extend(["2", 3])
+        self.assertEqual(list(array), [1, 2, 3])
+
+    def test_extend_data_structure(self):
+        array = types.Array(element_template=types.Date())
+        array.extend(["2018-01-04", date(2018, 1, 5)])
+        self.assertEqual(list(array), [date(2018, 1, 4), date(2018, 1, 5)])
+
+    def test_extend_model(self):
+        class MyModel(types.Model):
+            name = types.String()
+
+        array = types.Array(element_template=MyModel())
+        array.extend([MyModel(name="alice"), MyModel(name="bob")])
+        self.assertEqual(array.as_serializable(), [{"name": "alice"}, {"name": "bob"}])
+
+        self.assertRaises(TypeError, array.extend, [MyModel(name="carol"), "string"])
+        self.assertEqual(len(array), 2)
+
+    def test_extend_invalid_element_appends_nothing(self):
+        array = types.Array(element_template=types.String(choices=["apple", "banana"]))
+        self.assertRaises(exception.InvalidChoiceError, array.extend, ["apple", "orange"])
+        self.assertEqual(len(array), 0)
+
+        array = types.Array(element_template=types.Time(required=False))
+        self.assertRaises(exception.RequiredAttributeError, array.extend, ["10:00:00", None])
+        self.assertEqual(len(array), 0)
+
+    def test_extend_max_length(self):
+        array = types.Array(element_template=types.Integer(), max_length=3)
+        array.extend([1, 2])
+
+        self.assertRaises(exception.MoreThanMaximumError, array.extend, [3, 4])
+        self.assertEqual(list(array), [1, 2])
+
+        array.extend([3])
+        self.assertEqual(list(array), [1, 2, 3])
+
+    def test_elements(self):
+        array = types.Array(element_template=types.Float(), elements=[1, "2.5"])
+        self.assertEqual(list(array), [1.0, 2.5])
+
+        self.assertRaises(
+            exception.LessThanMinimumError, types.Array, element_template=types.Float(), min_length=3, elements=[1]
+        )
+        self.assertRaises(
+            exception.MoreThanMaximumError, types.Array, element_template=types.Float(), max_length=1, elements=[1, 2]
+        )
+        self.assertEqual(len(types.Array(element_template=types.Float(), min_length=3)), 0)
+
+
+class ArrayTyped(unittest.TestCase):
+
+    def test_typed(self):
+        self.assertFalse(types.Array(element_template=types.Integer()).typed)
+        self.assertIsNone(types.Array(element_template=types.Integer()).buffer)
+
+        for element_template in [types.Integer(), types.Float(), types.Boolean()]:
+            self.assertTrue(types.Array(element_template=element_template, typed=True).typed)
+
+        self.assertRaises(TypeError, types.Array, element_template=types.String(), typed=True)
+
+    def test_append_and_extend(self):
+        array = types.Array(element_template=types.Integer(maximum=10), typed=True)
+        array.append(1)
+        array.extend([2, "3"])
+
+        self.assertEqual(array.buffer, pyarray.array("q", [1, 2, 3]))
+        self.assertEqual(list(array), [1, 2, 3])
+        self.assertEqual(array[1], 2)
+        self.assertTrue(3 in array)
+
+        self.assertRaises(exception.MoreThanMaximumError, array.append, 11)
+        self.assertRaises(exception.MoreThanMaximumError, array.extend, [4, 11])
+        self.assertEqual(len(array), 3)
+
+        array.remove(2)
+        self.assertEqual(list(array), [1, 3])
+
+    def test_boolean_elements(self):
+        array = types.Array(element_template=types.Boolean(), typed=True, elements=[True, False])
+        self.assertEqual(list(array), [True, False])
+        self.assertIs(array[0], True)
+        self.assertEqual(array.as_serializable(), [True, False])
+
+    def test_from_buffer(self):
+        buffer = pyarray.array("d", [1.5, 2.5])
+        array = types.Array.from_buffer(types.Float(minimum=0), buffer)
+        self.assertIs(array.buffer, buffer)
+        self.assertEqual(array.as_serializable(), [1.5, 2.5])
+
+        self.assertRaises(exception.LessThanMinimumError, types.Array.from_buffer,
+                          types.Float(minimum=2), buffer)
+        self.assertRaises(exception.LessThanMinimumError, types.Array.from_buffer,
+                          types.Float(), buffer, min_length=3)
+        self.assertRaises(exception.MoreThanMaximumError, types.Array.from_buffer,
+                          types.Float(), buffer, max_length=1)
+
+    def test_from_buffer_copied_on_write(self):
+        buffer = bytearray(pyarray.array("q", [1, 2]).tobytes())
+        array = types.Array.from_buffer(types.Integer(), buffer)
+        self.assertIsInstance(array.buffer, memoryview)
+
+        array.append(3)
+        self.assertEqual(array.buffer, pyarray.array("q", [1, 2, 3]))
+        self.assertEqual(bytes(buffer), pyarray.array("q", [1, 2]).tobytes())
+
+    def test_clone(self):
+        array = types.Array.from_buffer(types.Integer(), pyarray.array("q", [1, 2]))
+        clone = array.clone()
+
+        clone.append(3)
+        self.assertEqual(list(array), [1, 2])
+        self.assertEqual(list(clone), [1, 2, 3])
+
+    def test_model_attribute(self):
+        class MyModel(types.Model):
+            values = types.Array(element_template=types.Float(), typed=True)
+
+        my_model = MyModel()
+        my_model.values = [1, "2.5"]
+        self.assertTrue(my_model.values.typed)
+        self.assertEqual(my_model.as_serializable(), {"values": [1.0, 2.5]})
+
+        validated = MyModel().validate({"values": [3, 4]})
+        self.assertEqual(validated.values.buffer, pyarray.array("d", [3, 4]))
+        self.assertEqual(list(validated.values.iter_serializable()), [3.0, 4.0])
+
+        my_model.values = types.Array.from_buffer(types.Float(), pyarray.array("d", [5]))
+        self.assertEqual(my_model.as_serializable(), {"values": [5.0]})
+
+
+class ArrayFromIterable(unittest.TestCase):
+
+    def test_iteration_consumes(self):
+        produced = []
+
+        def strings():
+            for value in ["a", "b", "c"]:
+                produced.append(value)
+                yield value
+
+        array = types.Array.from_iterable(types.String(), strings())
+        self.assertTrue(array.lazy)
+        self.assertEqual(produced, [])
+
+        self.assertEqual(list(array.iter_serializable()), ["a", "b", "c"])
+        self.assertFalse(array.lazy)
+        self.assertEqual(len(array), 0)
+
+    def test_materializes(self):
+        array = types.Array.from_iterable(types.Integer(), iter([1, 2, 3]))
+        self.assertEqual(len(array), 3)
+        self.assertFalse(array.lazy)
+        self.assertEqual(array[2], 3)
+        self.assertTrue(2 in array)
+        self.assertEqual(list(array), [1, 2, 3])
+        self.assertEqual(list(array), [1, 2, 3])
+
+        array.append(4)
+        self.assertEqual(array.as_serializable(), [1, 2, 3, 4])
+
+    def test_clone_keeps_elements(self):
+        array = types.Array.from_iterable(types.Integer(), iter([1, 2]))
+
+        clone = array.clone()
+        self.assertEqual(clone.as_serializable(), [1, 2])
+        self.assertEqual(array.as_serializable(), [1, 2])
+
+    def test_elements_checked_when_produced(self):
+        array = types.Array.from_iterable(types.Integer(maximum=2), iter([1, 2, 3]))
+        self.assertRaises(exception.MoreThanMaximumError, list, array)
+
+        class MyModel(types.Model):
+            pass
+
+        array = types.Array.from_iterable(MyModel(), iter([MyModel(), "string"]))
+        self.assertRaises(TypeError, array.as_serializable)
+
 
 class ArrayValidate(unittest.TestCase):
 
@@ -483,3 +683,53 @@ class ArrayGetAttributeFilter(unittest.TestCase):
         self.assertTrue("cat" in attribute_filter)
         self.assertFalse("dog" in attribute_filter)
         self.assertTrue(attribute_filter.cat)
+
+
+class ArrayClone(unittest.TestCase):
+
+    def test_clone_scalar(self):
+        element_template = types.String()
+        array = types.Array(element_template=element_template, min_length=1, max_length=5, description="tags")
+        array.append(["a", "b"])
+
+        clone = array.clone()
+        self.assertIs(clone.element_template, element_template)
+        self.assertEqual(clone.min_length, 1)
+        self.assertEqual(clone.max_length, 5)
+        self.assertEqual(clone.description, "tags")
+        self.assertEqual(clone.as_serializable(), ["a", "b"])
+
+        clone.append("c")
+        self.assertEqual(len(array), 2)
+
+    def test_clone_models(self):
+        class MyModel(types.Model):
+            name = types.String()
+
+        array = types.Array(element_template=MyModel())
+        array.append(MyModel(name="first"))
+
+        clone = array.clone()
+        self.assertIsNot(clone[0], array[0])
+        self.assertEqual(clone.as_serializable(), array.as_serializable())
+
+        clone[0].name = "changed"
+        self.assertEqual(array[0].name, "first")
+
+
+class ArrayIterSerializable(unittest.TestCase):
+
+    def test_matches_as_serializable(self):
+        class MyModel(types.Model):
+            name = types.String()
+
+        array = types.Array(element_template=MyModel())
+        array.append([MyModel(name="first"), MyModel(name="second")])
+
+        serializable = array.iter_serializable(minified=True)
+        self.assertEqual(next(serializable), {"a": "first"})
+        self.assertEqual(list(serializable), [{"a": "second"}])
+
+        strings = types.Array(element_template=types.String())
+        strings.append(["a", "b"])
+        self.assertEqual(list(strings.iter_serializable()), ["a", "b"])
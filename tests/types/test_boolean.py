@@ -71,3 +71,10 @@ class BooleanUnitTest(unittest.TestCase):
         self.assertRaises(exception.ParseFailedError, boolean.validate, "string")
         self.assertRaises(exception.ParseFailedError, boolean.validate, 23)
         self.assertRaises(exception.ParseFailedError, boolean.validate, 34.67)
+
+    def test_default_assigned_after_construction(self):
+        boolean = Boolean(required=False)
+        self.assertEqual(boolean.validate(None), None)
+
+        boolean._default = True
+        self.assertEqual(boolean.validate(None), True)
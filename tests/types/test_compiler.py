@@ -0,0 +1,253 @@
+import gc
+import unittest
+
+from mock import patch
+
+from prestans import exception
+from prestans.parser import AttributeFilter
+from prestans import types
+from prestans.types.compiler import compile_serializer
+from prestans.types.compiler import filter_signature
+from prestans.types.schema import ModelSchema
+
+
+class Address(types.Model):
+    street_name = types.String()
+    post_code = types.String(required=False)
+
+
+class Person(types.Model):
+    first_name = types.String()
+    age = types.Integer(required=False)
+    birthday = types.Date(required=False)
+    address = Address(required=False)
+    addresses = types.Array(element_template=Address())
+    tags = types.Array(element_template=types.String())
+
+
+class CompiledAddress(Address):
+    __compiled__ = True
+
+
+class CompiledPerson(Person):
+    __compiled__ = True
+
+    address = CompiledAddress(required=False)
+    addresses = types.Array(element_template=CompiledAddress())
+
+
+def _populate(person, address_class):
+    person.first_name = "Jane"
+    person.age = 42
+    person.birthday = "1975-04-01"
+    person.address = address_class(street_name="Main", post_code="3000")
+    person.addresses.append(address_class(street_name="First"))
+    person.addresses.append(address_class(street_name="Second", post_code="3001"))
+    person.tags.append(["a", "b"])
+    return person
+
+
+class CompileSerializerUnitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.generic = _populate(Person(), Address)
+        self.compiled = _populate(CompiledPerson(), CompiledAddress)
+
+    def test_matches_generic_serialization(self):
+        self.assertEqual(self.compiled.as_serializable(), self.generic.as_serializable())
+
+    def test_matches_generic_serialization_minified(self):
+        self.assertEqual(self.compiled.as_serializable(minified=True), self.generic.as_serializable(minified=True))
+
+    def test_matches_generic_serialization_filtered(self):
+        attribute_filter = AttributeFilter.from_model(Person(), default_value=False)
+        attribute_filter.first_name = True
+        attribute_filter.address.post_code = True
+        attribute_filter.addresses.street_name = True
+
+        for minified in [False, True]:
+            self.assertEqual(
+                self.compiled.as_serializable(attribute_filter, minified),
+                self.generic.as_serializable(attribute_filter, minified)
+            )
+
+    def test_missing_values(self):
+        self.assertEqual(CompiledPerson().as_serializable(), Person().as_serializable())
+
+        empty = CompiledPerson()
+        empty.address = None
+        serialized = empty.as_serializable()
+        self.assertIsNone(serialized["address"])
+        self.assertEqual(serialized["addresses"], [])
+
+    def test_non_prestans_members(self):
+        class MyModel(types.Model):
+            __compiled__ = True
+            name = types.String()
+            nothing = None
+
+        self.assertEqual(MyModel(name="name").as_serializable(), {"name": "name", "nothing": None})
+
+    def test_serializers_are_cached(self):
+        schema = ModelSchema.for_class(CompiledPerson)
+        attribute_filter = AttributeFilter.from_model(Person(), default_value=True).as_immutable()
+
+        self.assertIs(schema.serializer(), schema.serializer())
+        self.assertIs(schema.serializer(minified=True), schema.serializer(minified=True))
+        self.assertIsNot(schema.serializer(), schema.serializer(minified=True))
+        self.assertIs(schema.serializer(attribute_filter), schema.serializer(attribute_filter))
+        self.assertIsNot(schema.serializer(attribute_filter), schema.serializer())
+
+    def test_filtered_serializers_released_with_filter(self):
+        schema = ModelSchema.for_class(CompiledPerson)
+        attribute_filter = AttributeFilter.from_model(Person(), default_value=True).as_immutable()
+
+        schema.serializer(attribute_filter)
+        self.assertEqual(len(schema._filtered_serializers), 1)
+
+        del attribute_filter
+        gc.collect()
+        self.assertEqual(len(schema._filtered_serializers), 0)
+
+    def test_class_changes_recompile(self):
+        class MyModel(types.Model):
+            __compiled__ = True
+            name = types.String()
+
+        my_model = MyModel(name="name")
+        self.assertEqual(my_model.as_serializable(), {"name": "name"})
+
+        MyModel.nickname = types.String(required=False)
+        self.assertEqual(MyModel(name="name").as_serializable(), {"name": "name", "nickname": None})
+
+    def test_hidden_attributes_are_not_compiled(self):
+        attribute_filter = AttributeFilter.from_model(Person(), default_value=False)
+        attribute_filter.first_name = True
+
+        serializer = compile_serializer(ModelSchema.for_class(Person), attribute_filter.as_immutable())
+        self.assertIn("first_name", serializer.source)
+        self.assertNotIn("addresses", serializer.source)
+        self.assertEqual(serializer(self.generic), {"first_name": "Jane"})
+
+    def test_array_of_subclasses(self):
+        class SpecialAddress(CompiledAddress):
+            __compiled__ = False
+
+        addresses = types.Array(element_template=CompiledAddress())
+        addresses.append(CompiledAddress(street_name="First"))
+        addresses.append(SpecialAddress(street_name="Second"))
+
+        self.assertEqual(addresses.as_serializable(), [
+            {"street_name": "First", "post_code": None},
+            {"street_name": "Second", "post_code": None}
+        ])
+
+    def test_nested_serializer_resolved_on_first_use(self):
+        class Node(types.Model):
+            __compiled__ = True
+            name = types.String()
+
+        Node.child = Node(required=False)
+
+        root = Node(name="root")
+        root.child = Node(name="child")
+        root.child.child = None
+
+        self.assertEqual(root.as_serializable(), {"name": "root", "child": {"name": "child", "child": None}})
+
+
+class CompileValidatorUnitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.value = _populate(Person(), Address).as_serializable()
+
+    def assertValidatesLikeGeneric(self, value, attribute_filter=None, minified=False):
+        generic = Person().validate(value, attribute_filter, minified)
+        compiled = CompiledPerson().validate(value, attribute_filter, minified)
+
+        self.assertIsInstance(compiled, CompiledPerson)
+        self.assertEqual(compiled.as_serializable(), generic.as_serializable())
+
+    def test_matches_generic_validation(self):
+        self.assertValidatesLikeGeneric(self.value)
+
+    def test_matches_generic_validation_minified(self):
+        minified_value = _populate(Person(), Address).as_serializable(minified=True)
+        self.assertValidatesLikeGeneric(minified_value, minified=True)
+
+    def test_matches_generic_validation_filtered(self):
+        attribute_filter = AttributeFilter.from_model(Person(), default_value=False)
+        attribute_filter.first_name = True
+        attribute_filter.address.street_name = True
+        attribute_filter.addresses.street_name = True
+
+        self.assertValidatesLikeGeneric(self.value, attribute_filter)
+        self.assertValidatesLikeGeneric(self.value, attribute_filter.as_immutable())
+
+        validated = CompiledPerson().validate(self.value, attribute_filter)
+        self.assertIsNone(validated.age)
+        self.assertIsNone(validated.address.post_code)
+        self.assertEqual(validated.addresses[1].street_name, "Second")
+        self.assertIsNone(validated.addresses[1].post_code)
+
+    def test_missing_optional_values(self):
+        value = {"first_name": "Jane", "address": {}, "addresses": [], "tags": []}
+        self.assertValidatesLikeGeneric(value)
+        self.assertIsNone(CompiledPerson().validate(value)._attributes["address"])
+
+    def test_validation_errors(self):
+        value = dict(self.value)
+        value["age"] = "not a number"
+
+        with self.assertRaises(exception.ValidationError) as context:
+            CompiledPerson().validate(value)
+        self.assertEqual(str(context.exception).split()[0], "age")
+
+        value = dict(self.value)
+        value["addresses"] = [{"post_code": "3000"}]
+
+        with self.assertRaises(exception.ValidationError) as context:
+            CompiledPerson().validate(value)
+        self.assertEqual(str(context.exception).split()[0], "street_name")
+
+        value = dict(self.value)
+        del value["first_name"]
+        self.assertRaises(exception.ValidationError, CompiledPerson().validate, value)
+
+    def test_required(self):
+        self.assertRaises(exception.RequiredAttributeError, CompiledPerson().validate, None)
+        self.assertIsNone(CompiledPerson(required=False).validate({}))
+
+    def test_does_not_create_default_instance(self):
+        template = CompiledPerson()
+
+        with patch.object(CompiledPerson, "__init__") as init:
+            validated = template.validate(self.value)
+            init.assert_not_called()
+
+        self.assertEqual(validated.first_name, "Jane")
+        self.assertEqual(validated.addresses[0].street_name, "First")
+
+    def test_validators_cached_by_filter_signature(self):
+        schema = ModelSchema.for_class(CompiledPerson)
+
+        first_filter = AttributeFilter.from_model(Person(), default_value=True)
+        second_filter = AttributeFilter.from_model(Person(), default_value=True)
+
+        self.assertEqual(filter_signature(first_filter), filter_signature(second_filter))
+        self.assertEqual(filter_signature(first_filter), filter_signature(first_filter.as_immutable()))
+        self.assertIs(schema.validator(first_filter), schema.validator(second_filter))
+        self.assertIs(schema.validator(), schema.validator())
+        self.assertIsNot(schema.validator(), schema.validator(minified=True))
+
+        second_filter.age = False
+        self.assertNotEqual(filter_signature(first_filter), filter_signature(second_filter))
+        self.assertIsNot(schema.validator(first_filter), schema.validator(second_filter))
+
+    def test_non_prestans_members(self):
+        class MyModel(types.Model):
+            __compiled__ = True
+            name = types.String()
+            nothing = None
+
+        self.assertRaises(TypeError, MyModel(name="name").validate, {"name": "name"})
@@ -22,3 +22,6 @@ class DataCollectionUnitTest(unittest.TestCase):
 
     def test_get_attribute_filter(self):
         self.assertRaises(NotImplementedError, DataCollection().get_attribute_filter)
+
+    def test_clone(self):
+        self.assertRaises(NotImplementedError, DataCollection().clone)
@@ -1,6 +1,13 @@
+import copy
+import pickle
 import unittest
 
+from prestans import exception
+from prestans.types import Array
 from prestans.types import DataType
+from prestans.types import Integer
+from prestans.types import ScalarType
+from prestans.types import String
 
 
 class DataTypeUnitTest(unittest.TestCase):
@@ -9,4 +16,54 @@ class DataTypeUnitTest(unittest.TestCase):
         self.assertRaises(NotImplementedError, DataType().blueprint)
 
     def test_validate(self):
-        self.assertRaises(NotImplementedError, DataType().validate, "data")
\ No newline at end of file
+        self.assertRaises(NotImplementedError, DataType().validate, "data")
+
+
+class ScalarTypeUnitTest(unittest.TestCase):
+
+    def test_validate(self):
+        self.assertRaises(NotImplementedError, ScalarType().validate, "data")
+
+    def test_compiled_once(self):
+        string = String()
+
+        string.validate("apple")
+        validator = string._validator
+        self.assertIs(string.validate, validator)
+        string.validate("banana")
+        self.assertIs(string._validator, validator)
+
+    def test_overridden_validate(self):
+
+        class Lowercase(String):
+            def validate(self, value):
+                return super(Lowercase, self).validate(value).lower()
+
+        string = Lowercase()
+        self.assertEqual(string.validate("Apple"), "apple")
+        self.assertEqual(string.validate("Banana"), "banana")
+        self.assertIsNotNone(string._validator)
+
+    def test_assignment_recompiles(self):
+        string = String(required=False)
+        self.assertEqual(string.validate(None), None)
+
+        string._required = True
+        self.assertRaises(exception.RequiredAttributeError, string.validate, None)
+
+    def test_array_element_template_required(self):
+        element_template = Integer(required=False)
+        element_template.validate(None)
+
+        Array(element_template=element_template)
+        self.assertRaises(exception.RequiredAttributeError, element_template.validate, None)
+
+    def test_copy_and_pickle(self):
+        string = String(format="^[a-z]+$", choices=["apple"])
+        string.validate("apple")
+
+        for copied in [copy.deepcopy(string), pickle.loads(pickle.dumps(string))]:
+            self.assertNotIn("_validator", copied.__dict__)
+            self.assertNotIn("validate", copied.__dict__)
+            self.assertEqual(copied.validate("apple"), "apple")
+            self.assertRaises(exception.InvalidChoiceError, copied.validate, "banana")
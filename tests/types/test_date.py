@@ -120,3 +120,10 @@ class DateUnitTest(unittest.TestCase):
         custom_format = Date(format="%Y/%m/%d")
         self.assertRaises(exception.InvalidTypeError, custom_format.as_serializable, "string")
         self.assertEqual(custom_format.as_serializable(date(2018, 4, 15)), "2018/04/15")
+
+    def test_parse_falls_back_to_strptime(self):
+        date_type = Date()
+        self.assertEqual(date_type.validate("2018-03-05"), date(2018, 3, 5))
+        self.assertEqual(date_type.validate("2018-3-5"), date(2018, 3, 5))
+        self.assertRaises(exception.ParseFailedError, date_type.validate, "2018-02-30")
+        self.assertEqual(date_type.as_serializable(date(2018, 3, 5)), "2018-03-05")
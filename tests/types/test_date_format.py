@@ -0,0 +1,58 @@
+import unittest
+from datetime import date
+from datetime import datetime
+from datetime import time
+
+from prestans.types.date_format import DATE_FIELDS
+from prestans.types.date_format import TIME_FIELDS
+from prestans.types.date_format import compile_date_format
+
+
+class CompileDateFormatUnitTest(unittest.TestCase):
+
+    def test_numeric_formats(self):
+        for format in ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S.%fZ", "%d-%m-%Y", "%H:%M"]:
+            self.assertEqual(compile_date_format(format).format, format)
+
+    def test_unsupported_formats(self):
+        self.assertIsNone(compile_date_format(None))
+        self.assertIsNone(compile_date_format(""))
+        self.assertIsNone(compile_date_format("%d/%m/%Y"))
+        self.assertIsNone(compile_date_format("%Y-%m-%d %H:%M:%S %p"))
+        self.assertIsNone(compile_date_format("%Y-%m-%d %Z"))
+        self.assertIsNone(compile_date_format("%Y%%"))
+        self.assertIsNone(compile_date_format("%Y-%Y"))
+        self.assertIsNone(compile_date_format("-"))
+
+    def test_allowed_fields(self):
+        self.assertIsNotNone(compile_date_format("%Y-%m-%d", DATE_FIELDS))
+        self.assertIsNone(compile_date_format("%Y-%m-%d %H", DATE_FIELDS))
+        self.assertIsNotNone(compile_date_format("%H:%M:%S.%f", TIME_FIELDS))
+        self.assertIsNone(compile_date_format("%Y %H:%M:%S", TIME_FIELDS))
+
+    def test_parse(self):
+        date_format = compile_date_format("%Y-%m-%d %H:%M:%S")
+        self.assertEqual(date_format.parse("2018-01-04 12:34:56"), [2018, 1, 4, 12, 34, 56, 0])
+
+        # anything but the fixed width form is left to strptime
+        self.assertIsNone(date_format.parse("2018-1-04 12:34:56"))
+        self.assertIsNone(date_format.parse("2018-01-04  12:34:56"))
+        self.assertIsNone(date_format.parse("2018-01-04 12:34:56 "))
+        self.assertIsNone(date_format.parse("2018-01-04"))
+
+    def test_parse_defaults(self):
+        self.assertEqual(compile_date_format("%d-%m").parse("04-01"), [1900, 1, 4, 0, 0, 0, 0])
+        self.assertEqual(compile_date_format("%H:%M:%S.%f").parse("12:34:56.000120"), [1900, 1, 1, 12, 34, 56, 120])
+
+    def test_format_value(self):
+        value = datetime(2018, 1, 4, 2, 3, 4, 50)
+
+        for format in ["%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S.%fZ", "%d-%m-%Y"]:
+            self.assertEqual(compile_date_format(format).format_value(value), value.strftime(format))
+
+        self.assertEqual(compile_date_format("%Y-%m-%d").format_value(date(2018, 1, 4)), "2018-01-04")
+        self.assertEqual(compile_date_format("%H:%M").format_value(time(9, 5)), "09:05")
+
+    def test_format_value_early_year(self):
+        value = date(18, 1, 4)
+        self.assertEqual(compile_date_format("%Y-%m-%d").format_value(value), value.strftime("%Y-%m-%d"))
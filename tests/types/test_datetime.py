@@ -166,3 +166,12 @@ class DateTimeUnitTest(unittest.TestCase):
         custom_format = DateTime(format="%Y-%m-%d %H:%M:%S %p")
         self.assertRaises(exception.InvalidTypeError, custom_format.as_serializable, "string")
         self.assertEqual(custom_format.as_serializable(datetime(2018, 4, 15, 10, 12, 14)), "2018-04-15 10:12:14 AM")
+
+    def test_parse_falls_back_to_strptime(self):
+        date_time = DateTime()
+        self.assertEqual(date_time.validate("2018-1-4 12:34:00"), datetime(2018, 1, 4, 12, 34))
+        self.assertRaises(exception.ParseFailedError, date_time.validate, "2018-02-30 12:34:00")
+
+        iso_format = DateTime(format="%Y-%m-%dT%H:%M:%S.%fZ")
+        value = datetime(2018, 1, 4, 12, 34, 56, 789)
+        self.assertEqual(iso_format.validate(iso_format.as_serializable(value)), value)
@@ -105,3 +105,9 @@ class FloatUnitTest(unittest.TestCase):
 
         # check non-integer raise parse error
         self.assertRaises(exception.ParseFailedError, Float().validate, "string")
+
+    def test_integer_choices(self):
+        float_type = Float(choices=[1, 2])
+        self.assertEqual(float_type.validate(2), 2.0)
+        self.assertEqual(float_type.validate("1"), 1.0)
+        self.assertRaises(exception.InvalidChoiceError, float_type.validate, 1.5)
@@ -1,8 +1,12 @@
 import unittest
 
+from mock import patch
+
 from prestans import exception
 from prestans.parser import AttributeFilter
 from prestans import types
+from prestans.types.model import FieldDescriptor
+from prestans.types.schema import ModelSchema
 
 
 class ModelUnitTest(unittest.TestCase):
@@ -731,3 +735,252 @@ class ModelValidate(unittest.TestCase):
 
         person = Person(first_name="john")
         self.assertRaises(exception.ValidationError, Person().validate, person.as_serializable())
+
+    def test_does_not_create_default_instance(self):
+        class Person(types.Model):
+            first_name = types.String()
+            age = types.Integer(required=False)
+
+        template = Person()
+
+        with patch.object(Person, "__init__") as init:
+            validated = template.validate({"first_name": "john"})
+            init.assert_not_called()
+
+        self.assertIs(validated._templates, ModelSchema.for_class(Person).templates)
+        self.assertEqual(validated.first_name, "john")
+        self.assertIsNone(validated.age)
+
+
+class ModelFieldDescriptor(unittest.TestCase):
+
+    def test_fields_are_descriptors(self):
+        class MyModel(types.Model):
+            name = types.String()
+            nothing = None
+
+        self.assertIsInstance(MyModel.__dict__["name"], FieldDescriptor)
+        self.assertIsNone(MyModel.__dict__["nothing"])
+        self.assertNotIn("__getattribute__", types.Model.__dict__)
+
+    def test_class_access_returns_template(self):
+        class MyModel(types.Model):
+            name = types.String(max_length=10)
+
+        self.assertIsInstance(MyModel.name, types.String)
+        self.assertEqual(MyModel.name.max_length, 10)
+        self.assertEqual(MyModel.__dict__["name"].template, MyModel.name)
+
+    def test_instance_access_returns_value(self):
+        class MyModel(types.Model):
+            name = types.String()
+            age = types.Integer(required=False)
+
+        my_model = MyModel(name="name")
+        self.assertEqual(my_model.name, "name")
+        self.assertIsNone(my_model.age)
+
+        my_model.age = 21
+        self.assertEqual(my_model.age, 21)
+
+        setattr(my_model, "age", 22)
+        self.assertEqual(my_model.age, 22)
+
+        object.__setattr__(my_model, "age", 23)
+        self.assertEqual(my_model.age, 23)
+        self.assertRaises(exception.ValidationError, object.__setattr__, my_model, "age", "old")
+
+    def test_nested_collections_created_on_first_access(self):
+        class SubModel(types.Model):
+            name = types.String(required=False)
+
+        class MyModel(types.Model):
+            sub = SubModel(required=False)
+            tags = types.Array(element_template=types.String())
+
+        my_model = MyModel()
+        my_model.sub = None
+        self.assertIsNone(my_model._attributes["sub"])
+
+        sub = my_model.sub
+        self.assertIsInstance(sub, SubModel)
+        self.assertIsNot(sub, MyModel.sub)
+        self.assertIs(my_model.sub, sub)
+
+        my_model.tags.append("tag")
+        self.assertEqual(my_model.tags[0], "tag")
+        self.assertEqual(len(MyModel.tags), 0)
+
+    def test_fields_added_to_class(self):
+        class MyModel(types.Model):
+            name = types.String()
+
+        MyModel.age = types.Integer(required=False)
+        self.assertIsInstance(MyModel.__dict__["age"], FieldDescriptor)
+
+        my_model = MyModel(name="name", age=21)
+        self.assertEqual(my_model.age, 21)
+        self.assertEqual(my_model.as_serializable(), {"name": "name", "age": 21})
+
+    def test_subclass_overrides_field(self):
+        class Base(types.Model):
+            name = types.String(required=False)
+
+        class Child(Base):
+            name = types.Integer(required=False)
+
+        self.assertIsInstance(Child.name, types.Integer)
+        self.assertEqual(Child(name=1).name, 1)
+        self.assertEqual(Base(name="name").name, "name")
+
+
+class ModelClone(unittest.TestCase):
+
+    def test_clone_shares_templates(self):
+        class SubModel(types.Model):
+            name = types.String(required=False)
+
+        class MyModel(types.Model):
+            name = types.String(required=False)
+            sub = SubModel(required=False)
+
+        template = MyModel.sub
+        clone = template.clone()
+
+        self.assertIsInstance(clone, SubModel)
+        self.assertIsNot(clone, template)
+        self.assertIs(clone._templates, template._templates)
+        self.assertIsNot(clone._attributes, template._attributes)
+        self.assertFalse(clone._required)
+
+        clone.name = "name"
+        self.assertIsNone(template.name)
+
+    def test_clone_copies_values(self):
+        class SubModel(types.Model):
+            name = types.String(required=False)
+
+        class MyModel(types.Model):
+            name = types.String(required=False)
+            sub = SubModel(required=False)
+            subs = types.Array(element_template=SubModel())
+
+        my_model = MyModel(name="name")
+        my_model.sub.name = "sub"
+        my_model.subs.append(SubModel(name="first"))
+
+        clone = my_model.clone()
+        self.assertEqual(clone.as_serializable(), my_model.as_serializable())
+
+        clone.sub.name = "changed"
+        clone.subs[0].name = "changed"
+        clone.subs.append(SubModel(name="second"))
+
+        self.assertEqual(my_model.sub.name, "sub")
+        self.assertEqual(my_model.subs[0].name, "first")
+        self.assertEqual(len(my_model.subs), 1)
+
+
+class ModelDeferred(unittest.TestCase):
+
+    def setUp(self):
+        class Stats(types.Model):
+            count = types.Integer()
+
+        class Person(types.Model):
+            name = types.String(required=False)
+            score = types.Integer(required=False, maximum=10)
+            stats = Stats(required=False)
+            history = types.Array(element_template=types.String())
+
+        self.Stats = Stats
+        self.Person = Person
+        self.calls = list()
+
+    def _deferred(self, name, value):
+        def compute():
+            self.calls.append(name)
+            return value
+
+        return types.Deferred(compute)
+
+    def test_requires_callable(self):
+        self.assertRaises(TypeError, types.Deferred, 1)
+
+        deferred = types.Deferred(len)
+        self.assertIs(deferred.function, len)
+
+    def test_computed_on_read(self):
+        person = self.Person(name="Jane", score=self._deferred("score", 5))
+        self.assertEqual(self.calls, [])
+
+        self.assertEqual(person.score, 5)
+        self.assertEqual(person.score, 5)
+        self.assertEqual(self.calls, ["score"])
+        self.assertIsNone(person._deferred)
+
+    def test_value_is_validated(self):
+        person = self.Person()
+        person.score = self._deferred("score", 11)
+
+        self.assertRaises(exception.ValidationError, getattr, person, "score")
+        self.assertIn("score", person._deferred)
+
+    def test_assignment_replaces_deferred(self):
+        person = self.Person()
+        person.score = self._deferred("score", 5)
+        person.score = 3
+
+        self.assertEqual(person.score, 3)
+        self.assertIsNone(person._deferred)
+        self.assertEqual(self.calls, [])
+
+    def test_unknown_attribute(self):
+        person = self.Person()
+        self.assertRaises(KeyError, setattr, person, "missing", self._deferred("missing", 1))
+
+    def test_serialized_when_visible(self):
+        person = self.Person(name="Jane")
+        person.score = self._deferred("score", 5)
+        person.stats = self._deferred("stats", self.Stats(count=2))
+        person.history = self._deferred("history", ["joined"])
+
+        serialized = person.as_serializable()
+        self.assertEqual(serialized["score"], 5)
+        self.assertEqual(serialized["stats"], {"count": 2})
+        self.assertEqual(serialized["history"], ["joined"])
+        self.assertEqual(sorted(self.calls), ["history", "score", "stats"])
+
+    def test_hidden_never_computed(self):
+        person = self.Person(name="Jane")
+        person.score = self._deferred("score", 5)
+        person.stats = self._deferred("stats", self.Stats(count=2))
+
+        attribute_filter = AttributeFilter.from_model(person, default_value=False, name=True, score=True)
+
+        self.assertEqual(person.as_serializable(attribute_filter), {"name": "Jane", "score": 5})
+        self.assertEqual(self.calls, ["score"])
+        self.assertEqual(list(person._deferred), ["stats"])
+
+    def test_compiled_hidden_never_computed(self):
+        class Person(types.Model):
+            __compiled__ = True
+            name = types.String(required=False)
+            score = types.Integer(required=False)
+
+        person = Person(name="Jane", score=self._deferred("score", 5))
+        attribute_filter = AttributeFilter.from_model(person, default_value=False, name=True)
+
+        self.assertEqual(person.as_serializable(attribute_filter), {"name": "Jane"})
+        self.assertEqual(self.calls, [])
+
+        self.assertEqual(person.as_serializable(), {"name": "Jane", "score": 5})
+        self.assertEqual(self.calls, ["score"])
+
+    def test_clone_keeps_deferred(self):
+        person = self.Person(score=self._deferred("score", 5))
+        clone = person.clone()
+
+        self.assertEqual(clone.score, 5)
+        self.assertIn("score", person._deferred)
+        self.assertEqual(person.score, 5)
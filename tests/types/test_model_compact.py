@@ -0,0 +1,139 @@
+import copy
+import sys
+import unittest
+
+from prestans import exception
+from prestans.parser import AttributeFilter
+from prestans import types
+from prestans.types.schema import AttributeRecord
+from prestans.types.schema import ModelSchema
+
+
+class Address(types.Model):
+    street_name = types.String()
+    post_code = types.String(required=False)
+
+
+class Person(types.Model):
+    first_name = types.String()
+    age = types.Integer(required=False)
+    address = Address(required=False)
+    tags = types.Array(element_template=types.String())
+
+
+class CompactAddress(types.Model):
+    __compact__ = True
+
+    street_name = types.String()
+    post_code = types.String(required=False)
+
+
+class CompactPerson(types.Model):
+    __compact__ = True
+
+    first_name = types.String()
+    age = types.Integer(required=False)
+    address = CompactAddress(required=False)
+    tags = types.Array(element_template=types.String())
+
+
+class CompactModelUnitTest(unittest.TestCase):
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(CompactPerson(), "__dict__"))
+        self.assertTrue(hasattr(Person(), "__dict__"))
+
+        # a regular base class keeps its __dict__
+        class CompactSubclass(Person):
+            __compact__ = True
+
+        self.assertTrue(hasattr(CompactSubclass(), "__dict__"))
+        self.assertIsInstance(CompactSubclass()._attributes, AttributeRecord)
+
+        compact = CompactPerson()
+        self.assertRaises(AttributeError, setattr, compact, "_other", 1)
+        self.assertRaises(KeyError, setattr, compact, "other", 1)
+
+    def test_attributes_stored_in_record(self):
+        compact = CompactPerson(first_name="Jane", age=42)
+
+        self.assertIsInstance(compact._attributes, AttributeRecord)
+        self.assertEqual(len(compact._attributes), 4)
+        self.assertEqual(compact._attributes["first_name"], "Jane")
+        self.assertEqual(compact._attributes.get("age"), 42)
+        self.assertIsNone(compact._attributes.get("missing"))
+        self.assertIn("tags", compact._attributes)
+        self.assertNotIn("missing", compact._attributes)
+
+        self.assertIs(compact._attributes.__class__, CompactPerson()._attributes.__class__)
+
+    def test_smaller_than_dict_storage(self):
+        compact = CompactPerson(first_name="Jane", age=42)
+        regular = Person(first_name="Jane", age=42)
+
+        self.assertLess(
+            sys.getsizeof(compact) + sys.getsizeof(compact._attributes),
+            sys.getsizeof(regular) + sys.getsizeof(regular.__dict__) + sys.getsizeof(regular._attributes)
+        )
+
+    def test_templates_shared(self):
+        self.assertIs(Person()._templates, Person()._templates)
+        self.assertIs(CompactPerson()._templates, ModelSchema.for_class(CompactPerson).templates)
+
+    def test_get_and_set(self):
+        compact = CompactPerson(first_name="Jane")
+        self.assertEqual(compact.first_name, "Jane")
+        self.assertIsNone(compact.age)
+
+        compact.age = 42
+        self.assertEqual(compact.age, 42)
+        self.assertRaises(exception.ValidationError, setattr, compact, "age", "old")
+
+        compact.address.street_name = "Main"
+        self.assertEqual(compact.address.street_name, "Main")
+        self.assertIsInstance(compact.address, CompactAddress)
+
+        compact.tags.append("tag")
+        self.assertEqual(compact.tags[0], "tag")
+
+    def test_matches_regular_models(self):
+        value = {
+            "first_name": "Jane",
+            "age": 42,
+            "address": {"street_name": "Main", "post_code": None},
+            "tags": ["a", "b"]
+        }
+
+        attribute_filter = AttributeFilter.from_model(Person(), default_value=True)
+        attribute_filter.age = False
+
+        for minified in [False, True]:
+            serialized = Person().validate(value).as_serializable(minified=minified)
+            self.assertEqual(CompactPerson().validate(value).as_serializable(minified=minified), serialized)
+
+            serialized = Person().validate(value, attribute_filter).as_serializable(attribute_filter, minified)
+            compact = CompactPerson().validate(value, attribute_filter)
+            self.assertEqual(compact.as_serializable(attribute_filter, minified), serialized)
+
+    def test_compiled(self):
+        class CompiledPerson(CompactPerson):
+            __compiled__ = True
+
+        self.assertFalse(hasattr(CompiledPerson(), "__dict__"))
+
+        value = {"first_name": "Jane", "age": 42, "address": {"street_name": "Main"}, "tags": ["a"]}
+        validated = CompiledPerson().validate(value)
+
+        self.assertIsInstance(validated._attributes, AttributeRecord)
+        self.assertEqual(validated.as_serializable(), CompactPerson().validate(value).as_serializable())
+
+    def test_deepcopy(self):
+        compact = CompactPerson(first_name="Jane")
+        compact.tags.append("tag")
+
+        copied = copy.deepcopy(compact)
+        self.assertIsNot(copied._attributes, compact._attributes)
+        self.assertEqual(copied.as_serializable(), compact.as_serializable())
+
+        copied.first_name = "John"
+        self.assertEqual(compact.first_name, "Jane")
@@ -0,0 +1,146 @@
+import unittest
+
+from mock import patch
+
+from prestans import types
+from prestans.types.schema import ModelSchema
+
+
+class ModelSchemaUnitTest(unittest.TestCase):
+
+    def test_members_and_fields(self):
+        class SubModel(types.Model):
+            name = types.String()
+
+        class MyModel(types.Model):
+            tags = types.Array(element_template=types.String())
+            created = types.DateTime()
+            sub = SubModel()
+            age = types.Integer()
+            nothing = None
+
+            def method(self):
+                pass
+
+        schema = ModelSchema.for_class(MyModel)
+        self.assertEqual([name for name, value in schema.members], ["age", "created", "nothing", "sub", "tags"])
+        self.assertEqual(schema.fields, ("age", "created", "sub", "tags"))
+        self.assertEqual(schema.attribute_count, 4)
+        self.assertIs(schema.templates["age"], MyModel.age)
+        self.assertTrue("nothing" not in schema.templates)
+
+    def test_kinds(self):
+        class SubModel(types.Model):
+            pass
+
+        class MyModel(types.Model):
+            boolean = types.Boolean()
+            date = types.Date()
+            sub = SubModel()
+            tags = types.Array(element_template=types.String())
+            nothing = None
+
+        kinds = ModelSchema.for_class(MyModel).kinds
+        self.assertEqual(kinds["boolean"], ModelSchema.DATA_TYPE)
+        self.assertEqual(kinds["date"], ModelSchema.DATA_STRUCTURE)
+        self.assertEqual(kinds["sub"], ModelSchema.DATA_COLLECTION)
+        self.assertEqual(kinds["tags"], ModelSchema.ARRAY)
+        self.assertEqual(kinds["nothing"], ModelSchema.OTHER)
+
+    def test_rewrite_maps(self):
+        class MyModel(types.Model):
+            name = types.String()
+            first_name = types.String()
+            last_name = types.String()
+
+        schema = ModelSchema.for_class(MyModel)
+        self.assertEqual(schema.rewrite_map, {"first_name": "a_c", "last_name": "b_c", "name": "c"})
+        self.assertEqual(schema.rewrite_reverse_map, {"a_c": "first_name", "b_c": "last_name", "c": "name"})
+
+    def test_cached_per_class(self):
+        class MyModel(types.Model):
+            name = types.String()
+
+        class SubClass(MyModel):
+            age = types.Integer()
+
+        self.assertIs(ModelSchema.for_class(MyModel), ModelSchema.for_class(MyModel))
+        self.assertEqual(ModelSchema.for_class(MyModel).fields, ("name",))
+        self.assertEqual(ModelSchema.for_class(SubClass).fields, ("age", "name"))
+
+    def test_model_operations_do_not_inspect(self):
+        class MyModel(types.Model):
+            name = types.String()
+            age = types.Integer()
+
+        ModelSchema.for_class(MyModel)
+
+        with patch("inspect.getmembers") as getmembers:
+            my_model = MyModel(name="name", age=1)
+            my_model.as_serializable()
+            my_model.validate({"name": "name", "age": 1})
+            my_model.get_attribute_keys()
+            my_model.attribute_count()
+            my_model.blueprint()
+            my_model.get_attribute_filter()
+            getmembers.assert_not_called()
+
+    def test_invalidated_when_class_changes(self):
+        class MyModel(types.Model):
+            name = types.String()
+
+        class SubClass(MyModel):
+            pass
+
+        schema = ModelSchema.for_class(MyModel)
+        sub_schema = ModelSchema.for_class(SubClass)
+
+        MyModel.age = types.Integer()
+        self.assertIsNot(ModelSchema.for_class(MyModel), schema)
+        self.assertEqual(ModelSchema.for_class(MyModel).fields, ("age", "name"))
+        self.assertIsNot(ModelSchema.for_class(SubClass), sub_schema)
+        self.assertEqual(ModelSchema.for_class(SubClass).fields, ("age", "name"))
+        self.assertEqual(MyModel(age=2).age, 2)
+
+        del MyModel.age
+        self.assertEqual(ModelSchema.for_class(MyModel).fields, ("name",))
+
+    def test_redefined_class(self):
+        class MyModel(types.Model):
+            name = types.String()
+
+        first = MyModel
+
+        class MyModel(types.Model):
+            age = types.Integer()
+
+        self.assertEqual(ModelSchema.for_class(first).fields, ("name",))
+        self.assertEqual(ModelSchema.for_class(MyModel).fields, ("age",))
+
+    def test_rewrite_maps_shared_and_read_only(self):
+        class MyModel(types.Model):
+            first_name = types.String()
+
+        self.assertIs(MyModel().attribute_rewrite_map(), MyModel().attribute_rewrite_map())
+        self.assertIs(MyModel().attribute_rewrite_reverse_map(), MyModel().attribute_rewrite_reverse_map())
+        rewrite_map = MyModel().attribute_rewrite_map()
+        reverse_map = MyModel().attribute_rewrite_reverse_map()
+
+        with self.assertRaises(TypeError):
+            rewrite_map["first_name"] = "x"
+
+        with self.assertRaises(TypeError):
+            reverse_map["x"] = "first_name"
+
+    def test_rewrite_maps_not_compiled_without_minification(self):
+        class MyModel(types.Model):
+            first_name = types.String()
+
+        my_model = MyModel(first_name="first")
+
+        with patch.object(ModelSchema, "_compile_rewrite_maps") as compile_rewrite_maps:
+            my_model.as_serializable()
+            my_model.validate({"first_name": "first"})
+            compile_rewrite_maps.assert_not_called()
+
+        self.assertEqual(my_model.as_serializable(minified=True), {"a_b": "first"})
@@ -1,3 +1,4 @@
+import re
 import unittest
 
 from prestans import exception
@@ -151,3 +152,12 @@ class StringUnitTest(unittest.TestCase):
                 return None
 
         self.assertRaises(exception.ParseFailedError, String().validate, Custom())
+
+    def test_unhashable_choices(self):
+        string = String(choices=["apple", ["banana"]])
+        self.assertEqual(string.validate("apple"), "apple")
+        self.assertRaises(exception.InvalidChoiceError, string.validate, "banana")
+
+    def test_invalid_format_raises_on_validate(self):
+        string = String(format="[a-z")
+        self.assertRaises(re.error, string.validate, "apple")
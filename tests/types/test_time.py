@@ -133,3 +133,10 @@ class TimeUnitTest(unittest.TestCase):
         custom_format = Time(format="%H:%M:%S %p")
         self.assertRaises(exception.InvalidTypeError, custom_format.as_serializable, "string")
         self.assertEqual(custom_format.as_serializable(time(10, 51, 13)), "10:51:13 AM")
+
+    def test_parse_falls_back_to_strptime(self):
+        time_type = Time()
+        self.assertEqual(time_type.validate("09:05:00"), time(9, 5))
+        self.assertEqual(time_type.validate("9:5:0"), time(9, 5))
+        self.assertRaises(exception.ParseFailedError, time_type.validate, "24:00:00")
+        self.assertEqual(time_type.as_serializable(time(9, 5)), "09:05:00")
@@ -0,0 +1,136 @@
+import array
+import unittest
+
+from prestans import exception
+from prestans import types
+from prestans.types import typed_storage
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TypecodeFor(unittest.TestCase):
+
+    def test_typecode_for(self):
+        self.assertEqual(typed_storage.typecode_for(types.Integer()), "q")
+        self.assertEqual(typed_storage.typecode_for(types.Float()), "d")
+        self.assertEqual(typed_storage.typecode_for(types.Boolean()), "B")
+        self.assertIsNone(typed_storage.typecode_for(types.String()))
+        self.assertIsNone(typed_storage.typecode_for(types.DateTime()))
+
+
+class WrapBuffer(unittest.TestCase):
+
+    def test_array_shared(self):
+        buffer = array.array("d", [1.0, 2.0])
+        self.assertIs(typed_storage.wrap_buffer("d", buffer), buffer)
+        self.assertRaises(TypeError, typed_storage.wrap_buffer, "q", buffer)
+
+    def test_bytes_cast(self):
+        buffer = bytearray(array.array("q", [1, 2, 3]).tobytes())
+        storage = typed_storage.wrap_buffer("q", buffer)
+
+        self.assertIsInstance(storage, memoryview)
+        self.assertEqual(storage.tolist(), [1, 2, 3])
+
+        # shares the memory of buffer
+        buffer[0:8] = array.array("q", [5]).tobytes()
+        self.assertEqual(storage[0], 5)
+
+    def test_partial_element_rejected(self):
+        self.assertRaises(TypeError, typed_storage.wrap_buffer, "q", b"123")
+
+    @unittest.skipIf(numpy is None, "requires numpy")
+    def test_ndarray(self):
+        buffer = numpy.arange(3, dtype="int64")
+        self.assertIs(typed_storage.wrap_buffer("q", buffer), buffer)
+        self.assertRaises(TypeError, typed_storage.wrap_buffer, "d", buffer)
+        self.assertRaises(TypeError, typed_storage.wrap_buffer, "q", buffer.reshape(1, 3))
+
+
+class ValidateStorage(unittest.TestCase):
+
+    def test_minimum(self):
+        template = types.Float(minimum=0)
+        typed_storage.validate_storage(template, array.array("d", [0, 1, 2]))
+        typed_storage.validate_storage(template, array.array("d"))
+        self.assertRaises(exception.LessThanMinimumError, typed_storage.validate_storage,
+                          template, array.array("d", [1, -1, 2]))
+
+    def test_maximum(self):
+        template = types.Integer(maximum=2)
+        typed_storage.validate_storage(template, array.array("q", [0, 1, 2]))
+        self.assertRaises(exception.MoreThanMaximumError, typed_storage.validate_storage,
+                          template, array.array("q", [1, 3]))
+
+    def test_leading_nan(self):
+        nan = float("nan")
+        template = types.Float(minimum=0, maximum=10)
+        typed_storage.validate_storage(template, array.array("d", [nan, 1]))
+        typed_storage.validate_storage(template, array.array("d", [nan]))
+        self.assertRaises(exception.LessThanMinimumError, typed_storage.validate_storage,
+                          template, array.array("d", [nan, -1]))
+        self.assertRaises(exception.MoreThanMaximumError, typed_storage.validate_storage,
+                          template, array.array("d", [nan, 11]))
+
+    def test_choices(self):
+        template = types.Integer(choices=[1, 2])
+        typed_storage.validate_storage(template, array.array("q", [1, 2, 1]))
+        self.assertRaises(exception.InvalidChoiceError, typed_storage.validate_storage,
+                          template, array.array("q", [1, 3]))
+
+    @unittest.skipIf(numpy is None, "requires numpy")
+    def test_ndarray(self):
+        template = types.Integer(minimum=0, maximum=5, choices=[0, 1, 2, 5])
+        typed_storage.validate_storage(template, numpy.array([0, 1, 5], dtype="int64"))
+        self.assertRaises(exception.LessThanMinimumError, typed_storage.validate_storage,
+                          template, numpy.array([0, -1], dtype="int64"))
+        self.assertRaises(exception.MoreThanMaximumError, typed_storage.validate_storage,
+                          template, numpy.array([0, 6], dtype="int64"))
+        self.assertRaises(exception.InvalidChoiceError, typed_storage.validate_storage,
+                          template, numpy.array([0, 3], dtype="int64"))
+
+
+class ValidateElements(unittest.TestCase):
+
+    def test_converts(self):
+        template = types.Integer()
+        storage = typed_storage.validate_elements(template, "q", [1, "2", 3.0], template.validate)
+        self.assertEqual(storage, array.array("q", [1, 2, 3]))
+
+    def test_constraints(self):
+        template = types.Float(maximum=1)
+        self.assertRaises(exception.MoreThanMaximumError, typed_storage.validate_elements,
+                          template, "d", [0.5, 2], template.validate)
+        self.assertRaises(exception.MoreThanMaximumError, typed_storage.validate_elements,
+                          template, "d", ["0.5", "2"], template.validate)
+
+    def test_boolean(self):
+        template = types.Boolean()
+        storage = typed_storage.validate_elements(template, "B", [True, False], template.validate)
+        self.assertEqual(storage, array.array("B", [1, 0]))
+        self.assertRaises(exception.ParseFailedError, typed_storage.validate_elements,
+                          template, "B", [True, 2], template.validate)
+
+    def test_overflow(self):
+        template = types.Integer()
+        self.assertRaises(exception.ParseFailedError, typed_storage.validate_elements,
+                          template, "q", [1, 2 ** 64], template.validate)
+
+
+class Elements(unittest.TestCase):
+
+    def test_to_list(self):
+        self.assertEqual(typed_storage.to_list(array.array("q", [1, 2]), "q"), [1, 2])
+        self.assertEqual(typed_storage.to_list(array.array("B", [1, 0]), "B"), [True, False])
+
+    def test_element(self):
+        storage = array.array("B", [1, 0, 1])
+        self.assertIs(typed_storage.element(storage, "B", 0), True)
+        self.assertEqual(typed_storage.element(storage, "B", slice(1, 3)), [False, True])
+
+    def test_iter_elements(self):
+        storage = array.array("q", range(typed_storage.CHUNK_SIZE * 2 + 1))
+        self.assertEqual(list(typed_storage.iter_elements(storage, "q")), list(storage))